@@ -10,6 +10,9 @@ import random
 import json
 from sqlalchemy.orm import Session
 
+from saju import analyze_saju_result
+from lunar_converter import lunar_to_solar
+
 class SajuMasterAI:
     """사주 분석 AI 인격체"""
     
@@ -408,70 +411,9 @@ class SajuMasterAI:
         day = birth_info.get('birth_day', 1)
         hour = birth_info.get('birth_hour', 0)
         
-        # 천간 (天干) - 10개
-        CHEONGAN = ['갑', '을', '병', '정', '무', '기', '경', '신', '임', '계']
-        CHEONGAN_HANJA = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
-        CHEONGAN_YINYANG = ['양', '음', '양', '음', '양', '음', '양', '음', '양', '음']  # 음양
-        CHEONGAN_ELEMENT = ['목', '목', '화', '화', '토', '토', '금', '금', '수', '수']  # 오행
-        
-        # 지지 (地支) - 12개
-        JIJI = ['자', '축', '인', '묘', '진', '사', '오', '미', '신', '유', '술', '해']
-        JIJI_HANJA = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
-        JIJI_YINYANG = ['양', '음', '양', '음', '양', '음', '양', '음', '양', '음', '양', '음']
-        JIJI_ELEMENT = ['수', '토', '목', '목', '토', '화', '화', '토', '금', '금', '토', '수']
-        
-        # 간단한 계산 (실제로는 만세력 조견표를 사용해야 함)
-        year_gan_idx = (year - 4) % 10
-        year_ji_idx = (year - 4) % 12
-        month_gan_idx = ((year % 10) * 12 + month - 1) % 10
-        month_ji_idx = (month - 1) % 12
-        day_gan_idx = (day + month * 2) % 10
-        day_ji_idx = (day + month) % 12
-        hour_gan_idx = (hour // 2) % 10
-        hour_ji_idx = (hour // 2) % 12
-        
-        return {
-            "year": {
-                "gan": CHEONGAN[year_gan_idx],
-                "gan_hanja": CHEONGAN_HANJA[year_gan_idx],
-                "ji": JIJI[year_ji_idx],
-                "ji_hanja": JIJI_HANJA[year_ji_idx],
-                "gan_yinyang": CHEONGAN_YINYANG[year_gan_idx],
-                "ji_yinyang": JIJI_YINYANG[year_ji_idx],
-                "gan_element": CHEONGAN_ELEMENT[year_gan_idx],
-                "ji_element": JIJI_ELEMENT[year_ji_idx]
-            },
-            "month": {
-                "gan": CHEONGAN[month_gan_idx],
-                "gan_hanja": CHEONGAN_HANJA[month_gan_idx],
-                "ji": JIJI[month_ji_idx],
-                "ji_hanja": JIJI_HANJA[month_ji_idx],
-                "gan_yinyang": CHEONGAN_YINYANG[month_gan_idx],
-                "ji_yinyang": JIJI_YINYANG[month_ji_idx],
-                "gan_element": CHEONGAN_ELEMENT[month_gan_idx],
-                "ji_element": JIJI_ELEMENT[month_ji_idx]
-            },
-            "day": {
-                "gan": CHEONGAN[day_gan_idx],
-                "gan_hanja": CHEONGAN_HANJA[day_gan_idx],
-                "ji": JIJI[day_ji_idx],
-                "ji_hanja": JIJI_HANJA[day_ji_idx],
-                "gan_yinyang": CHEONGAN_YINYANG[day_gan_idx],
-                "ji_yinyang": JIJI_YINYANG[day_ji_idx],
-                "gan_element": CHEONGAN_ELEMENT[day_gan_idx],
-                "ji_element": JIJI_ELEMENT[day_ji_idx]
-            },
-            "hour": {
-                "gan": CHEONGAN[hour_gan_idx],
-                "gan_hanja": CHEONGAN_HANJA[hour_gan_idx],
-                "ji": JIJI[hour_ji_idx],
-                "ji_hanja": JIJI_HANJA[hour_ji_idx],
-                "gan_yinyang": CHEONGAN_YINYANG[hour_gan_idx],
-                "ji_yinyang": JIJI_YINYANG[hour_ji_idx],
-                "gan_element": CHEONGAN_ELEMENT[hour_gan_idx],
-                "ji_element": JIJI_ELEMENT[hour_ji_idx]
-            }
-        }
+        # 정규 기둥 엔진 사용 (한자/음양/오행 포함, 프로세스 공유 캐시)
+        # 범위를 벗어난 날짜는 analyze_saju와 같은 기본 기둥(갑자)으로 전체 구조를 유지
+        return analyze_saju_result(year, month, day, hour).pillars.to_dict()
     
     def _generate_special_message(self, birth_info: Dict[str, Any]) -> str:
         """천기술사의 특별한 전언"""
@@ -496,8 +438,6 @@ class SajuMasterAI:
         # 음력인 경우에만 양력으로 변환
         if calendar_type == 'lunar':
             try:
-                from korean_lunar_calendar import KoreanLunarCalendar
-                
                 # 음력 정보 추출
                 lunar_year = int(birth_info.get('birth_year', 2000))
                 lunar_month = int(birth_info.get('birth_month', 1))
@@ -506,25 +446,18 @@ class SajuMasterAI:
                 # 윤달 여부 (기본값: False, 향후 프론트엔드에서 추가 가능)
                 is_leap = birth_info.get('is_leap_month', False)
                 
-                # 음력을 양력으로 변환
-                calendar = KoreanLunarCalendar()
-                calendar.setLunarDate(lunar_year, lunar_month, lunar_day, is_leap)
-                
-                # 변환된 양력 날짜
-                solar_date = calendar.SolarIsoFormat()  # YYYY-MM-DD 형식
-                solar_year, solar_month, solar_day = solar_date.split('-')
+                # 음력을 양력으로 변환 (만세력 색인 조회)
+                solar_date = lunar_to_solar(lunar_year, lunar_month, lunar_day, is_leap)
                 
                 # 변환된 날짜로 업데이트
                 processed_info.update({
-                    'birth_year': int(solar_year),
-                    'birth_month': int(solar_month),
-                    'birth_day': int(solar_day),
+                    'birth_year': solar_date.year,
+                    'birth_month': solar_date.month,
+                    'birth_day': solar_date.day,
                     'original_calendar_type': 'lunar',
                     'converted_to_solar': True
                 })
                 
-                print(f"음력 변환: {lunar_year}-{lunar_month}-{lunar_day} → {solar_year}-{solar_month}-{solar_day}")
-                
             except Exception as e:
                 print(f"음력 변환 오류: {e}")
                 # 오류 시 원본 데이터 사용 (오류 메시지 숨김)
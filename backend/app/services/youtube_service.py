@@ -13,6 +13,8 @@ from datetime import datetime
 import sqlite3
 from sqlalchemy.orm import Session
 
+from saju import calculate_pillars
+
 # YouTube 관련
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
@@ -497,22 +499,14 @@ class YouTubeService:
         # 간단한 개인화 로직 (실제로는 더 정교해야 함)
         keywords = []
         
-        # 연도 기반 천간/지지
-        year_gan_index = (birth_year - 4) % 10
-        year_ji_index = (birth_year - 4) % 12
-        
-        if year_gan_index < len(self.saju_terms['천간']):
-            keywords.append(self.saju_terms['천간'][year_gan_index])
-        if year_ji_index < len(self.saju_terms['지지']):
-            keywords.append(self.saju_terms['지지'][year_ji_index])
-        
-        # 일주 계산 및 추가
-        천간 = self.saju_terms['천간']
-        지지 = self.saju_terms['지지']
-        day_gan_index = (birth_year + birth_month + birth_day) % 10
-        day_ji_index = (birth_year + birth_month + birth_day) % 12
-        일주 = f"{천간[day_gan_index]}{지지[day_ji_index]} 일주"
-        keywords.append(일주)
+        # 정규 기둥 엔진으로 년주 천간/지지와 일주 계산 (프로세스 공유 캐시)
+        try:
+            pillars = calculate_pillars(birth_year, birth_month, birth_day, birth_info.get('birth_hour', 0))
+            keywords.append(pillars.year.gan)
+            keywords.append(pillars.year.ji)
+            keywords.append(f"{pillars.day.gan}{pillars.day.ji} 일주")
+        except ValueError as e:
+            print(f"사주팔자 계산 오류: {e}")
         
         # 계절 기반 오행
         season_elements = {
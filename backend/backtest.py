@@ -0,0 +1,261 @@
+"""
+예측 전략 워크포워드(walk-forward) 백테스트
+과거 회차를 한 회차씩 재생하면서, 매 시점 그 이전 회차만으로 만든 빈도 색인/모델 입력으로
+사주 프로필별 예측 번호를 생성하고 해당 회차 당첨 번호와 비트마스크로 비교합니다.
+
+    - 빈도 색인은 워밍업 구간에서 한 번 집계한 뒤 매 단계 한 회차분(6개)만 더합니다.
+    - 프로필 목록을 프로세스 풀 워커 수만큼 나누어 병렬로 재생합니다.
+    - LSTM 기본 예측은 프로필과 무관하므로 부모 프로세스에서 전체 구간을 추론 배치 큐(predict_windows)로 예측합니다.
+      모델은 매니페스트의 학습 회차 범위까지 본 가중치이므로, 그 이후 회차만 LSTM 전략으로 채점합니다.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from draw_store import draw_store
+from lotto_bitmask import RANKS, ticket_masks, draw_masks, match_bulk, rank_bulk
+
+# 예측을 시작하기 전에 빈도 색인만 쌓는 초기 회차 수
+BACKTEST_WARMUP_DRAWS = 100
+
+# LSTM 모델 입력 길이 (최근 회차 수)
+LSTM_SEQUENCE_LENGTH = 10
+
+# 사주 가중 빈도 전략이 보는 빈도 상위 번호 수 (PredictionService.analyze_number_patterns와 동일)
+TOP_NUMBER_COUNT = 15
+
+STRATEGIES = ['saju_weighted_frequency', 'lstm', 'random']
+
+
+def _summarize(tickets: np.ndarray, targets: np.ndarray) -> Dict:
+    """티켓 마스크와 대상 회차 마스크(같은 길이)의 적중 분포 집계"""
+    matches, has_bonus = match_bulk(tickets, targets)
+    match_counts = np.bincount(matches, minlength=7)
+    rank_counts = np.bincount(rank_bulk(matches, has_bonus), minlength=len(RANKS))
+    steps = max(len(tickets), 1)
+    return {
+        'steps': len(tickets),
+        'match_distribution': {str(k): int(v) for k, v in enumerate(match_counts)},
+        'rank_distribution': {name: int(v) for name, v in zip(RANKS, rank_counts)},
+        'mean_matches': float((match_counts * np.arange(7)).sum() / steps),
+        'prize_rate': float(rank_counts[:-1].sum() / steps)
+    }
+
+
+def _run_shard(profiles: List[Tuple[int, int, int, int, int]], numbers: np.ndarray, warmup_draws: int,
+               lstm_bases: Optional[np.ndarray], lstm_first_step: int, seed: Optional[int]) -> List[Dict]:
+    """
+    프로세스 풀 워커: 프로필 묶음의 워크포워드 재생
+
+    Args:
+        profiles: (프로필 인덱스, 년, 월, 일, 시) 목록
+        numbers: (N, 7) 당첨 번호 배열 (draw_store 스냅샷 형식)
+        lstm_bases: 단계 lstm_first_step~steps-1의 LSTM 기본 예측 (steps - lstm_first_step, 6), 없으면 None
+        lstm_first_step: LSTM 전략을 채점하기 시작하는 단계 (모델 학습 범위 이후 첫 회차)
+    """
+    from prediction_service import prediction_service
+    from saju import OHEANG, analyze_saju_result
+
+    total = len(numbers)
+    steps = total - warmup_draws
+    targets = draw_masks(numbers[warmup_draws:])
+    main_numbers = numbers[:, :6].astype(np.int64) - 1
+
+    if lstm_bases is not None:
+        from lstm_prediction_service import lstm_service
+
+    results = []
+    for profile_index, year, month, day, hour in profiles:
+        saju_result = analyze_saju_result(year, month, day, hour)
+        oheang = saju_result.oheang_dict()
+        oheang_total = sum(oheang.values())
+        saju_weights = dict(zip(OHEANG, (saju_result.oheang / oheang_total).tolist()))
+
+        # 프로필별 독립 난수 (무작위 전략, LSTM 사주 가중치/중복 보정) - 전역 난수 상태는 사용하지 않음
+        rng, lstm_rng = (np.random.default_rng(child) for child in np.random.SeedSequence(
+            None if seed is None else [seed, profile_index]
+        ).spawn(2))
+
+        # 워밍업 구간 빈도 (이후 매 단계 한 회차씩 누적)
+        frequency = np.bincount(main_numbers[:warmup_draws].ravel(), minlength=45).astype(np.int64)
+
+        saju_tickets = np.zeros(steps, dtype=np.uint64)
+        lstm_tickets = np.zeros(steps - lstm_first_step, dtype=np.uint64)
+        for step in range(steps):
+            top = np.argsort(-frequency, kind='stable')[:TOP_NUMBER_COUNT]
+            top_numbers = list(zip((top + 1).tolist(), frequency[top].tolist()))
+            prediction = prediction_service.predict_with_saju_weighting(top_numbers, oheang, score_count=6)
+            # 점수 상위 6개를 한 장의 티켓으로 채점 (7번째 번호는 보너스 후보)
+            saju_tickets[step] = sum(1 << (score['number'] - 1) for score in prediction['number_scores'][:6])
+
+            if lstm_bases is not None and step >= lstm_first_step:
+                lstm_step = step - lstm_first_step
+                weighted = lstm_service.apply_saju_weights(lstm_bases[lstm_step], saju_weights, lstm_rng)
+                lstm_numbers = lstm_service.ensure_unique_numbers(weighted, lstm_rng)
+                lstm_tickets[lstm_step] = sum(1 << (number - 1) for number in lstm_numbers)
+
+            frequency[main_numbers[warmup_draws + step]] += 1
+
+        random_tickets = ticket_masks(rng.random((steps, 45)).argsort(axis=1)[:, :6] + 1)
+
+        strategies = {
+            'saju_weighted_frequency': _summarize(saju_tickets, targets),
+            'random': _summarize(random_tickets, targets)
+        }
+        if lstm_bases is not None:
+            strategies['lstm'] = _summarize(lstm_tickets, targets[lstm_first_step:])
+
+        results.append({
+            'profile_index': profile_index,
+            'birth': {'year': year, 'month': month, 'day': day, 'hour': hour},
+            'oheang': oheang,
+            'strategies': strategies
+        })
+    return results
+
+
+def _lstm_base_predictions(numbers: np.ndarray, draw_nos: np.ndarray, warmup_draws: int) -> Dict:
+    """
+    학습 범위 이후 각 회차의 직전 10회차로 LSTM 기본 예측을 한 번에 계산
+
+    Returns:
+        bases: 단계 first_step~steps-1의 기본 예측 (모델이 없으면 None)
+        first_step: 모델의 학습 마지막 회차 다음 회차의 단계 (학습 범위를 모르면 0)
+        train_last_draw_no: 매니페스트의 학습 마지막 회차 (모르면 None)
+        lookahead_bias: 채점 구간에 학습에 쓰인 회차가 포함되는지
+    """
+    result = {'bases': None, 'first_step': 0, 'train_last_draw_no': None, 'lookahead_bias': False}
+    try:
+        from lstm_prediction_service import lstm_service
+        if not lstm_service.load_model_files():
+            return result
+        entry = lstm_service.registry.get()
+    except Exception as e:
+        print(f"[BACKTEST] LSTM 전략 제외: {e}")
+        return result
+
+    steps = len(numbers) - warmup_draws
+    train_draw_range = entry.manifest.get('train_draw_range')
+    if train_draw_range:
+        # 학습에 쓰인 회차를 맞히는 것은 평가가 아니므로 마지막 학습 회차 이후만 채점
+        result['train_last_draw_no'] = int(train_draw_range[1])
+        first_step = int(np.searchsorted(draw_nos[warmup_draws:], train_draw_range[1], side='right'))
+    else:
+        print("[BACKTEST] 모델 학습 회차 범위를 알 수 없어 전체 구간을 채점합니다. (미래 정보 포함)")
+        first_step = 0
+        result['lookahead_bias'] = steps > 0
+    result['first_step'] = first_step
+    if first_step >= steps:
+        print(f"[BACKTEST] 모델 학습 범위({train_draw_range}) 이후 회차가 없어 LSTM 전략을 제외합니다.")
+        return result
+
+    windows = np.lib.stride_tricks.sliding_window_view(
+        numbers[:-1, :6], LSTM_SEQUENCE_LENGTH, axis=0
+    ).transpose(0, 2, 1)
+    # windows[i]는 회차 i~i+9 → 회차 i+10 예측
+    start = warmup_draws - LSTM_SEQUENCE_LENGTH + first_step
+    # 배치 큐를 거치므로 동시에 실행 중인 다른 백테스트/단건 요청과 함께 묶여 예측됨
+    result['bases'] = lstm_service.predict_windows(windows[start:], entry.name)
+    return result
+
+
+def run_backtest(profiles: List[Tuple[int, int, int, int]], warmup_draws: int = BACKTEST_WARMUP_DRAWS,
+                 workers: Optional[int] = None, include_lstm: bool = True,
+                 seed: Optional[int] = None, numbers: Optional[np.ndarray] = None,
+                 draw_nos: Optional[np.ndarray] = None) -> Dict:
+    """
+    생년월일시 프로필 목록의 워크포워드 백테스트
+
+    Args:
+        profiles: (년, 월, 일, 시) 목록
+        warmup_draws: 첫 예측 전에 빈도만 쌓는 회차 수 (LSTM 입력 길이 이상)
+        workers: 프로세스 수 (기본: CPU 수와 프로필 수 중 작은 값, 1이면 현재 프로세스에서 실행)
+                 워커는 spawn으로 시작하므로 서버의 스레드/잠금 상태를 물려받지 않습니다.
+        numbers: 재생할 (N, 7) 당첨 번호 배열 (기본: draw_store 전체 회차)
+        draw_nos: numbers의 회차 번호 (기본: draw_store 회차 번호, numbers를 지정하면 1~N)
+    """
+    if not profiles:
+        raise ValueError("백테스트할 프로필이 없습니다.")
+
+    if numbers is None:
+        snapshot = draw_store.get()
+        numbers, draw_nos = snapshot.numbers, snapshot.draw_nos
+    else:
+        numbers = np.asarray(numbers, dtype=np.uint8)
+        draw_nos = np.arange(1, len(numbers) + 1) if draw_nos is None else np.asarray(draw_nos)
+    if warmup_draws < LSTM_SEQUENCE_LENGTH or warmup_draws >= len(numbers):
+        raise ValueError(f"warmup_draws는 {LSTM_SEQUENCE_LENGTH}~{len(numbers) - 1} 범위여야 합니다.")
+
+    started = time.perf_counter()
+    lstm = (_lstm_base_predictions(numbers, draw_nos, warmup_draws) if include_lstm
+            else {'bases': None, 'first_step': 0, 'train_last_draw_no': None, 'lookahead_bias': False})
+    lstm_bases, lstm_first_step = lstm['bases'], lstm['first_step']
+
+    indexed = [(index, *map(int, profile)) for index, profile in enumerate(profiles)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(indexed)))
+    shards = [indexed[offset::workers] for offset in range(workers)]
+
+    if workers == 1:
+        shard_results = [_run_shard(shards[0], numbers, warmup_draws, lstm_bases, lstm_first_step, seed)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [
+                executor.submit(_run_shard, shard, numbers, warmup_draws, lstm_bases, lstm_first_step, seed)
+                for shard in shards
+            ]
+            shard_results = [future.result() for future in futures]
+
+    profile_results = sorted(
+        (result for results in shard_results for result in results),
+        key=lambda result: result['profile_index']
+    )
+
+    # 전략별 전체 합계
+    summary = {}
+    for strategy in STRATEGIES:
+        rows = [result['strategies'][strategy] for result in profile_results if strategy in result['strategies']]
+        if not rows:
+            continue
+        steps = sum(row['steps'] for row in rows)
+        match_counts = np.array([[row['match_distribution'][str(k)] for k in range(7)] for row in rows]).sum(axis=0)
+        rank_counts = np.array([[row['rank_distribution'][name] for name in RANKS] for row in rows]).sum(axis=0)
+        summary[strategy] = {
+            'tickets': steps,
+            'match_distribution': {str(k): int(v) for k, v in enumerate(match_counts)},
+            'rank_distribution': {name: int(v) for name, v in zip(RANKS, rank_counts)},
+            'mean_matches': float((match_counts * np.arange(7)).sum() / steps),
+            'prize_rate': float(rank_counts[:-1].sum() / steps)
+        }
+
+    return {
+        'profiles': len(profile_results),
+        'draws': len(numbers),
+        'warmup_draws': warmup_draws,
+        'steps': len(numbers) - warmup_draws,
+        'workers': workers,
+        'lstm_included': lstm_bases is not None,
+        # LSTM 전략은 모델의 마지막 학습 회차 이후만 채점 (범위를 모르면 전체 구간, lookahead_bias=True)
+        'lstm_train_last_draw_no': lstm['train_last_draw_no'],
+        'lstm_steps': len(numbers) - warmup_draws - lstm_first_step if lstm_bases is not None else 0,
+        'lookahead_bias': lstm_bases is not None and lstm['lookahead_bias'],
+        'summary': summary,
+        'results': profile_results,
+        'elapsed_seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+if __name__ == "__main__":
+    # 합성 회차 1000개, 프로필 8개 백테스트
+    rng = np.random.default_rng(0)
+    synthetic = np.array([rng.choice(45, 7, replace=False) + 1 for _ in range(1000)], dtype=np.uint8)
+    profiles = [(1960 + 7 * i, 1 + i, 3 + 2 * i, (5 * i) % 24) for i in range(8)]
+
+    result = run_backtest(profiles, workers=4, include_lstm=False, seed=1, numbers=synthetic)
+    print(f"프로필 {result['profiles']}개 x {result['steps']}회차: {result['elapsed_seconds']}초")
+    for strategy, stats in result['summary'].items():
+        print(f"  {strategy}: 평균 일치 {stats['mean_matches']:.3f}, 당첨률 {stats['prize_rate']:.4f}")
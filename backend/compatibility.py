@@ -0,0 +1,242 @@
+"""
+궁합(宮合) 일괄 점수 엔진
+모든 사주 프로필의 오행 분포(SajuProfile.oheng_json)를 N×5 행렬로, 일간/일지/년지를 배열로 적재해 두고
+한 사용자와 전체 사용자 사이의 오행 균형 및 천간/지지 조화 점수를 벡터 연산으로 계산합니다.
+상위 k명은 argpartition으로 선택합니다.
+"""
+
+import threading
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+import models
+from crud import parse_birth_ymdh
+from saju import OHEANG, GAN_OHEANG_INDEX, analyze_saju_batch
+
+# 점수 구성 비율 (오행 균형, 천간 조화, 지지 조화)
+BALANCE_WEIGHT = 0.5
+STEM_WEIGHT = 0.25
+BRANCH_WEIGHT = 0.25
+
+
+def _build_stem_harmony() -> np.ndarray:
+    """
+    일간 x 일간 조화 점수표 (10x10)
+    천간합(갑기, 을경, 병신, 정임, 무계) 1.0, 오행 상생 0.7, 같은 오행 0.5, 상극 0.2
+    """
+    table = np.zeros((10, 10), dtype=np.float32)
+    for a in range(10):
+        for b in range(10):
+            diff = (int(GAN_OHEANG_INDEX[b]) - int(GAN_OHEANG_INDEX[a])) % 5
+            if (a - b) % 10 == 5:
+                table[a, b] = 1.0
+            elif diff in (1, 4):
+                table[a, b] = 0.7
+            elif diff == 0:
+                table[a, b] = 0.5
+            else:
+                table[a, b] = 0.2
+    return table
+
+
+def _build_branch_harmony() -> np.ndarray:
+    """
+    지지 x 지지 조화 점수표 (12x12)
+    육합(자축, 인해, 묘술, 진유, 사신, 오미) 1.0, 삼합(신자진, 해묘미, 인오술, 사유축) 0.8,
+    충(沖) 0.0, 그 외 0.5
+    """
+    table = np.full((12, 12), 0.5, dtype=np.float32)
+    for a in range(12):
+        for b in range(12):
+            if (a + b) % 12 == 1:
+                table[a, b] = 1.0
+            elif a != b and a % 4 == b % 4:
+                table[a, b] = 0.8
+            elif (a - b) % 12 == 6:
+                table[a, b] = 0.0
+    return table
+
+
+STEM_HARMONY = _build_stem_harmony()
+BRANCH_HARMONY = _build_branch_harmony()
+
+
+def _profile_arrays(rows) -> dict:
+    """(id, user_id, name, birth_ymdh, oheng_json) 행 목록을 색인 배열로 변환 (해석할 수 없는 프로필은 제외)"""
+    profile_ids, user_ids, names, births, oheang_rows = [], [], [], [], []
+    for profile_id, user_id, name, birth_ymdh, oheng_json in rows:
+        parsed = parse_birth_ymdh(birth_ymdh)
+        if not parsed or not oheng_json:
+            continue
+        profile_ids.append(profile_id)
+        user_ids.append(user_id)
+        names.append(name)
+        births.append(parsed)
+        oheang_rows.append([oheng_json.get(element, 0) for element in OHEANG])
+
+    if births:
+        years, months, days, hours = zip(*births)
+        pillars = analyze_saju_batch(years, months, days, hours)
+        valid = pillars['valid']
+        gan, ji = pillars['gan'][valid], pillars['ji'][valid]
+    else:
+        valid = np.zeros(0, dtype=bool)
+        gan = ji = np.zeros((0, 4), dtype=np.int8)
+
+    return {
+        'profile_ids': np.asarray(profile_ids, dtype=np.int64)[valid],
+        'user_ids': np.asarray(user_ids, dtype=np.int64)[valid],
+        'names': [name for name, ok in zip(names, valid.tolist()) if ok],
+        'oheang': np.asarray(oheang_rows, dtype=np.float32).reshape(-1, 5)[valid],
+        'day_gan': np.ascontiguousarray(gan[:, 2]),
+        'day_ji': np.ascontiguousarray(ji[:, 2]),
+        'year_ji': np.ascontiguousarray(ji[:, 0])
+    }
+
+
+class CompatibilityIndex:
+    """전체 사주 프로필 궁합 색인 (처음 조회 시 적재, 새 프로필은 append, 일괄 재계산 시 invalidate 후 다시 적재)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.loaded = False
+        self.profile_ids = np.zeros(0, dtype=np.int64)
+        self.user_ids = np.zeros(0, dtype=np.int64)
+        self.names = []
+        self.oheang = np.zeros((0, 5), dtype=np.float32)
+        self.day_gan = np.zeros(0, dtype=np.int8)
+        self.day_ji = np.zeros(0, dtype=np.int8)
+        self.year_ji = np.zeros(0, dtype=np.int8)
+
+    def load(self, db: Session) -> int:
+        """DB의 모든 사주 프로필을 행렬로 적재 (생년월일시를 해석할 수 없는 프로필은 제외)"""
+        rows = db.query(
+            models.SajuProfile.id, models.SajuProfile.user_id, models.SajuProfile.name,
+            models.SajuProfile.birth_ymdh, models.SajuProfile.oheng_json
+        ).all()
+        arrays = _profile_arrays(rows)
+
+        with self._lock:
+            for name, value in arrays.items():
+                setattr(self, name, value)
+            self.loaded = True
+
+        return len(self.profile_ids)
+
+    def ensure_loaded(self, db: Session):
+        """색인이 비어 있거나 무효화되었으면 적재 (동시 요청은 한 번만 적재)"""
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                count = self.load(db)
+                print(f"[COMPATIBILITY] 사주 프로필 {count}개 적재 완료")
+
+    def add_profile(self, profile: models.SajuProfile) -> bool:
+        """
+        새 사주 프로필을 색인 끝에 추가 (전체 다시 적재하지 않음, 추가 여부)
+        아직 적재 전이면 다음 적재에 포함되므로 아무것도 하지 않습니다.
+        """
+        arrays = _profile_arrays([(profile.id, profile.user_id, profile.name,
+                                   profile.birth_ymdh, profile.oheng_json)])
+        with self._lock:
+            if not self.loaded or profile.id in self.profile_ids:
+                return False
+            for name, value in arrays.items():
+                current = getattr(self, name)
+                setattr(self, name, current + value if name == 'names' else np.concatenate([current, value]))
+        return len(arrays['profile_ids']) > 0
+
+    def invalidate(self):
+        """일괄 재계산 후 다음 조회 시 다시 적재하도록 표시"""
+        with self._lock:
+            self.loaded = False
+
+    def scores(self, oheang: np.ndarray, day_gan: int, day_ji: int, year_ji: int) -> dict:
+        """
+        한 사주와 전체 프로필의 궁합 점수 (각 항목 0~1, total 0~100)
+        오행 균형: 두 사람의 오행을 합쳤을 때 고른 분포(각 20%)에 가까울수록 높음
+        """
+        combined = self.oheang + np.asarray(oheang, dtype=np.float32)
+        totals = combined.sum(axis=1, keepdims=True)
+        ratios = combined / np.maximum(totals, 1.0)
+        # 균등 분포와의 L1 거리 최댓값은 2 * (1 - 0.2) = 1.6
+        balance = 1.0 - np.abs(ratios - 0.2).sum(axis=1) / 1.6
+
+        stem = STEM_HARMONY[day_gan][self.day_gan]
+        branch = (BRANCH_HARMONY[day_ji][self.day_ji] + BRANCH_HARMONY[year_ji][self.year_ji]) * 0.5
+
+        total = (BALANCE_WEIGHT * balance + STEM_WEIGHT * stem + BRANCH_WEIGHT * branch) * 100
+        return {'total': total, 'balance': balance, 'stem': stem, 'branch': branch}
+
+    def top_matches(self, user_id: int, k: int = 10) -> list:
+        """사용자와 궁합 점수가 높은 상위 k개 프로필 (본인 제외)"""
+        with self._lock:
+            rows = np.flatnonzero(self.user_ids == user_id)
+            if len(rows) == 0:
+                raise ValueError(f"사용자 {user_id}의 사주 프로필이 없습니다.")
+            row = rows[0]
+
+            result = self.scores(self.oheang[row], int(self.day_gan[row]),
+                                 int(self.day_ji[row]), int(self.year_ji[row]))
+            total = result['total']
+            total[self.user_ids == user_id] = -np.inf
+
+            k = min(k, len(total) - 1)
+            if k <= 0:
+                return []
+
+            top = np.argpartition(-total, k - 1)[:k]
+            top = top[np.argsort(-total[top])]
+            # 후보가 k명보다 적으면 본인 행(-inf)이 섞일 수 있으므로 제외
+            top = top[np.isfinite(total[top])]
+
+            return [
+                {
+                    'user_id': int(self.user_ids[i]),
+                    'profile_id': int(self.profile_ids[i]),
+                    'name': self.names[i],
+                    'score': round(float(total[i]), 2),
+                    'element_balance': round(float(result['balance'][i]), 4),
+                    'stem_harmony': round(float(result['stem'][i]), 4),
+                    'branch_harmony': round(float(result['branch'][i]), 4)
+                }
+                for i in top.tolist()
+            ]
+
+
+# 전역 궁합 색인
+compatibility_index = CompatibilityIndex()
+
+
+def get_top_matches(db: Session, user_id: int, k: int = 10) -> list:
+    """궁합 상위 k명 조회 (색인이 비어 있거나 무효화되었으면 먼저 적재)"""
+    compatibility_index.ensure_loaded(db)
+    return compatibility_index.top_matches(user_id, k)
+
+
+if __name__ == "__main__":
+    # 합성 프로필 10만 명 전수 스캔 벤치마크
+    rng = np.random.default_rng(0)
+    n = 100000
+
+    index = CompatibilityIndex()
+    index.profile_ids = np.arange(n, dtype=np.int64)
+    index.user_ids = np.arange(n, dtype=np.int64)
+    index.names = [f"user{i}" for i in range(n)]
+    index.oheang = rng.multinomial(8, [0.2] * 5, size=n).astype(np.float32)
+    index.day_gan = rng.integers(0, 10, n).astype(np.int8)
+    index.day_ji = rng.integers(0, 12, n).astype(np.int8)
+    index.year_ji = rng.integers(0, 12, n).astype(np.int8)
+    index.loaded = True
+
+    start = time.perf_counter()
+    matches = index.top_matches(0, k=10)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{n}명 궁합 스캔: {elapsed:.1f}ms")
+    for match in matches[:3]:
+        print(match)
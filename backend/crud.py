@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, tuple_
 import models, schemas
-from saju import analyze_saju
+from saju import analyze_saju, analyze_saju_batch, OHEANG
+from draw_store import draw_store
+import lotto_bitmask
 import datetime
+import itertools
+import numpy as np
 from typing import List, Optional
 
 def get_user_by_email(db: Session, email: str):
@@ -83,6 +87,46 @@ def create_saju_profile(db: Session, user_id: int, saju_profile: schemas.SajuPro
     db.refresh(db_saju_profile)
     return db_saju_profile
 
+def parse_birth_ymdh(birth_ymdh: str) -> Optional[tuple]:
+    """'YYYY-MM-DD HH:00' 형식의 생년월일시 문자열 파싱"""
+    try:
+        date_part, time_part = birth_ymdh.split(' ')
+        year, month, day = date_part.split('-')
+        return int(year), int(month), int(day), int(time_part.split(':')[0])
+    except (AttributeError, ValueError):
+        return None
+
+def recompute_saju_profiles(db: Session, batch_size: int = 10000) -> int:
+    """모든 사주 프로필의 오행 분포(oheng_json)를 배치 분석으로 재계산"""
+    rows = db.query(models.SajuProfile.id, models.SajuProfile.birth_ymdh).all()
+
+    updated_count = 0
+    for start in range(0, len(rows), batch_size):
+        ids = []
+        births = []
+        for profile_id, birth_ymdh in rows[start:start + batch_size]:
+            parsed = parse_birth_ymdh(birth_ymdh)
+            if parsed:
+                ids.append(profile_id)
+                births.append(parsed)
+
+        if not births:
+            continue
+
+        years, months, days, hours = zip(*births)
+        result = analyze_saju_batch(years, months, days, hours)
+
+        mappings = [
+            {'id': profile_id, 'oheng_json': dict(zip(OHEANG, counts.tolist()))}
+            for profile_id, counts, valid in zip(ids, result['oheang'], result['valid'])
+            if valid
+        ]
+        db.bulk_update_mappings(models.SajuProfile, mappings)
+        db.commit()
+        updated_count += len(mappings)
+
+    return updated_count
+
 def get_lotto_draw(db: Session, draw_no: int):
     return db.query(models.LottoDraw).filter(models.LottoDraw.draw_no == draw_no).first()
 
@@ -102,10 +146,188 @@ def create_lotto_draw(db: Session, lotto_data: dict):
         bonus=lotto_data["bonus_number"]
     )
     db.add(db_lotto_draw)
+    # 번호 빈도 색인도 같은 트랜잭션에서 갱신
+    _apply_draw_to_number_statistics(db, db_lotto_draw)
     db.commit()
     db.refresh(db_lotto_draw)
+    draw_store.invalidate()
     return db_lotto_draw
 
+# 번호 빈도/동시 출현 색인 관련 함수들
+NUMBER_STATISTICS_ID = 1
+
+# 감쇠 출현 점수의 기본 반감기 (회차 수, 약 1년)
+DEFAULT_DECAY_HALF_LIFE = 52
+
+# 한 회차(6개 번호)에서 나오는 3개 번호 조합의 열 인덱스 (20, 3)
+TRIPLET_COMBINATIONS = np.array(list(itertools.combinations(range(6), 3)), dtype=np.int64)
+
+# 번호 쌍 테이블의 행 (number_a < number_b, 1~45)
+NUMBER_PAIRS = np.array(list(itertools.combinations(range(1, 46), 2)), dtype=np.int64)
+
+def triplet_codes(numbers: np.ndarray) -> np.ndarray:
+    """
+    (N, 6) 당첨 번호(1~45)의 모든 3개 조합 코드 (N*20,)
+    오름차순 번호 a<b<c(0부터)를 a*45*45 + b*45 + c 하나의 정수로 표현합니다.
+    """
+    numbers = np.sort(np.asarray(numbers, dtype=np.int64).reshape(-1, 6), axis=1) - 1
+    triples = numbers[:, TRIPLET_COMBINATIONS]  # (N, 20, 3)
+    return (triples[..., 0] * 2025 + triples[..., 1] * 45 + triples[..., 2]).ravel()
+
+def decode_triplet_codes(codes: np.ndarray) -> np.ndarray:
+    """삼중 코드를 (M, 3) 번호 배열(1~45, 오름차순)로 변환"""
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.stack([codes // 2025, codes // 45 % 45, codes % 45], axis=-1) + 1
+
+def _number_statistics_arrays(numbers: np.ndarray) -> tuple:
+    """(N, 6) 당첨 번호의 빈도 (45,), 쌍 동시 출현 (45, 45), 희소 삼중 동시 출현 (코드, 횟수)"""
+    # 회차 x 번호 원-핫 행렬의 내적(회차별 외적의 합)으로 동시 출현 횟수 계산
+    # (float32 BLAS 내적, 2^24회 미만의 횟수는 정확히 표현됨)
+    one_hot = np.zeros((len(numbers), 45), dtype=np.float32)
+    np.put_along_axis(one_hot, numbers - 1, 1, axis=1)
+    cooccurrence = (one_hot.T @ one_hot).astype(np.int64)
+    frequency = np.diag(cooccurrence).copy()
+    np.fill_diagonal(cooccurrence, 0)
+
+    triplet_counts = np.bincount(triplet_codes(numbers), minlength=45 ** 3)
+    keys = np.flatnonzero(triplet_counts)
+    return frequency, cooccurrence, keys, triplet_counts[keys]
+
+def _decay_factor(half_life: int) -> float:
+    """회차당 감쇠 계수 (half_life 회차 후 0.5)"""
+    return 0.5 ** (1.0 / half_life)
+
+def _decayed_frequency(numbers: np.ndarray, half_life: int) -> np.ndarray:
+    """(N, 6) 당첨 번호(오래된 회차부터)의 지수 감쇠 출현 점수 - 최신 회차 가중치 1"""
+    ages = np.arange(len(numbers) - 1, -1, -1, dtype=np.float64)
+    weights = np.repeat(_decay_factor(half_life) ** ages, 6)
+    return np.bincount(numbers.ravel() - 1, weights=weights, minlength=45)
+
+def rebuild_number_statistics(db: Session, half_life: int = None) -> models.NumberStatistics:
+    """전체 당첨 번호로 번호 빈도/쌍/삼중 동시 출현 색인을 다시 계산 (최초 1회 또는 복구용)"""
+    rows = db.query(
+        models.LottoDraw.draw_no,
+        models.LottoDraw.n1, models.LottoDraw.n2, models.LottoDraw.n3,
+        models.LottoDraw.n4, models.LottoDraw.n5, models.LottoDraw.n6
+    ).order_by(models.LottoDraw.draw_no.asc()).all()
+
+    numbers = np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, 6)
+    frequency, cooccurrence, triplet_keys, triplet_counts = _number_statistics_arrays(numbers)
+
+    statistics = db.get(models.NumberStatistics, NUMBER_STATISTICS_ID)
+    if statistics is None:
+        statistics = models.NumberStatistics(id=NUMBER_STATISTICS_ID)
+        db.add(statistics)
+    half_life = half_life or statistics.decay_half_life or DEFAULT_DECAY_HALF_LIFE
+
+    statistics.total_draws = len(rows)
+    statistics.first_draw_no = rows[0][0] if rows else None
+    statistics.last_draw_no = rows[-1][0] if rows else None
+    statistics.frequency = frequency.tolist()
+    statistics.decay_half_life = half_life
+    statistics.decayed_frequency = _decayed_frequency(numbers, half_life).tolist()
+
+    # 쌍/삼중 테이블은 전체 교체 (쌍은 횟수 0인 쌍도 모두 생성)
+    db.query(models.NumberPairCount).delete(synchronize_session=False)
+    db.query(models.NumberTripletCount).delete(synchronize_session=False)
+    pair_counts = cooccurrence[NUMBER_PAIRS[:, 0] - 1, NUMBER_PAIRS[:, 1] - 1]
+    db.bulk_insert_mappings(models.NumberPairCount, [
+        {'number_a': a, 'number_b': b, 'count': count}
+        for (a, b), count in zip(NUMBER_PAIRS.tolist(), pair_counts.tolist())
+    ])
+    db.bulk_insert_mappings(models.NumberTripletCount, [
+        {'code': code, 'count': count}
+        for code, count in zip(triplet_keys.tolist(), triplet_counts.tolist())
+    ])
+    return statistics
+
+def _number_statistics_ready(db: Session, statistics: Optional[models.NumberStatistics]) -> bool:
+    """색인이 현재 형식인지 (행이 있고 감쇠 점수와 쌍 테이블이 채워져 있음)"""
+    return (statistics is not None and statistics.decayed_frequency is not None
+            and db.get(models.NumberPairCount, (1, 2)) is not None)
+
+def _apply_draw_to_number_statistics(db: Session, draw: models.LottoDraw):
+    """새 회차 한 건을 색인에 누적 (색인이 없거나 이전 형식이면, 또는 과거 회차가 추가되면 전체 재계산)"""
+    statistics = db.get(models.NumberStatistics, NUMBER_STATISTICS_ID)
+    if (not _number_statistics_ready(db, statistics)
+            or (statistics.last_draw_no is not None and draw.draw_no < statistics.last_draw_no)):
+        db.flush()
+        rebuild_number_statistics(db)
+        return
+
+    numbers = sorted(n - 1 for n in (draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6))
+
+    # JSON 컬럼은 새 객체를 대입해야 변경이 감지되므로 복사 후 갱신 (45개)
+    frequency = list(statistics.frequency)
+    for a in numbers:
+        frequency[a] += 1
+
+    # 쌍: 이 회차의 15쌍만 갱신 (모든 쌍의 행이 미리 있으므로 UPDATE 한 번)
+    pairs = [(a + 1, b + 1) for a, b in itertools.combinations(numbers, 2)]
+    db.query(models.NumberPairCount).filter(
+        tuple_(models.NumberPairCount.number_a, models.NumberPairCount.number_b).in_(pairs)
+    ).update({models.NumberPairCount.count: models.NumberPairCount.count + 1}, synchronize_session=False)
+
+    # 삼중: 이 회차의 20조합 중 있는 행은 +1, 없는 행은 새로 추가
+    codes = triplet_codes(np.array(numbers) + 1).tolist()
+    existing = {code for (code,) in db.query(models.NumberTripletCount.code).filter(
+        models.NumberTripletCount.code.in_(codes)
+    )}
+    if existing:
+        db.query(models.NumberTripletCount).filter(models.NumberTripletCount.code.in_(existing)).update(
+            {models.NumberTripletCount.count: models.NumberTripletCount.count + 1}, synchronize_session=False
+        )
+    db.bulk_insert_mappings(models.NumberTripletCount, [
+        {'code': code, 'count': 1} for code in codes if code not in existing
+    ])
+
+    # 감쇠 점수: 기존 점수를 한 회차만큼 감쇠시킨 뒤 새 번호에 1 추가 (O(45))
+    decay = _decay_factor(statistics.decay_half_life)
+    decayed_frequency = [score * decay for score in statistics.decayed_frequency]
+    for a in numbers:
+        decayed_frequency[a] += 1.0
+
+    statistics.frequency = frequency
+    statistics.decayed_frequency = decayed_frequency
+    statistics.total_draws += 1
+    if statistics.first_draw_no is None or draw.draw_no < statistics.first_draw_no:
+        statistics.first_draw_no = draw.draw_no
+    if statistics.last_draw_no is None or draw.draw_no > statistics.last_draw_no:
+        statistics.last_draw_no = draw.draw_no
+
+def get_number_statistics(db: Session) -> models.NumberStatistics:
+    """번호 빈도/동시 출현 색인 조회 (없으면 생성)"""
+    statistics = db.get(models.NumberStatistics, NUMBER_STATISTICS_ID)
+    if not _number_statistics_ready(db, statistics):
+        statistics = rebuild_number_statistics(db)
+        db.commit()
+    return statistics
+
+def get_number_cooccurrence(db: Session) -> np.ndarray:
+    """번호 쌍 동시 출현 횟수 (45, 45) 대칭 행렬 (대각선은 0)"""
+    rows = np.array(db.query(
+        models.NumberPairCount.number_a, models.NumberPairCount.number_b, models.NumberPairCount.count
+    ).all(), dtype=np.int64).reshape(-1, 3)
+    cooccurrence = np.zeros((45, 45), dtype=np.int64)
+    cooccurrence[rows[:, 0] - 1, rows[:, 1] - 1] = rows[:, 2]
+    cooccurrence[rows[:, 1] - 1, rows[:, 0] - 1] = rows[:, 2]
+    return cooccurrence
+
+def get_number_triplets(db: Session) -> tuple:
+    """번호 세 개 동시 출현 횟수 (코드 오름차순 배열, 횟수 배열)"""
+    rows = np.array(db.query(models.NumberTripletCount.code, models.NumberTripletCount.count).order_by(
+        models.NumberTripletCount.code.asc()
+    ).all(), dtype=np.int64).reshape(-1, 2)
+    return rows[:, 0], rows[:, 1]
+
+def set_decay_half_life(db: Session, half_life: int) -> models.NumberStatistics:
+    """감쇠 점수 반감기 변경 (전체 회차로 감쇠 점수 재계산)"""
+    if half_life <= 0:
+        raise ValueError("반감기는 1회차 이상이어야 합니다.")
+    statistics = rebuild_number_statistics(db, half_life=half_life)
+    db.commit()
+    return statistics
+
 # 예측 히스토리 관련 함수들
 def save_prediction(db: Session, user_id: int, predicted_numbers: List[int], method: str, confidence: float, saju_weights: dict = None, draw_no: int = None):
     """사용자 예측을 데이터베이스에 저장"""
@@ -166,29 +388,30 @@ def get_user_stats(db: Session, user_id: int):
     }
 
 def check_winning_results(db: Session):
-    """예측 결과를 실제 당첨 번호와 비교하여 업데이트"""
+    """예측 결과를 실제 당첨 번호와 비교하여 업데이트 (비트마스크 AND + popcount)"""
     # 당첨 결과가 확인되지 않은 예측들 찾기
     predictions = db.query(models.Prediction).filter(
         models.Prediction.is_winning.is_(None),
         models.Prediction.draw_no.isnot(None)
     ).all()
     
+    if not predictions:
+        return 0
+    
+    # 필요한 회차의 당첨 마스크를 한 번에 조회
+    draw_nos = {prediction.draw_no for prediction in predictions}
+    draw_masks = {
+        draw.draw_no: lotto_bitmask.lotto_draw_mask(draw)
+        for draw in db.query(models.LottoDraw).filter(models.LottoDraw.draw_no.in_(draw_nos))
+    }
+    
     updated_count = 0
     for prediction in predictions:
-        # 해당 회차의 당첨 번호 찾기
-        winning_draw = db.query(models.LottoDraw).filter(
-            models.LottoDraw.draw_no == prediction.draw_no
-        ).first()
+        draw = draw_masks.get(prediction.draw_no)
         
-        if winning_draw:
-            winning_numbers = [
-                winning_draw.n1, winning_draw.n2, winning_draw.n3,
-                winning_draw.n4, winning_draw.n5, winning_draw.n6
-            ]
-            
-            predicted_numbers = prediction.predicted_numbers
-            matched_numbers = list(set(winning_numbers) & set(predicted_numbers))
-            match_count = len(matched_numbers)
+        if draw is not None:
+            ticket = lotto_bitmask.prediction_mask(prediction)
+            match_count = lotto_bitmask.match_count(ticket, draw)
             
             # 예측 결과 업데이트
             prediction.match_count = match_count
@@ -196,16 +419,15 @@ def check_winning_results(db: Session):
             
             # 당첨 히스토리 생성
             if match_count >= 3:
-                prize_rank = get_prize_rank(match_count)
                 winning_history = models.WinningHistory(
                     user_id=prediction.user_id,
                     prediction_id=prediction.id,
                     draw_no=prediction.draw_no,
                     match_count=match_count,
-                    winning_numbers=winning_numbers,
-                    predicted_numbers=predicted_numbers,
-                    matched_numbers=matched_numbers,
-                    prize_rank=prize_rank
+                    winning_numbers=lotto_bitmask.mask_numbers(draw),
+                    predicted_numbers=prediction.predicted_numbers,
+                    matched_numbers=lotto_bitmask.mask_numbers(ticket & draw),
+                    prize_rank=get_prize_rank(match_count, lotto_bitmask.bonus_hit(ticket, draw))
                 )
                 db.add(winning_history)
             
@@ -216,18 +438,9 @@ def check_winning_results(db: Session):
     
     return updated_count
 
-def get_prize_rank(match_count: int) -> str:
-    """일치 개수에 따른 당첨 등수 반환"""
-    if match_count == 6:
-        return "1등"
-    elif match_count == 5:
-        return "2등"  # 보너스 번호 확인은 생략
-    elif match_count == 4:
-        return "4등"
-    elif match_count == 3:
-        return "5등"
-    else:
-        return "등외"
+def get_prize_rank(match_count: int, has_bonus: bool = False) -> str:
+    """일치 개수와 보너스 번호 일치 여부에 따른 당첨 등수 반환"""
+    return lotto_bitmask.RANKS[lotto_bitmask.rank_index(match_count, has_bonus)]
 
 def get_user_winning_history(db: Session, user_id: int):
     """사용자의 당첨 히스토리"""
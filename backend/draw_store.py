@@ -0,0 +1,161 @@
+"""
+로또 당첨 번호 컬럼형 저장소
+모든 회차를 하나의 연속된 N×7 uint8 배열(n1~n6, 보너스)과 회차/추첨일 색인으로 메모리에 보관하고,
+새 회차가 들어왔을 때만 갱신합니다. 서비스들은 요청마다 ORM 객체를 읽지 않고 스냅샷의 뷰를 사용합니다.
+"""
+
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import func
+
+from database import SessionLocal
+from models import LottoDraw
+
+# 다른 프로세스(워커)의 회차 추가를 확인하는 최소 간격 (초)
+STORE_CHECK_INTERVAL = 60
+
+
+class DrawSnapshot:
+    """특정 시점의 전체 회차 (불변, 배열은 읽기 전용)"""
+
+    __slots__ = ('numbers', 'draw_nos', 'draw_dates')
+
+    def __init__(self, numbers: np.ndarray, draw_nos: np.ndarray, draw_dates: np.ndarray):
+        for array in (numbers, draw_nos, draw_dates):
+            array.flags.writeable = False
+        self.numbers = numbers        # (N, 7) uint8 - n1~n6, 보너스
+        self.draw_nos = draw_nos      # (N,) int32, 오름차순
+        self.draw_dates = draw_dates  # (N,) datetime64[D]
+
+    @property
+    def total_draws(self) -> int:
+        return len(self.draw_nos)
+
+    @property
+    def first_draw_no(self) -> int:
+        return int(self.draw_nos[0]) if len(self.draw_nos) else None
+
+    @property
+    def last_draw_no(self) -> int:
+        return int(self.draw_nos[-1]) if len(self.draw_nos) else None
+
+    @property
+    def main_numbers(self) -> np.ndarray:
+        """보너스를 제외한 당첨 번호 (N, 6) 뷰"""
+        return self.numbers[:, :6]
+
+    @property
+    def bonus_numbers(self) -> np.ndarray:
+        """보너스 번호 (N,) 뷰"""
+        return self.numbers[:, 6]
+
+    def recent(self, count: int) -> np.ndarray:
+        """최근 count개 회차의 당첨 번호 (오래된 회차부터, (count, 6) 뷰)"""
+        return self.numbers[-count:, :6] if count else self.numbers[:0, :6]
+
+    def index_of(self, draw_no: int) -> int:
+        """회차 번호의 행 인덱스 (없으면 -1)"""
+        index = int(np.searchsorted(self.draw_nos, draw_no))
+        if index < len(self.draw_nos) and self.draw_nos[index] == draw_no:
+            return index
+        return -1
+
+    def latest(self, count: int = 5) -> list:
+        """최근 count개 회차 딕셔너리 목록 (오래된 회차부터)"""
+        draws = []
+        for index in range(max(len(self.draw_nos) - count, 0), len(self.draw_nos)):
+            draw_date = self.draw_dates[index]
+            draws.append({
+                'draw_no': int(self.draw_nos[index]),
+                'numbers': self.numbers[index, :6].tolist(),
+                'bonus': int(self.numbers[index, 6]),
+                'draw_date': None if np.isnat(draw_date) else draw_date.item().isoformat()
+            })
+        return draws
+
+
+def _empty_snapshot() -> DrawSnapshot:
+    return DrawSnapshot(
+        np.zeros((0, 7), dtype=np.uint8),
+        np.zeros(0, dtype=np.int32),
+        np.zeros(0, dtype='datetime64[D]')
+    )
+
+
+class DrawStore:
+    """프로세스 전역 회차 저장소"""
+
+    def __init__(self):
+        self._snapshot = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """새 회차 저장 후 호출 - 다음 조회 시 DB에서 새 회차를 읽음"""
+        self._stale = True
+
+    def get(self) -> DrawSnapshot:
+        """현재 스냅샷 (새 회차가 있을 때만 갱신)"""
+        snapshot = self._snapshot
+        if (snapshot is not None and not self._stale
+                and time.monotonic() - self._checked_at < STORE_CHECK_INTERVAL):
+            return snapshot
+
+        with self._lock:
+            db = SessionLocal()
+            try:
+                self._snapshot = self._refresh(db, self._snapshot)
+            finally:
+                db.close()
+            self._stale = False
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def _refresh(self, db, snapshot: DrawSnapshot) -> DrawSnapshot:
+        """DB 회차 수/최신 회차를 비교하여 바뀐 경우에만 적재 (새 회차만 읽어 이어 붙임)"""
+        count, last_draw_no = db.query(func.count(LottoDraw.draw_no), func.max(LottoDraw.draw_no)).one()
+
+        if snapshot is not None and count == snapshot.total_draws and last_draw_no == snapshot.last_draw_no:
+            return snapshot
+
+        if snapshot is not None and snapshot.total_draws:
+            added = self._load(db, after_draw_no=snapshot.last_draw_no)
+            # 중간 회차가 추가/삭제된 경우는 전체를 다시 읽음
+            if snapshot.total_draws + added.total_draws == count:
+                print(f"[DRAW_STORE] 새 회차 {added.total_draws}개 추가 (총 {count}회)")
+                return DrawSnapshot(
+                    np.concatenate([snapshot.numbers, added.numbers]),
+                    np.concatenate([snapshot.draw_nos, added.draw_nos]),
+                    np.concatenate([snapshot.draw_dates, added.draw_dates])
+                )
+
+        snapshot = self._load(db)
+        print(f"[DRAW_STORE] 전체 회차 {snapshot.total_draws}개 적재")
+        return snapshot
+
+    def _load(self, db, after_draw_no: int = None) -> DrawSnapshot:
+        """회차 적재 (after_draw_no 이후만)"""
+        query = db.query(
+            LottoDraw.draw_no, LottoDraw.draw_date,
+            LottoDraw.n1, LottoDraw.n2, LottoDraw.n3,
+            LottoDraw.n4, LottoDraw.n5, LottoDraw.n6, LottoDraw.bonus
+        )
+        if after_draw_no is not None:
+            query = query.filter(LottoDraw.draw_no > after_draw_no)
+        rows = query.order_by(LottoDraw.draw_no.asc()).all()
+
+        if not rows:
+            return _empty_snapshot()
+
+        return DrawSnapshot(
+            np.array([row[2:] for row in rows], dtype=np.uint8),
+            np.array([row[0] for row in rows], dtype=np.int32),
+            np.array([row[1] or 'NaT' for row in rows], dtype='datetime64[D]')
+        )
+
+
+# 전역 회차 저장소
+draw_store = DrawStore()
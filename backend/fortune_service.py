@@ -0,0 +1,161 @@
+"""
+일진(日辰)/세운(歲運) 서비스
+시작 시 향후 N년간의 일별 일진과 연도별 세운 기둥을 메모리 배열로 미리 계산해 두고,
+사주 분석 결과(SajuResult)와 O(1)로 결합합니다. 요청 처리 중에는 달력 라이브러리를 사용하지 않습니다.
+"""
+
+import datetime
+
+import numpy as np
+
+import manseryeok
+import solar_terms
+from saju import (
+    PILLAR_TABLE, OHEANG, GAN_OHEANG_INDEX, JI_OHEANG_INDEX, Pillar, SajuResult
+)
+
+# 미리 계산할 기간 (년)
+FORTUNE_YEARS = 10
+
+# 일간 오행 기준 상대 오행의 십성(十星) 분류 - 인덱스: (상대 오행 - 일간 오행) % 5
+RELATION_NAMES = ['비겁', '식상', '재성', '관성', '인성']
+
+RELATION_DESCRIPTIONS = {
+    '비겁': '나와 같은 기운이 들어와 주관이 강해지는 때',
+    '식상': '내 기운이 밖으로 흘러 표현과 활동이 늘어나는 때',
+    '재성': '내가 다스리는 기운이 들어와 재물과 결실을 보는 때',
+    '관성': '나를 다스리는 기운이 들어와 책임과 절제가 필요한 때',
+    '인성': '나를 돕는 기운이 들어와 배움과 도움을 얻는 때'
+}
+
+
+def _relation(day_master_element: int, element: int) -> str:
+    """일간 오행과 상대 오행의 십성 관계"""
+    return RELATION_NAMES[(element - day_master_element) % 5]
+
+
+def _pillar_oheang(pillar: Pillar) -> np.ndarray:
+    """한 기둥의 오행 개수 (OHEANG 순서 int8 배열)"""
+    oheang = np.zeros(5, dtype=np.int8)
+    oheang[GAN_OHEANG_INDEX[pillar.gan_index]] += 1
+    oheang[JI_OHEANG_INDEX[pillar.ji_index]] += 1
+    return oheang
+
+
+class FortuneService:
+    """일진/세운 조회 서비스 (미리 계산된 배열 기반)"""
+
+    def __init__(self, years: int = FORTUNE_YEARS, start: datetime.date = None):
+        start = start or datetime.date.today()
+        table = manseryeok.get_table()
+
+        # 일진: 만세력 테이블 구간을 잘라 기둥 참조 목록과 오행 배열로 보관
+        first = min(max(start.toordinal() - table.start_ordinal, 0), table.count)
+        last = min(first + years * 366, table.count)
+        records = table.records[first:last]
+
+        self.start_ordinal = table.start_ordinal + first
+        self.days = last - first
+        self._day_pillars = [
+            PILLAR_TABLE[gan][ji]
+            for gan, ji in zip(records['day_gan'].tolist(), records['day_ji'].tolist())
+        ]
+
+        day_oheang = np.zeros((self.days, 5), dtype=np.int8)
+        rows = np.arange(self.days)
+        np.add.at(day_oheang, (rows, GAN_OHEANG_INDEX[records['day_gan']]), 1)
+        np.add.at(day_oheang, (rows, JI_OHEANG_INDEX[records['day_ji']]), 1)
+        day_oheang.flags.writeable = False
+        self.day_oheang = day_oheang
+
+        # 세운: 연도별 간지 (갑자년 1984 기준, get_ganzhi와 동일)
+        self.start_year = start.year
+        self._year_pillars = [
+            PILLAR_TABLE[(year - manseryeok.BASE_YEAR) % 10][(year - manseryeok.BASE_YEAR) % 12]
+            for year in range(self.start_year, self.start_year + years + 1)
+        ]
+
+        print(f"[FORTUNE] 일진 {self.days}일, 세운 {len(self._year_pillars)}년 사전 계산 완료")
+
+    def _day_index(self, target_date: datetime.date) -> int:
+        """사전 계산 구간의 인덱스 (구간 밖이면 -1)"""
+        index = target_date.toordinal() - self.start_ordinal
+        return index if 0 <= index < self.days else -1
+
+    def day_pillar(self, target_date: datetime.date) -> Pillar:
+        """해당 날짜의 일진 기둥 (구간 밖이면 만세력 테이블 조회)"""
+        index = self._day_index(target_date)
+        if index >= 0:
+            return self._day_pillars[index]
+        day_info = manseryeok.lookup(target_date.year, target_date.month, target_date.day)
+        return PILLAR_TABLE[day_info.day_gan][day_info.day_ji]
+
+    def year_pillar(self, year: int) -> Pillar:
+        """해당 연도의 세운 기둥"""
+        index = year - self.start_year
+        if 0 <= index < len(self._year_pillars):
+            return self._year_pillars[index]
+        year_diff = year - manseryeok.BASE_YEAR
+        return PILLAR_TABLE[year_diff % 10][year_diff % 12]
+
+    def _overlay(self, saju_result: SajuResult, pillar: Pillar, pillar_oheang: np.ndarray) -> dict:
+        """운의 기둥을 원국에 겹친 결과 (십성 관계, 합산 오행)"""
+        day_master = int(GAN_OHEANG_INDEX[saju_result.pillars.day.gan_index])
+        gan_relation = _relation(day_master, int(GAN_OHEANG_INDEX[pillar.gan_index]))
+        ji_relation = _relation(day_master, int(JI_OHEANG_INDEX[pillar.ji_index]))
+
+        return {
+            'pillar': pillar.to_dict(),
+            'relations': {'gan': gan_relation, 'ji': ji_relation},
+            'description': RELATION_DESCRIPTIONS[gan_relation],
+            'oheang': dict(zip(OHEANG, (saju_result.oheang + pillar_oheang).tolist()))
+        }
+
+    def daily_fortune(self, saju_result: SajuResult, target_date: datetime.date = None) -> dict:
+        """일진 운세 (해당 날짜의 일진과 그 해 세운을 원국에 결합)"""
+        target_date = target_date or datetime.date.today()
+
+        index = self._day_index(target_date)
+        day_pillar = self.day_pillar(target_date)
+        day_oheang = self.day_oheang[index] if index >= 0 else _pillar_oheang(day_pillar)
+
+        # 세운은 입춘 기준 (입춘 당일부터 새 해의 기둥)
+        year_pillar = self.year_pillar(
+            solar_terms.saju_year(target_date.year, target_date.month, target_date.day, 23, 59)
+        )
+
+        return {
+            'date': target_date.isoformat(),
+            'day_master': saju_result.pillars.day.gan,
+            'daily': self._overlay(saju_result, day_pillar, day_oheang),
+            'yearly': self._overlay(saju_result, year_pillar, _pillar_oheang(year_pillar))
+        }
+
+    def yearly_fortune(self, saju_result: SajuResult, year: int = None) -> dict:
+        """세운 운세 (해당 연도 간지를 원국에 결합)"""
+        year = year or datetime.date.today().year
+        year_pillar = self.year_pillar(year)
+
+        return {
+            'year': year,
+            'day_master': saju_result.pillars.day.gan,
+            'yearly': self._overlay(saju_result, year_pillar, _pillar_oheang(year_pillar))
+        }
+
+
+# 전역 서비스 인스턴스 (import 시 사전 계산)
+fortune_service = FortuneService()
+
+
+if __name__ == "__main__":
+    import timeit
+    from saju import analyze_saju_result
+
+    result = analyze_saju_result(1990, 5, 15, 10)
+    print(fortune_service.daily_fortune(result))
+    print(fortune_service.yearly_fortune(result))
+
+    today = datetime.date.today()
+    iterations = 100000
+    per_call = timeit.timeit(lambda: fortune_service.day_pillar(today), number=iterations) / iterations
+    print(f"일진 조회: {per_call * 1e9:.0f}ns/회")
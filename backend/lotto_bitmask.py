@@ -0,0 +1,167 @@
+"""
+로또 번호 비트마스크 모듈
+티켓과 당첨 번호를 uint64 하나로 표현하고 일치 개수를 AND + popcount로 계산합니다.
+
+    비트 0~44  : 번호 1~45 (번호 n -> 비트 n-1)
+    비트 48~53 : 당첨 번호의 보너스 번호 (1~45, 티켓은 0)
+
+보너스 일치 여부는 티켓에서 보너스 번호 위치의 비트 하나만 확인합니다.
+"""
+
+from math import comb
+from typing import Iterable, List
+
+import numpy as np
+
+NUMBER_BITS = (1 << 45) - 1
+BONUS_SHIFT = 48
+
+# 등수 (인덱스 0~4가 1~5등, 5가 등외)
+RANKS = ['1등', '2등', '3등', '4등', '5등', '등외']
+NO_PRIZE = len(RANKS) - 1
+
+# 무작위 티켓의 이론적 등수 확률 (C(45,6) 기준)
+_TOTAL_COMBINATIONS = comb(45, 6)
+THEORETICAL_PROBABILITIES = {
+    '1등': 1 / _TOTAL_COMBINATIONS,
+    '2등': 6 / _TOTAL_COMBINATIONS,
+    '3등': comb(6, 5) * 38 / _TOTAL_COMBINATIONS,
+    '4등': comb(6, 4) * comb(39, 2) / _TOTAL_COMBINATIONS,
+    '5등': comb(6, 3) * comb(39, 3) / _TOTAL_COMBINATIONS
+}
+
+
+# ============================================================================
+# 단건 (Python int)
+# ============================================================================
+
+def ticket_mask(numbers: Iterable[int]) -> int:
+    """번호 목록(1~45)을 티켓 마스크로 변환 (범위 밖 번호는 ValueError)"""
+    mask = 0
+    for number in numbers:
+        number = int(number)
+        if not 1 <= number <= 45:
+            raise ValueError(f"로또 번호는 1~45 범위여야 합니다: {number}")
+        mask |= 1 << (number - 1)
+    return mask
+
+
+def draw_mask(numbers: Iterable[int], bonus: int = None) -> int:
+    """당첨 번호 6개와 보너스 번호를 당첨 마스크로 변환"""
+    mask = ticket_mask(numbers)
+    if bonus:
+        mask |= int(bonus) << BONUS_SHIFT
+    return mask
+
+
+def lotto_draw_mask(draw) -> int:
+    """LottoDraw 행의 당첨 마스크"""
+    return draw_mask((draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6), draw.bonus)
+
+
+def prediction_mask(prediction) -> int:
+    """Prediction 행(predicted_numbers JSON)의 티켓 마스크 (1~45 범위 밖 값은 무시)"""
+    numbers = prediction.predicted_numbers or []
+    return ticket_mask(number for number in numbers if isinstance(number, int) and 1 <= number <= 45)
+
+
+def mask_numbers(mask: int) -> List[int]:
+    """마스크의 번호 목록 (오름차순, 보너스 제외)"""
+    mask &= NUMBER_BITS
+    numbers = []
+    while mask:
+        low_bit = mask & -mask
+        numbers.append(low_bit.bit_length())
+        mask ^= low_bit
+    return numbers
+
+
+def popcount(mask: int) -> int:
+    """비트 수"""
+    return bin(mask).count('1')
+
+
+def match_count(ticket: int, draw: int) -> int:
+    """티켓과 당첨 번호의 일치 개수"""
+    return popcount(ticket & draw & NUMBER_BITS)
+
+
+def bonus_hit(ticket: int, draw: int) -> bool:
+    """티켓에 당첨 번호의 보너스 번호가 포함되었는지 여부"""
+    bonus = draw >> BONUS_SHIFT
+    return bool(bonus) and bool((ticket >> (bonus - 1)) & 1)
+
+
+def rank_index(matches: int, has_bonus: bool) -> int:
+    """일치 개수와 보너스 일치 여부의 등수 인덱스 (RANKS 기준)"""
+    if matches == 6:
+        return 0
+    if matches == 5:
+        return 1 if has_bonus else 2
+    if matches >= 3:
+        return 7 - matches
+    return NO_PRIZE
+
+
+def prize_rank(ticket: int, draw: int) -> str:
+    """티켓의 당첨 등수"""
+    return RANKS[rank_index(match_count(ticket, draw), bonus_hit(ticket, draw))]
+
+
+# ============================================================================
+# 배치 (NumPy uint64)
+# ============================================================================
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+_NUMBER_BITS = np.uint64(NUMBER_BITS)
+_BONUS_SHIFT = np.uint64(BONUS_SHIFT)
+
+
+def popcount64(masks: np.ndarray) -> np.ndarray:
+    """uint64 배열의 비트 수 (SWAR 방식)"""
+    x = masks - ((masks >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def ticket_masks(numbers: np.ndarray) -> np.ndarray:
+    """(N, k) 번호 배열(1~45)을 티켓 마스크 배열로 변환"""
+    bits = np.left_shift(np.uint64(1), np.asarray(numbers, dtype=np.uint64) - np.uint64(1))
+    # 한 행의 번호는 서로 다르므로 비트 합 = 비트 OR
+    return bits.sum(axis=-1, dtype=np.uint64)
+
+
+def draw_masks(numbers: np.ndarray) -> np.ndarray:
+    """(N, 7) 당첨 번호 배열(n1~n6, 보너스)을 당첨 마스크 배열로 변환 (draw_store 스냅샷 형식)"""
+    numbers = np.asarray(numbers)
+    return ticket_masks(numbers[:, :6]) | (numbers[:, 6].astype(np.uint64) << _BONUS_SHIFT)
+
+
+def match_bulk(tickets: np.ndarray, draws: np.ndarray) -> tuple:
+    """
+    티켓 마스크와 당첨 마스크 배열의 일괄 비교 (브로드캐스팅 지원)
+    Returns: (일치 개수 uint8 배열, 보너스 일치 bool 배열)
+    """
+    tickets = np.asarray(tickets, dtype=np.uint64)
+    draws = np.asarray(draws, dtype=np.uint64)
+
+    matches = popcount64(tickets & draws & _NUMBER_BITS)
+    bonus = draws >> _BONUS_SHIFT
+    bonus_bit = tickets >> (np.maximum(bonus, np.uint64(1)) - np.uint64(1))
+    has_bonus = (bonus > 0) & ((bonus_bit & np.uint64(1)) == 1)
+    return matches, has_bonus
+
+
+def rank_bulk(matches: np.ndarray, has_bonus: np.ndarray) -> np.ndarray:
+    """일치 개수/보너스 일치 배열의 등수 인덱스 배열 (RANKS 기준, int8)"""
+    rank = np.full(matches.shape, NO_PRIZE, dtype=np.int8)
+    rank[matches == 3] = 4
+    rank[matches == 4] = 3
+    rank[matches == 5] = 2
+    rank[(matches == 5) & has_bonus] = 1
+    rank[matches == 6] = 0
+    return rank
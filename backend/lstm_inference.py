@@ -0,0 +1,124 @@
+"""
+LSTM 추론 마이크로 배치
+서로 다른 입력 구간(백테스트, 관리 도구 등)의 단건 추론 요청을 짧은 시간 창 동안 모아
+모델 버전별로 한 번의 배치 predict 호출로 처리합니다. (1, 10, 6) 단건 호출마다 드는 Keras 오버헤드를 줄입니다.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+# 요청을 모으는 최대 대기 시간 (초)
+BATCH_WINDOW_SECONDS = 0.005
+
+# 한 번의 predict 호출에 넣는 최대 구간 수
+MAX_BATCH_SIZE = 256
+
+
+class InferenceBatcher:
+    """
+    단건 추론 요청 병합기
+    predict_batch(windows (B, 10, 6), version) -> (B, 6) 함수를 백그라운드 스레드 하나에서 호출합니다.
+    """
+
+    def __init__(self, predict_batch: Callable[[np.ndarray, Optional[str]], np.ndarray],
+                 window_seconds: float = BATCH_WINDOW_SECONDS, max_batch_size: int = MAX_BATCH_SIZE):
+        self.predict_batch = predict_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, window: np.ndarray, version: Optional[str] = None) -> Future:
+        """(10, 6) 입력 구간 하나의 추론 요청 (결과는 (6,) 기본 번호 배열)"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((np.asarray(window, dtype=np.float32), version, future))
+        return future
+
+    def predict(self, window: np.ndarray, version: Optional[str] = None, timeout: Optional[float] = None) -> np.ndarray:
+        """추론 요청 후 결과를 기다려 반환"""
+        return self.submit(window, version).result(timeout)
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='lstm-inference', daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> list:
+        """첫 요청을 기다린 뒤 시간 창이 끝나거나 최대 크기가 될 때까지 요청을 모음"""
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+
+            # 모델 버전별로 묶어 한 번씩 예측
+            by_version = {}
+            for request in pending:
+                by_version.setdefault(request[1], []).append(request)
+
+            for version, requests in by_version.items():
+                # 취소된 요청 제외
+                active = [(window, future) for window, _, future in requests
+                          if future.set_running_or_notify_cancel()]
+                if not active:
+                    continue
+                windows, futures = zip(*active)
+                try:
+                    results = self.predict_batch(np.stack(windows), version)
+                    for future, result in zip(futures, results):
+                        future.set_result(result)
+                except Exception as e:
+                    for future in futures:
+                        future.set_exception(e)
+                self.batches += 1
+                self.requests += len(futures)
+
+    def stats(self) -> dict:
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0
+        }
+
+
+if __name__ == "__main__":
+    # 동시 요청 병합 확인 (가짜 모델: 호출당 고정 비용 2ms)
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fake_predict(windows, version):
+        time.sleep(0.002)
+        return windows[:, -1, :].astype(int)
+
+    batcher = InferenceBatcher(fake_predict)
+    rng = np.random.default_rng(0)
+    windows = rng.integers(1, 46, (1000, 10, 6))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        results = list(executor.map(batcher.predict, windows))
+    elapsed = time.perf_counter() - started
+
+    assert all((result == window[-1]).all() for result, window in zip(results, windows))
+    print(f"요청 {len(windows)}건: {elapsed * 1000:.0f}ms, {batcher.stats()}")
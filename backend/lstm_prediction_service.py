@@ -5,144 +5,205 @@ LSTM 기반 로또 번호 예측 서비스
 """
 
 import numpy as np
-import pickle
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
-
-from database import SessionLocal
-from models import LottoDraw
+from draw_store import draw_store
+from model_registry import ModelRegistry, model_registry, STATE_READY
+from model_artifacts import MANIFEST_FILE, artifact_path, bundle_dir, read_manifest
+from lstm_inference import InferenceBatcher
 import saju
 
 class LSTMPredictionService:
-    def __init__(self):
-        self.model = None
-        self.scaler = None
-        self.model_loaded = False
-        self.model_path = None
-        self.scaler_path = None
-        
+    """
+    LSTM 예측 서비스
+    모델은 model_registry가 서버 시작 시 미리 적재하며, 요청 처리 중에는 적재된 모델만 사용합니다.
+    """
+    
+    def __init__(self, registry: ModelRegistry = None):
+        self.registry = registry or model_registry
+        # 최신 회차 입력의 기본 예측 캐시: (모델 버전, 최신 회차 번호) -> (6,) 배열
+        self._snapshot_predictions = {}
+        self._snapshot_lock = threading.Lock()
+        # 서로 다른 입력 구간의 단건 추론을 모아 배치로 실행
+        self.batcher = InferenceBatcher(self.predict_base_numbers)
+    
+    @property
+    def model_loaded(self) -> bool:
+        return self.registry.state == STATE_READY
+    
+    @property
+    def model(self):
+        return self.registry.get().model
+    
+    @property
+    def scaler(self):
+        return self.registry.get().scaler
+    
+    @property
+    def model_path(self) -> Optional[str]:
+        return self.registry.get().model_path if self.model_loaded else None
+    
+    @property
+    def scaler_path(self) -> Optional[str]:
+        return self.registry.get().scaler_path if self.model_loaded else None
+    
     def find_latest_model_files(self) -> tuple[Optional[str], Optional[str]]:
-        """최신 모델 파일들을 찾습니다."""
-        try:
-            # 현재 디렉토리에서 모델 파일들 찾기 (.keras와 .h5 형식 모두 지원)
-            model_files = [f for f in os.listdir('.') if f.startswith('lotto_lstm_model_') and (f.endswith('.keras') or f.endswith('.h5'))]
-            scaler_files = [f for f in os.listdir('.') if f.startswith('lotto_lstm_model_scaler_') and f.endswith('.pkl')]
-            
-            if not model_files or not scaler_files:
-                return None, None
-                
-            # 최신 파일 선택 (타임스탬프 기준)
-            model_files.sort(reverse=True)
-            scaler_files.sort(reverse=True)
-            
-            return model_files[0], scaler_files[0]
-            
-        except Exception as e:
-            print(f"모델 파일 검색 중 오류: {e}")
+        """현재 버전 번들의 (가중치 파일, 매니페스트 파일) - 포인터 파일만 읽고 디렉터리는 조회하지 않습니다."""
+        version = self.registry.current_version()
+        if version is None:
             return None, None
+        artifact_dir = self.registry.artifact_dir
+        manifest = read_manifest(version, artifact_dir)
+        return (artifact_path(manifest, 'weights', artifact_dir),
+                os.path.join(bundle_dir(version, artifact_dir), MANIFEST_FILE))
     
-    def load_model_files(self) -> bool:
-        """LSTM 모델과 스케일러를 로드합니다."""
+    def load_model_files(self, version: Optional[str] = None) -> bool:
+        """
+        LSTM 모델과 스케일러를 적재될 때까지 기다려 로드합니다. (관리/오프라인 작업용)
+        요청 처리 경로는 이 메서드 대신 registry.get()으로 적재된 모델만 사용합니다.
+        """
+        if version is None:
+            if not self.model_loaded:
+                self.registry.preload()
+            return self.model_loaded
+        
         try:
-            if self.model_loaded:
-                return True
-                
-            # 모델 파일 찾기
-            model_file, scaler_file = self.find_latest_model_files()
-            
-            if not model_file or not scaler_file:
-                print("LSTM 모델 파일을 찾을 수 없습니다.")
-                return False
-            
-            print(f"모델 로딩 중: {model_file}")
-            print(f"스케일러 로딩 중: {scaler_file}")
-            
-            # 모델 로드
-            self.model = load_model(model_file)
-            
-            # 스케일러 로드
-            with open(scaler_file, 'rb') as f:
-                self.scaler = pickle.load(f)
-            
-            self.model_path = model_file
-            self.scaler_path = scaler_file
-            self.model_loaded = True
-            
-            print("LSTM 모델 로딩 완료!")
+            self.registry.load(version)
             return True
-            
         except Exception as e:
             print(f"모델 로딩 중 오류: {e}")
-            self.model_loaded = False
             return False
     
     def load_recent_draws(self, sequence_length: int = 10) -> Optional[np.ndarray]:
-        """최근 회차 데이터를 로드합니다."""
+        """최근 회차 데이터를 로드합니다. (공유 회차 저장소의 뷰 사용)"""
         try:
-            db = SessionLocal()
-            try:
-                # 최근 sequence_length개 회차 데이터 가져오기
-                recent_draws = db.query(LottoDraw).order_by(
-                    LottoDraw.draw_no.desc()
-                ).limit(sequence_length).all()
-                
-                if len(recent_draws) < sequence_length:
-                    print(f"충분한 데이터가 없습니다. 필요: {sequence_length}, 현재: {len(recent_draws)}")
-                    return None
-                
-                # 회차 순서대로 정렬 (오래된 것부터)
-                recent_draws.reverse()
-                
-                # 숫자 배열로 변환
-                data = []
-                for draw in recent_draws:
-                    data.append([draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6])
-                
-                return np.array(data, dtype=np.float32)
-                
-            finally:
-                db.close()
+            # 회차 순서대로 정렬된 (N, 7) uint8 배열에서 최근 sequence_length개 회차
+            recent_draws = draw_store.get().recent(sequence_length)
+            
+            if len(recent_draws) < sequence_length:
+                print(f"충분한 데이터가 없습니다. 필요: {sequence_length}, 현재: {len(recent_draws)}")
+                return None
+            
+            # 스케일러 입력용 float32 변환
+            return recent_draws.astype(np.float32)
                 
         except Exception as e:
             print(f"최근 회차 데이터 로드 중 오류: {e}")
             return None
     
-    def predict_next_numbers(self, saju_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    def predict_base_numbers(self, recent_data: np.ndarray, version: Optional[str] = None) -> np.ndarray:
+        """
+        최근 10개 회차로 사주 가중치 적용 전 기본 번호 6개를 예측합니다.
+        recent_data가 (10, 6)이면 (6,), 여러 구간을 쌓은 (B, 10, 6)이면 한 번에 예측하여 (B, 6)을 반환합니다.
+        모델이 아직 적재되지 않았으면 ModelNotReadyError를 발생시킵니다.
+        """
+        entry = self.registry.get(version)
+        windows = np.asarray(recent_data, dtype=np.float32)
+        single = windows.ndim == 2
+        windows = windows.reshape(-1, 10, 6)
+        
+        # 데이터 정규화
+        scaled_data = entry.scaler.transform(windows.reshape(-1, 6))
+        
+        # 예측 수행
+        input_sequence = scaled_data.reshape(-1, 10, 6)
+        prediction_scaled = entry.model.predict(input_sequence, verbose=0)
+        
+        # 역정규화
+        prediction = entry.scaler.inverse_transform(prediction_scaled)
+        
+        # 1-45 범위로 클리핑하고 정수 변환
+        base_numbers = np.clip(np.round(prediction), 1, 45).astype(int)
+        return base_numbers[0] if single else base_numbers
+    
+    def predict_snapshot_numbers(self, version: Optional[str] = None) -> np.ndarray:
+        """
+        최신 10개 회차 입력의 기본 예측 (읽기 전용 (6,) 배열)
+        입력은 다음 회차가 들어올 때까지 모든 사용자에게 같으므로 (모델 버전, 최신 회차 번호)당 한 번만 예측합니다.
+        """
+        entry = self.registry.get(version)
+        snapshot = draw_store.get()
+        key = (entry.name, snapshot.last_draw_no)
+        
+        base_numbers = self._snapshot_predictions.get(key)
+        if base_numbers is not None:
+            return base_numbers
+        
+        with self._snapshot_lock:
+            base_numbers = self._snapshot_predictions.get(key)
+            if base_numbers is None:
+                recent_data = self.load_recent_draws(sequence_length=10)
+                if recent_data is None:
+                    raise Exception("최근 회차 데이터를 로드할 수 없습니다.")
+                base_numbers = self.predict_base_numbers(recent_data, entry.name)
+                base_numbers.flags.writeable = False
+                # 이전 회차 캐시는 버림
+                self._snapshot_predictions = {
+                    cached_key: value for cached_key, value in self._snapshot_predictions.items()
+                    if cached_key[1] == snapshot.last_draw_no
+                }
+                self._snapshot_predictions[key] = base_numbers
+            return base_numbers
+    
+    def predict_window(self, recent_data: np.ndarray, version: Optional[str] = None) -> np.ndarray:
+        """임의의 (10, 6) 입력 구간 기본 예측 (동시 요청은 짧은 시간 창 안에서 한 번의 배치 호출로 병합)"""
+        self.registry.get(version)
+        return self.batcher.predict(recent_data, version)
+    
+    def predict_windows(self, windows: np.ndarray, version: Optional[str] = None) -> np.ndarray:
+        """
+        (B, 10, 6) 입력 구간들의 기본 예측 (B, 6)
+        모든 구간을 배치 큐에 한꺼번에 넣으므로 동시에 들어온 다른 호출의 구간과 함께 묶여 예측됩니다.
+        """
+        self.registry.get(version)
+        futures = [self.batcher.submit(window, version) for window in np.asarray(windows, dtype=np.float32)]
+        if not futures:
+            return np.zeros((0, 6), dtype=int)
+        return np.stack([future.result() for future in futures])
+    
+    def predict_for_draw(self, draw_no: int, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        회차 draw_no 직전 10회차를 입력으로 한 기본 예측과 실제 당첨 번호 (과거 회차 검토용)
+        회차가 모델 학습 범위 안이면 학습에 쓰인 회차이므로 lookahead_bias를 True로 표시합니다.
+        """
+        entry = self.registry.get(version)
+        snapshot = draw_store.get()
+        index = snapshot.index_of(draw_no)
+        if index < 10:
+            raise ValueError(f"회차 {draw_no}의 직전 10회차 데이터가 없습니다.")
+        
+        base_numbers = self.predict_window(snapshot.main_numbers[index - 10:index], entry.name)
+        train_draw_range = entry.manifest.get('train_draw_range')
+        return {
+            'draw_no': draw_no,
+            'base_prediction': base_numbers.tolist(),
+            'actual_numbers': snapshot.main_numbers[index].tolist(),
+            'bonus_number': int(snapshot.bonus_numbers[index]),
+            'model_version': entry.name,
+            'train_draw_range': train_draw_range,
+            'lookahead_bias': train_draw_range is None or draw_no <= train_draw_range[1]
+        }
+    
+    def predict_next_numbers(self, saju_weights: Optional[Dict[str, float]] = None,
+                             version: Optional[str] = None) -> Dict[str, Any]:
         """LSTM 모델을 사용하여 다음 회차 번호를 예측합니다."""
         try:
-            # 모델 로드
-            if not self.load_model_files():
-                raise Exception("LSTM 모델을 로드할 수 없습니다.")
-            
-            # 최근 데이터 로드
-            recent_data = self.load_recent_draws(sequence_length=10)
-            if recent_data is None:
-                raise Exception("최근 회차 데이터를 로드할 수 없습니다.")
+            # 미리 적재된 모델 (적재 전이면 ModelNotReadyError)
+            entry = self.registry.get(version)
             
-            # 데이터 정규화
-            scaled_data = self.scaler.transform(recent_data)
-            
-            # 예측 수행
-            input_sequence = scaled_data.reshape(1, 10, 6)
-            prediction_scaled = self.model.predict(input_sequence, verbose=0)
-            
-            # 역정규화
-            prediction = self.scaler.inverse_transform(prediction_scaled)[0]
-            
-            # 1-45 범위로 클리핑하고 정수 변환
-            base_numbers = np.clip(np.round(prediction), 1, 45).astype(int)
+            # 최신 회차 기준 기본 예측 (회차당 한 번 계산된 결과 재사용)
+            base_numbers = self.predict_snapshot_numbers(entry.name)
             
             # 사주 가중치 적용 (제공된 경우)
             if saju_weights:
-                weighted_numbers = self._apply_saju_weights(base_numbers, saju_weights)
+                weighted_numbers = self.apply_saju_weights(base_numbers, saju_weights)
             else:
                 weighted_numbers = base_numbers
             
             # 중복 제거 및 6개 번호 보장
-            final_numbers = self._ensure_unique_numbers(weighted_numbers)
+            final_numbers = self.ensure_unique_numbers(weighted_numbers)
             
             # 신뢰도 계산 (기본적으로 LSTM 기반이므로 높은 신뢰도)
             confidence = 0.75
@@ -152,7 +213,8 @@ class LSTMPredictionService:
                 'method': 'LSTM + 사주 가중치',
                 'confidence': confidence,
                 'base_prediction': base_numbers.tolist(),
-                'model_file': self.model_path,
+                'model_file': entry.model_path,
+                'model_version': entry.name,
                 'generated_at': datetime.now()
             }
             
@@ -160,44 +222,36 @@ class LSTMPredictionService:
             print(f"LSTM 예측 중 오류: {e}")
             raise e
     
-    def _apply_saju_weights(self, base_numbers: np.ndarray, saju_weights: Dict[str, float]) -> np.ndarray:
-        """사주 오행 가중치를 기본 예측에 적용합니다."""
+    def apply_saju_weights(self, base_numbers: np.ndarray, saju_weights: Dict[str, float],
+                           rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        사주 오행 가중치를 기본 예측에 적용합니다.
+        대체 번호는 rng로 뽑습니다. (기본: 호출마다 새 Generator, 전역 난수 상태는 건드리지 않음)
+        """
+        rng = rng if rng is not None else np.random.default_rng()
         try:
-            # 오행별 번호 범위
-            element_ranges = {
-                '목': (1, 9),
-                '화': (10, 19), 
-                '토': (20, 29),
-                '금': (30, 39),
-                '수': (40, 45)
-            }
+            # 번호별 오행 가중치 (NUMBER_OHEANG_INDEX로 한 번에 조회)
+            weight_vector = np.array([saju_weights.get(element, 1.0) for element in saju.OHEANG])
+            base_numbers = np.asarray(base_numbers)
+            weights = weight_vector[saju.NUMBER_OHEANG_INDEX[base_numbers - 1]]
             
+            # 가중치가 낮은 오행(0.5 미만)의 번호는 가중치가 가장 높은 오행의 범위에서 새 번호로 대체
             weighted_numbers = base_numbers.copy()
+            low = weights < 0.5
+            if low.any():
+                best_element = max(saju_weights.items(), key=lambda x: x[1])[0]
+                start, end = saju.NUMBER_OHEANG_RANGES[best_element]
+                weighted_numbers[low] = rng.integers(start, end + 1, size=int(low.sum()))
             
-            # 각 번호에 대해 해당 오행의 가중치 적용
-            for i, number in enumerate(base_numbers):
-                for element, (start, end) in element_ranges.items():
-                    if start <= number <= end:
-                        # 가중치가 높은 오행에 해당하는 번호는 유지하고
-                        # 가중치가 낮은 경우 조정
-                        weight = saju_weights.get(element, 1.0)
-                        if weight < 0.5:  # 가중치가 낮으면 다른 번호로 대체 시도
-                            # 가중치가 높은 오행의 범위에서 번호 선택
-                            best_element = max(saju_weights.items(), key=lambda x: x[1])
-                            best_range = element_ranges[best_element[0]]
-                            # 기존 번호와 유사한 위치의 새 번호 생성
-                            new_number = np.random.randint(best_range[0], best_range[1] + 1)
-                            weighted_numbers[i] = new_number
-                        break
-                        
             return weighted_numbers
             
         except Exception as e:
             print(f"사주 가중치 적용 중 오류: {e}")
             return base_numbers
     
-    def _ensure_unique_numbers(self, numbers: np.ndarray) -> List[int]:
-        """중복 제거 및 6개 번호 보장"""
+    def ensure_unique_numbers(self, numbers: np.ndarray, rng: Optional[np.random.Generator] = None) -> List[int]:
+        """중복 제거 및 6개 번호 보장 (부족한 번호는 rng로 채움)"""
+        rng = rng if rng is not None else np.random.default_rng()
         unique_nums = []
         used_nums = set()
         
@@ -209,7 +263,7 @@ class LSTMPredictionService:
         
         # 6개가 안되면 랜덤으로 채우기
         while len(unique_nums) < 6:
-            random_num = np.random.randint(1, 46)
+            random_num = int(rng.integers(1, 46))
             if random_num not in used_nums:
                 unique_nums.append(random_num)
                 used_nums.add(random_num)
@@ -217,31 +271,24 @@ class LSTMPredictionService:
         return sorted(unique_nums[:6])
     
     def get_model_info(self) -> Dict[str, Any]:
-        """모델 정보를 반환합니다."""
-        try:
-            if not self.model_loaded:
-                self.load_model_files()
-            
-            info = {
-                'model_loaded': self.model_loaded,
-                'model_file': self.model_path,
-                'scaler_file': self.scaler_path
-            }
-            
-            if self.model:
-                info.update({
-                    'model_summary': str(self.model.summary()),
-                    'input_shape': self.model.input_shape,
-                    'output_shape': self.model.output_shape
-                })
-            
-            return info
-            
-        except Exception as e:
-            return {
-                'error': str(e),
-                'model_loaded': False
-            }
+        """모델 정보를 반환합니다. (적재를 유발하지 않음)"""
+        info = {
+            'model_loaded': self.model_loaded,
+            'model_file': self.model_path,
+            'scaler_file': self.scaler_path,
+            'registry': self.registry.status()
+        }
+        
+        if self.model_loaded:
+            entry = self.registry.get()
+            info.update({
+                'model_version': entry.name,
+                'input_shape': entry.model.input_shape,
+                'output_shape': entry.model.output_shape,
+                'train_draw_range': entry.manifest.get('train_draw_range')
+            })
+        
+        return info
 
 # 전역 서비스 인스턴스
 lstm_service = LSTMPredictionService()
@@ -250,16 +297,14 @@ def get_lstm_prediction(birth_year: int, birth_month: int, birth_day: int, birth
     """사주 분석과 LSTM을 결합한 예측을 생성합니다."""
     try:
         # 사주 분석 수행
-        saju_result = saju.analyze_saju(birth_year, birth_month, birth_day, birth_hour)
+        saju_result = saju.analyze_saju_result(birth_year, birth_month, birth_day, birth_hour)
         
-        # 사주 오행 가중치 계산
-        oheang = saju_result['oheang']
-        total_strength = sum(oheang.values())
+        # 사주 오행 가중치 계산 (int8 오행 배열에서 직접 계산)
+        oheang = saju_result.oheang
+        total_strength = int(oheang.sum())
         
-        saju_weights = {}
         if total_strength > 0:
-            for element, strength in oheang.items():
-                saju_weights[element] = strength / total_strength
+            saju_weights = dict(zip(saju.OHEANG, (oheang / total_strength).tolist()))
         else:
             # 기본 가중치
             saju_weights = {'목': 0.2, '화': 0.2, '토': 0.2, '금': 0.2, '수': 0.2}
@@ -284,8 +329,9 @@ if __name__ == "__main__":
         print("LSTM 예측 서비스 테스트")
         print("=" * 50)
         
-        # 서비스 초기화
+        # 서비스 초기화 (모델 적재)
         service = LSTMPredictionService()
+        service.load_model_files()
         
         # 모델 정보 출력
         info = service.get_model_info()
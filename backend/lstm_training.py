@@ -0,0 +1,200 @@
+"""
+LSTM 재학습 파이프라인
+DB 회차(draw_store)로 tf.data 배치 파이프라인을 만들어 LSTM 모델을 학습하고,
+새 회차가 들어오면 직전 체크포인트에서 최근 회차 구간만 짧게 미세 조정합니다.
+
+    - 학습 결과는 model_artifacts 번들로 게시합니다.
+      (weights.npz: API 워커가 TensorFlow 없이 적재하는 추론용 파일, checkpoint.keras: 다음 미세 조정의 시작점)
+    - 번들 디렉터리가 완성된 뒤 포인터 파일이 교체되므로 레지스트리는 완성된 버전만 봅니다.
+    - API 프로세스에서는 별도 프로세스(spawn)로 학습을 실행하여 TensorFlow를 import하지 않습니다.
+"""
+
+import json
+import multiprocessing
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from draw_store import draw_store
+from model_artifacts import ARTIFACT_DIR, artifact_path, publish_bundle, read_current_version, read_manifest
+from model_registry import model_registry
+from numpy_lstm import NumpyMinMaxScaler, export_npz, load_npz
+
+# 모델 입력 길이 (최근 회차 수, LSTMPredictionService와 동일)
+SEQUENCE_LENGTH = 10
+
+# 처음부터 학습할 때의 에폭/배치 크기
+TRAIN_EPOCHS = 50
+TRAIN_BATCH_SIZE = 64
+
+# 미세 조정: 최근 회차 구간만 낮은 학습률로 짧게 학습
+FINE_TUNE_EPOCHS = 5
+FINE_TUNE_RECENT_DRAWS = 260
+FINE_TUNE_LEARNING_RATE = 1e-4
+
+
+def _fit_scaler(numbers: np.ndarray) -> NumpyMinMaxScaler:
+    """열별 (0, 1) MinMaxScaler 값 계산 (sklearn MinMaxScaler와 같은 min_/scale_)"""
+    data_min = numbers.min(axis=0).astype(np.float64)
+    data_range = numbers.max(axis=0) - data_min
+    scale = 1.0 / np.where(data_range == 0, 1.0, data_range)
+    return NumpyMinMaxScaler(-data_min * scale, scale)
+
+
+def make_dataset(scaled: np.ndarray, batch_size: int = TRAIN_BATCH_SIZE, shuffle: bool = True, seed: int = None):
+    """
+    정규화된 (N, 6) 회차 배열의 tf.data 학습 파이프라인
+    입력 구간 i~i+9 → 정답 회차 i+10, 구간은 복사 없이 sliding_window_view로 만듭니다.
+    """
+    import tensorflow as tf
+
+    windows = np.lib.stride_tricks.sliding_window_view(
+        scaled[:-1], SEQUENCE_LENGTH, axis=0
+    ).transpose(0, 2, 1)
+    targets = scaled[SEQUENCE_LENGTH:]
+
+    dataset = tf.data.Dataset.from_tensor_slices((windows.astype(np.float32), targets.astype(np.float32))).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(targets), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def _build_model():
+    """서비스 구조의 새 모델 (LSTM(50, relu) + Dense(6))"""
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
+
+    model = Sequential([Input((SEQUENCE_LENGTH, 6)), LSTM(50, activation='relu'), Dense(6)])
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+
+class LSTMTrainer:
+    """아티팩트 디렉터리의 현재 번들에서 이어 학습하고 새 번들을 게시하는 학습기"""
+
+    def __init__(self, artifact_dir: str = ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+
+    def current_manifest(self) -> Optional[Dict]:
+        """현재 버전 번들의 매니페스트 (게시된 번들이 없으면 None)"""
+        version = read_current_version(self.artifact_dir)
+        return read_manifest(version, self.artifact_dir) if version else None
+
+    def latest_checkpoint(self) -> Optional[tuple]:
+        """미세 조정을 시작할 (매니페스트, .keras 경로, 가중치 .npz 경로) - 현재 번들에 체크포인트가 없으면 None"""
+        manifest = self.current_manifest()
+        if manifest is None or 'checkpoint' not in manifest['files']:
+            return None
+        return (manifest, artifact_path(manifest, 'checkpoint', self.artifact_dir),
+                artifact_path(manifest, 'weights', self.artifact_dir))
+
+    def train(self, full: bool = False, numbers: Optional[np.ndarray] = None, seed: Optional[int] = None) -> Optional[Dict]:
+        """
+        학습 실행 (TensorFlow 필요)
+
+        Args:
+            full: True면 체크포인트를 무시하고 전체 회차로 처음부터 학습
+            numbers: (N, 7) 또는 (N, 6) 회차 배열 (기본: draw_store 전체 회차)
+        Returns:
+            학습 결과 요약, 마지막 학습 이후 새 회차가 없으면 None
+        """
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+
+        if numbers is None:
+            snapshot = draw_store.get()
+            numbers, draw_nos = snapshot.main_numbers, snapshot.draw_nos
+        else:
+            numbers = np.asarray(numbers)[:, :6]
+            draw_nos = np.arange(1, len(numbers) + 1)
+        if len(numbers) <= SEQUENCE_LENGTH:
+            raise ValueError(f"학습에는 {SEQUENCE_LENGTH + 1}개 이상의 회차가 필요합니다. (현재 {len(numbers)}개)")
+
+        last_draw_no = int(draw_nos[-1])
+        checkpoint = None if full else self.latest_checkpoint()
+        if checkpoint and (checkpoint[0]['train_draw_range'] or [None, None])[1] == last_draw_no:
+            print(f"[LSTM_TRAINING] 회차 {last_draw_no}까지 이미 학습됨")
+            return None
+
+        if seed is not None:
+            tf.keras.utils.set_random_seed(seed)
+
+        started = time.perf_counter()
+        if checkpoint:
+            # 직전 모델에서 이어서 학습 (정규화 기준도 직전 모델 것을 유지)
+            manifest, keras_path, npz_path = checkpoint
+            parent = manifest['version']
+            model = load_model(keras_path)
+            _, scaler = load_npz(npz_path)
+            model.compile(optimizer=tf.keras.optimizers.Adam(FINE_TUNE_LEARNING_RATE), loss='mse')
+            train_numbers = numbers[-(FINE_TUNE_RECENT_DRAWS + SEQUENCE_LENGTH):]
+            epochs, mode = FINE_TUNE_EPOCHS, 'fine_tune'
+        else:
+            parent = None
+            model = _build_model()
+            scaler = _fit_scaler(numbers)
+            train_numbers = numbers
+            epochs, mode = TRAIN_EPOCHS, 'full'
+
+        dataset = make_dataset(scaler.transform(train_numbers), seed=seed)
+        history = model.fit(dataset, epochs=epochs, verbose=0)
+
+        train_draw_range = (int(draw_nos[-len(train_numbers)]), last_draw_no)
+        summary = {
+            'mode': mode,
+            'parent_version': parent,
+            'train_draws': len(train_numbers),
+            'epochs': epochs,
+            'batch_size': TRAIN_BATCH_SIZE,
+            'final_loss': float(history.history['loss'][-1]),
+            'train_seconds': round(time.perf_counter() - started, 1)
+        }
+        manifest = publish_bundle(
+            lambda path: export_npz(model, scaler, path), train_draw_range, summary,
+            write_checkpoint=model.save, artifact_dir=self.artifact_dir
+        )
+        summary.update(version=manifest['version'], train_draw_range=list(train_draw_range))
+        print(f"[LSTM_TRAINING] {mode} 학습 완료 → 버전 {summary['version']} "
+              f"(회차 {last_draw_no}, loss {summary['final_loss']:.5f}, {summary['train_seconds']}초)")
+        return summary
+
+
+def _train_process(artifact_dir: str, full: bool):
+    """학습 프로세스 진입점 (spawn으로 실행되어 부모 프로세스에 TensorFlow가 적재되지 않음)"""
+    LSTMTrainer(artifact_dir).train(full=full)
+
+
+_retrain_lock = threading.Lock()
+
+
+def retrain_and_reload(full: bool = False) -> bool:
+    """
+    별도 프로세스에서 학습한 뒤 현재 프로세스의 레지스트리를 새 버전으로 교체
+    이미 학습 중이면 바로 False를 반환합니다. (새 회차 저장 후 백그라운드 작업으로 호출)
+    """
+    if not _retrain_lock.acquire(blocking=False):
+        print("[LSTM_TRAINING] 이미 학습 중입니다.")
+        return False
+    try:
+        process = multiprocessing.get_context('spawn').Process(
+            target=_train_process, args=(model_registry.artifact_dir, full), name='lstm-training'
+        )
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print(f"[LSTM_TRAINING] 학습 프로세스 실패 (exit code {process.exitcode})")
+            return False
+        model_registry.refresh()
+        return True
+    finally:
+        _retrain_lock.release()
+
+
+if __name__ == "__main__":
+    # 사용법: python lstm_training.py [--full]
+    import sys
+
+    result = LSTMTrainer(model_registry.artifact_dir).train(full='--full' in sys.argv)
+    print(json.dumps(result, ensure_ascii=False, indent=2) if result else "새 회차가 없어 학습을 건너뜁니다.")
@@ -0,0 +1,151 @@
+"""
+음력 → 양력 변환 모듈
+만세력 테이블(manseryeok.py)에서 음력 날짜(윤달 포함) → 양력 일자 색인을 한 번만 만들어
+요청마다 KoreanLunarCalendar를 생성하지 않고 O(1)로 변환합니다.
+대량 가입/이관용 배치 변환(np.searchsorted)도 제공합니다.
+"""
+
+import datetime
+import threading
+
+import numpy as np
+
+import manseryeok
+
+
+def _lunar_key(year, month, day, is_leap):
+    """
+    음력 날짜 정렬 키 (년 * 10000 + (월 * 2 + 윤달) * 100 + 일)
+    윤달은 같은 달 평달 바로 뒤에 오므로 키 순서가 양력 일자 순서와 일치합니다.
+    스칼라와 NumPy 배열 모두 지원합니다.
+    """
+    return year * 10000 + (month * 2 + is_leap) * 100 + day
+
+
+class LunarConverter:
+    """만세력 테이블 기반 음력 → 양력 변환기"""
+
+    def __init__(self):
+        self._index = None  # 음력 키 -> 테이블 인덱스 (스칼라 조회용)
+        self._keys = None   # 테이블 순서의 음력 키 배열 (배치 조회용, 정렬됨)
+        self._start_ordinal = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """만세력 테이블에서 음력 색인 생성 (최초 호출 시 한 번)"""
+        with self._lock:
+            if self._index is not None:
+                return
+
+            table = manseryeok.get_table()
+            records = table.records
+            keys = _lunar_key(
+                records['lunar_year'].astype(np.int64),
+                records['lunar_month'].astype(np.int64),
+                records['lunar_day'].astype(np.int64),
+                records['is_leap_month'].astype(np.int64)
+            )
+
+            self._keys = keys
+            self._start_ordinal = table.start_ordinal
+            self._index = {key: index for index, key in enumerate(keys.tolist())}
+
+    def to_solar(self, year: int, month: int, day: int, is_leap: bool = False) -> datetime.date:
+        """
+        음력 날짜를 양력 날짜로 변환
+        존재하지 않는 음력 날짜(윤달이 없는 달의 윤달, 29일까지인 달의 30일 등)나
+        테이블 범위 밖의 날짜는 ValueError를 발생시킵니다.
+        """
+        # 월/일/윤달 범위를 벗어난 입력은 다른 날짜의 키와 겹칠 수 있으므로 먼저 확인 (배치와 동일)
+        if not (1 <= month <= 12 and 1 <= day <= 30) or is_leap not in (0, 1):
+            raise ValueError(f"음력 날짜 범위가 올바르지 않습니다: {year}년 {month}월 {day}일 (윤달: {is_leap})")
+
+        if self._index is None:
+            self._load()
+
+        index = self._index.get(_lunar_key(year, month, day, int(is_leap)))
+        if index is None:
+            leap_text = '윤' if is_leap else ''
+            raise ValueError(f"변환할 수 없는 음력 날짜입니다: {year}년 {leap_text}{month}월 {day}일")
+        return datetime.date.fromordinal(self._start_ordinal + index)
+
+    def to_solar_batch(self, years, months, days, is_leap=None) -> dict:
+        """
+        음력 날짜 배열의 배치 변환 (대량 가입/이관용)
+
+        Returns:
+            year, month, day: 양력 년/월/일 배열 (변환 실패 행은 0)
+            valid: 변환 성공 여부 배열
+        """
+        if self._index is None:
+            self._load()
+
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        leaps = np.zeros_like(years) if is_leap is None else np.asarray(is_leap).astype(np.int64)
+
+        keys = _lunar_key(years, months, days, leaps)
+        index = np.searchsorted(self._keys, keys)
+        index = np.minimum(index, len(self._keys) - 1)
+
+        # 월/일 범위를 벗어난 입력은 다른 날짜의 키와 겹칠 수 있으므로 함께 확인
+        valid = (self._keys[index] == keys) & (months >= 1) & (months <= 12) & (days >= 1) & (days <= 30)
+        valid &= (leaps == 0) | (leaps == 1)
+
+        start = np.datetime64(manseryeok.START_DATE.isoformat(), 'D')
+        dates = start + index.astype('timedelta64[D]')
+        solar_years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        solar_months = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        solar_days = (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1
+
+        return {
+            'year': np.where(valid, solar_years, 0),
+            'month': np.where(valid, solar_months, 0),
+            'day': np.where(valid, solar_days, 0),
+            'valid': valid
+        }
+
+
+# 전역 변환기 인스턴스
+lunar_converter = LunarConverter()
+
+
+def lunar_to_solar(year: int, month: int, day: int, is_leap: bool = False) -> datetime.date:
+    """음력 날짜를 양력 날짜로 변환"""
+    return lunar_converter.to_solar(year, month, day, is_leap)
+
+
+def lunar_to_solar_batch(years, months, days, is_leap=None) -> dict:
+    """음력 날짜 배열을 양력 날짜 배열로 변환"""
+    return lunar_converter.to_solar_batch(years, months, days, is_leap)
+
+
+if __name__ == "__main__":
+    # korean-lunar-calendar 결과와 비교 검증
+    import random
+    from korean_lunar_calendar import KoreanLunarCalendar
+
+    calendar = KoreanLunarCalendar()
+    rng = random.Random(0)
+    mismatches = 0
+    samples = 2000
+
+    lunar_dates = []
+    for _ in range(samples):
+        ordinal = rng.randint(manseryeok.START_DATE.toordinal() + 60, manseryeok.END_DATE.toordinal() - 60)
+        solar = datetime.date.fromordinal(ordinal)
+        calendar.setSolarDate(solar.year, solar.month, solar.day)
+        lunar = (calendar.lunarYear, calendar.lunarMonth, calendar.lunarDay, bool(calendar.isIntercalation))
+        lunar_dates.append(lunar)
+        if lunar_to_solar(*lunar) != solar:
+            mismatches += 1
+
+    print(f"스칼라 변환 검증: {samples}건 중 불일치 {mismatches}건")
+
+    columns = list(zip(*lunar_dates))
+    batch = lunar_to_solar_batch(*columns)
+    scalar = [lunar_to_solar(*lunar) for lunar in lunar_dates]
+    batch_dates = [datetime.date(int(y), int(m), int(d))
+                   for y, m, d in zip(batch['year'], batch['month'], batch['day'])]
+    print(f"배치 변환 검증: {'일치' if batch_dates == scalar and batch['valid'].all() else '불일치'}")
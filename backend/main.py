@@ -1,14 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
 from urllib.parse import unquote
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List
+from datetime import datetime, date
+from typing import List, Optional
 
 import crud, models, schemas, crawler
 from database import SessionLocal, engine
 from prediction_service import prediction_service
 from lstm_prediction_service import get_lstm_prediction, lstm_service
+from model_registry import model_registry, ModelNotReadyError
+from lstm_training import retrain_and_reload
+from saju import saju_cache, analyze_saju_result, get_daewoon
+from fortune_service import fortune_service
+import compatibility
+from compatibility import compatibility_index
+from ticket_simulator import evaluate_strategies
+from backtest import run_backtest
 from youtube_crawler import YouTubeSajuCrawler
 import youtube_crud
 # from youtube_content_analyzer import YouTubeContentAnalyzer  # Whisper import issue
@@ -16,6 +24,10 @@ from simple_youtube_learner import SimpleYouTubeLearner
 
 models.Base.metadata.create_all(bind=engine)
 
+# 전략 시뮬레이션 요청당 최대 티켓 수
+MAX_SIMULATION_TICKETS = 10000000
+MAX_BACKTEST_PROFILES = 1000
+
 app = FastAPI(
     title="SajuLotto API", 
     description="Korean fortune-telling based lottery prediction API",
@@ -31,6 +43,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def preload_prediction_models():
+    """서버 시작 시 LSTM 모델을 백그라운드 스레드에서 미리 적재 (첫 요청이 적재 시간을 기다리지 않도록)"""
+    model_registry.preload_async()
+
 @app.get("/")
 def read_root():
     return {"message": "SajuLotto API is running!", "status": "success", "version": "1.0.0"}
@@ -59,6 +76,25 @@ def crawl_lotto_task(start_draw: int, end_draw: int):
         print(f"Crawling finished. Saved {count} new draws from {start_draw} to {end_draw}.")
     finally:
         db.close()
+    
+    # 새 회차가 저장되었으면 히스토리컬 스냅샷을 백그라운드에서 다시 계산하고,
+    # 직전 모델에서 미세 조정 후 새 버전으로 교체
+    if count:
+        prediction_service.refresh_historical_snapshot_async()
+        retrain_and_reload()
+
+def recompute_saju_profiles_task():
+    """
+    Background task for recomputing every SajuProfile.oheng_json in batches.
+    """
+    db = SessionLocal()
+    try:
+        print("Starting saju profile recomputation...")
+        count = crud.recompute_saju_profiles(db)
+        compatibility_index.invalidate()
+        print(f"Saju profile recomputation finished. Updated {count} profiles.")
+    finally:
+        db.close()
 
 # ============================================================================
 # User Management API Endpoints  
@@ -113,7 +149,50 @@ def create_saju_profile_for_user(
     db_user = crud.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return crud.create_saju_profile(db=db, user_id=user_id, saju_profile=saju_profile)
+    db_saju_profile = crud.create_saju_profile(db=db, user_id=user_id, saju_profile=saju_profile)
+    compatibility_index.add_profile(db_saju_profile)
+    return db_saju_profile
+
+@app.get("/users/{user_id}/compatibility")
+def get_user_compatibility(user_id: int, limit: int = 10, db: Session = Depends(get_db)):
+    """
+    궁합 상위 사용자 조회
+    전체 사주 프로필과의 오행 균형 및 천간/지지 조화 점수를 한 번에 계산합니다.
+    """
+    try:
+        matches = compatibility.get_top_matches(db, user_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return {
+        "user_id": user_id,
+        "matches": matches,
+        "total_profiles": len(compatibility_index.profile_ids)
+    }
+
+@app.get("/users/{user_id}/daewoon")
+def get_user_daewoon(user_id: int, periods: int = 8, db: Session = Depends(get_db)):
+    """
+    대운 흐름 조회
+    사주 프로필의 생년월일시와 성별로 순행/역행을 결정하고 앞에서부터 periods개 기간만 계산합니다.
+    """
+    db_saju_profile = db.query(models.SajuProfile).filter(models.SajuProfile.user_id == user_id).first()
+    if db_saju_profile is None:
+        raise HTTPException(status_code=404, detail="사주 프로필을 찾을 수 없습니다")
+    
+    birth = crud.parse_birth_ymdh(db_saju_profile.birth_ymdh)
+    if birth is None:
+        raise HTTPException(status_code=400, detail="생년월일시 형식이 올바르지 않습니다")
+    
+    try:
+        timeline = get_daewoon(*birth, db_saju_profile.gender)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "user_id": user_id,
+        "daewoon": timeline.to_dict(periods)
+    }
 
 @app.post("/admin/crawl_lotto_draws/")
 def admin_crawl_lotto_draws(
@@ -127,6 +206,14 @@ def admin_crawl_lotto_draws(
     background_tasks.add_task(crawl_lotto_task, start_draw, end_draw)
     return {"message": f"Crawling for draws {start_draw} to {end_draw} has been initiated in the background."}
 
+@app.post("/admin/recompute_saju_profiles/")
+def admin_recompute_saju_profiles(background_tasks: BackgroundTasks):
+    """
+    Triggers a background task to recompute oheang distributions for all saju profiles.
+    """
+    background_tasks.add_task(recompute_saju_profiles_task)
+    return {"message": "Saju profile recomputation has been initiated in the background."}
+
 # ============================================================================
 # Prediction API Endpoints
 # ============================================================================
@@ -146,13 +233,14 @@ def predict_lotto_numbers(request: schemas.PredictionRequest):
             birth_month=request.birth_month,
             birth_day=request.birth_day,
             birth_hour=request.birth_hour,
-            name=decoded_name
+            name=decoded_name,
+            frequency_mode=request.frequency_mode
         )
         
         # 직접 dict 형태로 응답 반환 (스키마 검증 우회)
         return {
             'predicted_numbers': result['predicted_numbers'],
-            'saju_analysis': result['saju_analysis'], 
+            'saju_analysis': result['saju_analysis'].to_analysis_dict(), 
             'number_scores': result['number_scores'][:10],  # 상위 10개만
             'method': result['method'],
             'confidence': result['confidence'],
@@ -169,30 +257,49 @@ def get_historical_analysis():
     수집된 과거 로또 데이터의 패턴과 통계를 분석합니다.
     """
     try:
-        lotto_draws, stats = prediction_service.load_historical_data()
-        pattern_analysis = prediction_service.analyze_number_patterns(lotto_draws)
-        
-        # 최근 5회차 데이터 변환
-        last_5_draws = []
-        for draw in stats['latest_draws']:
-            last_5_draws.append({
-                'draw_no': draw.draw_no,
-                'numbers': [draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6],
-                'bonus': draw.bonus,
-                'draw_date': draw.draw_date.isoformat() if draw.draw_date else None
-            })
-        
-        return schemas.HistoricalAnalysisResponse(
-            total_draws=stats['total_draws'],
-            draw_range=stats['draw_range'],
-            top_numbers=pattern_analysis['top_numbers'],
-            element_distribution=pattern_analysis['element_distribution'],
-            last_5_draws=last_5_draws
-        )
+        # 최신 회차 기준으로 미리 직렬화된 응답 (Pydantic 검증 생략)
+        snapshot = prediction_service.get_historical_snapshot()
+        return Response(content=snapshot.json_bytes(), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"히스토리컬 분석 중 오류 발생: {str(e)}")
 
+@app.post("/admin/number-statistics/decay")
+def update_decay_half_life(half_life: int, db: Session = Depends(get_db)):
+    """
+    관리자용: 감쇠 출현 점수 반감기(회차 수) 변경
+    전체 회차로 감쇠 점수를 다시 계산하며, 이후 새 회차는 번호 45개만 갱신합니다.
+    """
+    try:
+        statistics = crud.set_decay_half_life(db, half_life)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # 회차 번호가 같아도 내용이 바뀌므로 이전 스냅샷을 버리고 다시 계산
+    prediction_service.invalidate_historical_snapshot()
+    prediction_service.refresh_historical_snapshot_async()
+    
+    return {
+        "decay_half_life": statistics.decay_half_life,
+        "total_draws": statistics.total_draws,
+        "message": "감쇠 점수가 재계산되었습니다"
+    }
+
+@app.post("/admin/number-statistics/rebuild")
+def admin_rebuild_number_statistics(db: Session = Depends(get_db)):
+    """
+    관리자용: 번호 빈도/쌍/삼중 동시 출현 색인 전체 재계산 (복구용)
+    """
+    statistics = crud.rebuild_number_statistics(db)
+    db.commit()
+    prediction_service.invalidate_historical_snapshot()
+    prediction_service.refresh_historical_snapshot_async()
+    
+    return {
+        "total_draws": statistics.total_draws,
+        "last_draw_no": statistics.last_draw_no,
+        "message": "번호 통계 색인이 재계산되었습니다"
+    }
+
 @app.post("/predict/quick")
 def quick_predict(request: schemas.PredictionRequest):
     """
@@ -205,7 +312,8 @@ def quick_predict(request: schemas.PredictionRequest):
             birth_month=request.birth_month,
             birth_day=request.birth_day,
             birth_hour=request.birth_hour,
-            name=request.name
+            name=request.name,
+            frequency_mode=request.frequency_mode
         )
         
         return {
@@ -213,7 +321,7 @@ def quick_predict(request: schemas.PredictionRequest):
             "confidence": result['confidence'],
             "method": result['method'],
             "generated_at": result['generated_at'].isoformat(),
-            "saju_elements": result['saju_analysis']['oheang']
+            "saju_elements": result['saju_analysis'].weighted_oheang()
         }
         
     except Exception as e:
@@ -347,6 +455,56 @@ def check_winning_results(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"당첨 결과 확인 중 오류 발생: {str(e)}")
 
+@app.post("/admin/simulate-strategies")
+def simulate_prediction_strategies(request: schemas.PredictionRequest, n_tickets: int = 1000000, seed: Optional[int] = None):
+    """
+    관리자용: 예측 전략 몬테카를로 시뮬레이션
+    전략별 번호 분포로 티켓을 대량 생성하여 과거 당첨 번호 대비 등수별 적중 분포를 비교합니다.
+    """
+    if not 0 < n_tickets <= MAX_SIMULATION_TICKETS:
+        raise HTTPException(status_code=400, detail=f"n_tickets는 1~{MAX_SIMULATION_TICKETS} 범위여야 합니다")
+    
+    try:
+        return evaluate_strategies(
+            request.birth_year, request.birth_month, request.birth_day, request.birth_hour,
+            n_tickets=n_tickets, seed=seed
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"전략 시뮬레이션 중 오류 발생: {str(e)}")
+
+@app.post("/admin/backtest")
+def backtest_prediction_strategies(request: schemas.BacktestRequest):
+    """
+    관리자용: 예측 전략 워크포워드 백테스트
+    과거 회차를 순서대로 재생하며 매 회차 이전 데이터만으로 프로필별 번호를 예측하고 채점합니다.
+    """
+    if not 0 < len(request.profiles) <= MAX_BACKTEST_PROFILES:
+        raise HTTPException(status_code=400, detail=f"profiles는 1~{MAX_BACKTEST_PROFILES}개여야 합니다")
+    
+    profiles = [
+        (profile.birth_year, profile.birth_month, profile.birth_day, profile.birth_hour)
+        for profile in request.profiles
+    ]
+    try:
+        return run_backtest(
+            profiles, warmup_draws=request.warmup_draws, workers=request.workers,
+            include_lstm=request.include_lstm, seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"백테스트 중 오류 발생: {str(e)}")
+
+@app.post("/admin/lstm/retrain")
+def admin_retrain_lstm(background_tasks: BackgroundTasks, full: bool = False):
+    """
+    관리자용: LSTM 재학습
+    별도 프로세스에서 학습(full=False면 직전 모델에서 미세 조정)한 뒤 새 버전을 게시하고 교체합니다.
+    """
+    background_tasks.add_task(retrain_and_reload, full)
+    return {"message": f"LSTM {'전체 학습' if full else '미세 조정'}을 백그라운드에서 시작했습니다.",
+            "current_version": model_registry.default_version}
+
 @app.post("/predict/lstm")
 def lstm_predict(request: schemas.PredictionRequest):
     """
@@ -367,7 +525,7 @@ def lstm_predict(request: schemas.PredictionRequest):
             "confidence": result['confidence'],
             "method": result['method'],
             "generated_at": result['generated_at'].isoformat(),
-            "saju_elements": result['saju_analysis']['오행'],
+            "saju_elements": result['saju_analysis'].oheang_dict(),
             "saju_weights": result['saju_weights'],
             "base_prediction": result.get('base_prediction', []),
             "model_info": {
@@ -376,6 +534,23 @@ def lstm_predict(request: schemas.PredictionRequest):
             }
         }
         
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"LSTM 예측 중 오류 발생: {str(e)}")
+
+@app.get("/predict/lstm/draw/{draw_no}")
+def lstm_predict_for_draw(draw_no: int):
+    """
+    과거 회차 검토: 해당 회차 직전 10회차를 입력으로 한 LSTM 기본 예측과 실제 당첨 번호
+    입력 구간이 요청마다 다르므로 동시 요청은 추론 배치 큐에서 한 번의 예측으로 묶입니다.
+    """
+    try:
+        return lstm_service.predict_for_draw(draw_no)
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"LSTM 예측 중 오류 발생: {str(e)}")
 
@@ -416,14 +591,50 @@ def compare_predictions(birth_year: int, birth_month: int, birth_day: int, birth
                     "method": lstm_result['method']
                 }
             },
-            "saju_analysis": statistical_result['saju_analysis'],
+            "saju_analysis": statistical_result['saju_analysis'].to_analysis_dict(),
             "generated_at": datetime.now().isoformat(),
             "name": name
         }
         
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"예측 비교 중 오류 발생: {str(e)}")
 
+@app.post("/fortune/daily")
+def daily_fortune(request: schemas.PredictionRequest, target_date: Optional[date] = None):
+    """
+    일진 운세
+    사전 계산된 일진/세운 기둥을 사주 원국과 결합합니다. (target_date 미지정 시 오늘)
+    """
+    saju_result = analyze_saju_result(
+        request.birth_year, request.birth_month, request.birth_day, request.birth_hour
+    )
+    if saju_result.error:
+        raise HTTPException(status_code=400, detail=f"사주 분석 중 오류 발생: {saju_result.error}")
+    
+    try:
+        return fortune_service.daily_fortune(saju_result, target_date)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일진 운세 계산 중 오류 발생: {str(e)}")
+
+@app.post("/fortune/yearly")
+def yearly_fortune(request: schemas.PredictionRequest, year: Optional[int] = None):
+    """
+    세운 운세
+    해당 연도의 간지를 사주 원국과 결합합니다. (year 미지정 시 올해)
+    """
+    saju_result = analyze_saju_result(
+        request.birth_year, request.birth_month, request.birth_day, request.birth_hour
+    )
+    if saju_result.error:
+        raise HTTPException(status_code=400, detail=f"사주 분석 중 오류 발생: {saju_result.error}")
+    
+    try:
+        return fortune_service.yearly_fortune(saju_result, year)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"세운 운세 계산 중 오류 발생: {str(e)}")
+
 @app.get("/model/lstm/info")
 def lstm_model_info():
     """
@@ -444,20 +655,23 @@ def prediction_health_check():
     """
     try:
         # 데이터 로드 테스트
-        lotto_draws, stats = prediction_service.load_historical_data()
+        number_index, stats = prediction_service.load_historical_data()
         
         # 사주 분석 테스트
         test_saju = prediction_service.get_saju_analysis(1990, 5, 15, 10)
         
-        # LSTM 모델 상태 확인
-        lstm_info = lstm_service.get_model_info()
+        # LSTM 모델 준비 상태 (적재를 유발하지 않음)
+        registry_status = model_registry.status()
         
         return {
             "status": "healthy",
             "database_connection": "ok",
             "historical_data_count": stats['total_draws'],
             "saju_analysis": "ok",
-            "lstm_model": "loaded" if lstm_info.get('model_loaded') else "not_loaded",
+            "lstm_model": "loaded" if registry_status['ready'] else registry_status['state'],
+            "model_registry": registry_status,
+            "lstm_inference": lstm_service.batcher.stats(),
+            "saju_cache": saju_cache.stats(),
             "last_check": datetime.now().isoformat()
         }
         
@@ -926,7 +1140,8 @@ def enhanced_prediction(request: schemas.PredictionRequest):
             birth_month=request.birth_month,
             birth_day=request.birth_day,
             birth_hour=request.birth_hour,
-            name=request.name
+            name=request.name,
+            frequency_mode=request.frequency_mode
         )
         
         return {
@@ -934,7 +1149,7 @@ def enhanced_prediction(request: schemas.PredictionRequest):
             "confidence": result['confidence'],
             "method": result['method'],
             "generated_at": result['generated_at'].isoformat(),
-            "saju_elements": result['saju_analysis']['oheang'],
+            "saju_elements": result['saju_analysis'].weighted_oheang(),
             "knowledge_enhancement": result.get('knowledge_enhancement', None),
             "number_analysis": result['number_scores'][:6]  # 상위 6개만
         }
@@ -0,0 +1,180 @@
+"""
+만세력(萬歲曆) 조견표 모듈
+양력 일자별 음력 날짜, 윤달 여부, 년주/월주/일주를 미리 계산해 둔 바이너리 테이블을
+mmap으로 읽어 O(1)로 조회합니다. 요청마다 KoreanLunarCalendar를 생성하지 않습니다.
+월주는 해당 일자 00:00 기준 절입(節入)으로 계산되며, 시각 단위 월주는 solar_terms 모듈을 사용합니다.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+import solar_terms
+
+# 테이블 파일 경로 (모듈과 같은 디렉토리에 배포)
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manseryeok.bin')
+
+# 테이블 범위 - korean-lunar-calendar 라이브러리의 양력 지원 범위가 2050-12-31까지이므로
+# 그 이후 날짜는 테이블에 포함되지 않습니다.
+START_DATE = datetime.date(1900, 1, 1)
+END_DATE = datetime.date(2050, 12, 31)
+
+# 갑자 기준점: 1984년은 갑자년, 1984-01-31은 갑자일
+BASE_YEAR = 1984
+BASE_DAY = datetime.date(1984, 1, 31)
+
+# 파일 헤더: magic, version, record_size, 시작 일자 ordinal, 레코드 수
+_MAGIC = b'MSRY'
+_VERSION = 3
+_HEADER = struct.Struct('<4sHHII')
+
+# 레코드: 음력 년, 월, 일, 윤달, 년간, 년지, 월간, 월지, 일간, 일지 (+1바이트 패딩)
+_RECORD = struct.Struct('<HBBBBBBBBBx')
+
+# 레코드와 동일한 레이아웃의 NumPy dtype (배치 조회용)
+RECORD_DTYPE = np.dtype([
+    ('lunar_year', '<u2'), ('lunar_month', 'u1'), ('lunar_day', 'u1'), ('is_leap_month', 'u1'),
+    ('year_gan', 'u1'), ('year_ji', 'u1'), ('month_gan', 'u1'), ('month_ji', 'u1'),
+    ('day_gan', 'u1'), ('day_ji', 'u1'), ('_pad', 'u1')
+])
+
+ManseryeokDay = namedtuple('ManseryeokDay', [
+    'lunar_year', 'lunar_month', 'lunar_day', 'is_leap_month',
+    'year_gan', 'year_ji', 'month_gan', 'month_ji', 'day_gan', 'day_ji'
+])
+
+
+def _pack_day(solar_date: datetime.date, lunar_year: int, lunar_month: int,
+              lunar_day: int, is_leap: bool) -> bytes:
+    """하루치 레코드 생성 (간지는 천간/지지 인덱스로 저장)"""
+    year_diff = lunar_year - BASE_YEAR
+    month_gan, month_ji = solar_terms.month_pillar(solar_date.year, solar_date.month, solar_date.day)
+    day_diff = (solar_date - BASE_DAY).days
+
+    return _RECORD.pack(
+        lunar_year, lunar_month, lunar_day, int(is_leap),
+        year_diff % 10, year_diff % 12,
+        month_gan, month_ji,
+        day_diff % 10, day_diff % 12
+    )
+
+
+def build_table(path: str = TABLE_PATH) -> int:
+    """
+    korean-lunar-calendar로 만세력 테이블을 생성하여 파일로 저장
+    음력 날짜는 하루씩 증가시키고, 월이 바뀔 수 있는 날(30일 이후)에만
+    라이브러리로 실제 음력 날짜를 확인합니다.
+    """
+    from korean_lunar_calendar import KoreanLunarCalendar
+
+    calendar = KoreanLunarCalendar()
+    records = bytearray()
+
+    current = START_DATE
+    lunar = None
+    one_day = datetime.timedelta(days=1)
+
+    while current <= END_DATE:
+        if lunar is None or lunar[2] >= 30:
+            calendar.setSolarDate(current.year, current.month, current.day)
+            lunar = (calendar.lunarYear, calendar.lunarMonth,
+                     calendar.lunarDay, bool(calendar.isIntercalation))
+        records += _pack_day(current, *lunar)
+
+        current += one_day
+        lunar = (lunar[0], lunar[1], lunar[2] + 1, lunar[3])
+
+    count = len(records) // _RECORD.size
+    header = _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, START_DATE.toordinal(), count)
+
+    # 임시 파일에 쓴 뒤 교체하여 읽는 중인 프로세스가 깨진 파일을 보지 않도록 함
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(records)
+    os.replace(tmp_path, path)
+
+    return count
+
+
+class ManseryeokTable:
+    """mmap 기반 만세력 조견표"""
+
+    def __init__(self, path: str = TABLE_PATH):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, start_ordinal, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise ValueError(f"만세력 테이블 형식이 올바르지 않습니다: {path}")
+
+        self.start_ordinal = start_ordinal
+        self.count = count
+
+        # mmap 버퍼를 복사 없이 구조화 배열로 노출 (배치 조회용)
+        self.records = np.frombuffer(self._buffer, dtype=RECORD_DTYPE,
+                                     count=count, offset=_HEADER.size)
+
+    def lookup_ordinal(self, ordinal: int) -> ManseryeokDay:
+        """양력 일자 ordinal로 조회"""
+        index = ordinal - self.start_ordinal
+        if not 0 <= index < self.count:
+            raise ValueError(
+                f"만세력 테이블 범위({START_DATE.isoformat()} ~ {END_DATE.isoformat()})를 벗어난 날짜입니다."
+            )
+        return ManseryeokDay._make(
+            _RECORD.unpack_from(self._buffer, _HEADER.size + index * _RECORD.size)
+        )
+
+    def lookup(self, year: int, month: int, day: int) -> ManseryeokDay:
+        """양력 년/월/일로 조회"""
+        return self.lookup_ordinal(datetime.date(year, month, day).toordinal())
+
+
+def _is_current_format(path: str) -> bool:
+    """테이블 파일 헤더가 현재 버전/레코드 형식인지 확인"""
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    magic, version, record_size, _, _ = _HEADER.unpack(header)
+    return magic == _MAGIC and version == _VERSION and record_size == _RECORD.size
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_table() -> ManseryeokTable:
+    """프로세스 전역 만세력 테이블 (최초 호출 시 로드, 파일이 없으면 생성)"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                if not os.path.exists(TABLE_PATH):
+                    print(f"[MANSERYEOK] 테이블 파일이 없어 새로 생성합니다: {TABLE_PATH}")
+                    build_table(TABLE_PATH)
+                elif not _is_current_format(TABLE_PATH):
+                    print(f"[MANSERYEOK] 이전 형식의 테이블 파일을 다시 생성합니다: {TABLE_PATH}")
+                    build_table(TABLE_PATH)
+                _table = ManseryeokTable(TABLE_PATH)
+    return _table
+
+
+def lookup(year: int, month: int, day: int) -> ManseryeokDay:
+    """양력 날짜의 만세력 정보 조회"""
+    return get_table().lookup(year, month, day)
+
+
+if __name__ == "__main__":
+    # 테이블 재생성
+    count = build_table()
+    print(f"만세력 테이블 생성 완료: {count}일 ({TABLE_PATH})")
+    print(lookup(1990, 5, 15))
@@ -0,0 +1,299 @@
+"""
+LSTM 모델 아티팩트 번들
+버전마다 디렉터리 하나에 가중치/스케일러(.npz 배열), 미세 조정용 체크포인트, JSON 매니페스트를 두고,
+현재 버전은 포인터 파일(CURRENT) 하나로 가리킵니다.
+
+    models/lstm/
+        CURRENT                      {"version": "20250101_120000"}
+        20250101_120000/
+            manifest.json            입력/출력 형태, 학습 회차 범위, 파일 체크섬, 학습 요약
+            weights.npz              numpy_lstm.export_npz 형식 (스케일러 min_/scale_ 포함, pickle 없음)
+            checkpoint.keras         다음 미세 조정의 시작점 (선택)
+
+게시는 임시 디렉터리에 번들을 완성한 뒤 디렉터리 이름 변경 → 포인터 교체(os.replace) 순서로 하므로,
+읽는 쪽은 항상 완성된 번들만 봅니다. 적재는 포인터 → 매니페스트 → 가중치 순서로 직접 읽고
+디렉터리를 조회하지 않습니다.
+
+포인터가 아직 없으면(번들 도입 전 배포) 이전 방식의 lotto_lstm_model_* 파일 중 최신 것을
+한 번 번들로 변환하여 게시합니다. (import_latest_legacy_files, 레지스트리 사전 적재 시 호출)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from numpy_lstm import NumpyLSTMModel, NumpyMinMaxScaler, load_npz
+
+# 기본 아티팩트 디렉터리 (작업 디렉터리와 무관하게 backend/models/lstm)
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'lstm')
+
+POINTER_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+WEIGHTS_FILE = 'weights.npz'
+CHECKPOINT_FILE = 'checkpoint.keras'
+
+MANIFEST_FORMAT_VERSION = 1
+
+# 번들 도입 전 파일 (작업 디렉터리 또는 backend 디렉터리의 lotto_lstm_model_<타임스탬프>.npz/.keras/.h5 + 스케일러 .pkl)
+LEGACY_MODEL_DIRS = (os.getcwd(), os.path.dirname(os.path.abspath(__file__)))
+LEGACY_MODEL_PATTERN = re.compile(r'^lotto_lstm_model_(?!scaler_)(.+)\.(npz|keras|h5)$')
+LEGACY_SCALER_PATTERN = re.compile(r'^lotto_lstm_model_scaler_(.+)\.pkl$')
+
+
+class ArtifactError(RuntimeError):
+    """번들이 없거나 매니페스트/파일이 일치하지 않는 경우"""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_json(path: str) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_atomic(path: str, data: Dict):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (같은 디렉터리이므로 원자적)"""
+    temp_path = f'{path}.tmp.{os.getpid()}'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def bundle_dir(version: str, artifact_dir: str = ARTIFACT_DIR) -> str:
+    return os.path.join(artifact_dir, version)
+
+
+def read_current_version(artifact_dir: str = ARTIFACT_DIR) -> Optional[str]:
+    """포인터 파일의 현재 버전 (게시된 번들이 없으면 None)"""
+    try:
+        return _read_json(os.path.join(artifact_dir, POINTER_FILE))['version']
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        raise ArtifactError(f"모델 포인터 파일을 읽을 수 없습니다: {e}")
+
+
+def read_manifest(version: str, artifact_dir: str = ARTIFACT_DIR) -> Dict:
+    """버전 번들의 매니페스트"""
+    try:
+        manifest = _read_json(os.path.join(bundle_dir(version, artifact_dir), MANIFEST_FILE))
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"모델 {version}의 매니페스트를 읽을 수 없습니다: {e}")
+    if manifest.get('format') != MANIFEST_FORMAT_VERSION:
+        raise ArtifactError(f"지원하지 않는 매니페스트 형식입니다: {manifest.get('format')}")
+    return manifest
+
+
+def artifact_path(manifest: Dict, kind: str, artifact_dir: str = ARTIFACT_DIR) -> Optional[str]:
+    """매니페스트에 기록된 파일 경로 (kind: 'weights' | 'checkpoint', 없으면 None)"""
+    entry = manifest['files'].get(kind)
+    return os.path.join(bundle_dir(manifest['version'], artifact_dir), entry['path']) if entry else None
+
+
+def load_bundle(version: Optional[str] = None, artifact_dir: str = ARTIFACT_DIR,
+                verify: bool = True) -> Tuple[Dict, NumpyLSTMModel, NumpyMinMaxScaler]:
+    """
+    번들 적재 (version이 없으면 포인터의 현재 버전)
+    가중치 파일의 체크섬과 모델 입력/출력 형태를 매니페스트와 비교합니다.
+    """
+    version = version or read_current_version(artifact_dir)
+    if version is None:
+        raise ArtifactError(f"게시된 LSTM 모델이 없습니다: {artifact_dir}")
+
+    manifest = read_manifest(version, artifact_dir)
+    weights_path = artifact_path(manifest, 'weights', artifact_dir)
+    if verify and _sha256(weights_path) != manifest['files']['weights']['sha256']:
+        raise ArtifactError(f"모델 {version}의 가중치 파일 체크섬이 매니페스트와 다릅니다.")
+
+    model, scaler = load_npz(weights_path)
+    if (list(model.input_shape[1:]) != manifest['input_shape']
+            or list(model.output_shape[1:]) != manifest['output_shape']):
+        raise ArtifactError(f"모델 {version}의 입력/출력 형태가 매니페스트와 다릅니다.")
+    return manifest, model, scaler
+
+
+def publish_bundle(write_weights: Callable[[str], object], train_draw_range: Optional[Tuple[int, int]] = None,
+                   metadata: Optional[Dict] = None, write_checkpoint: Optional[Callable[[str], object]] = None,
+                   artifact_dir: str = ARTIFACT_DIR, version: Optional[str] = None) -> Dict:
+    """
+    새 번들을 만들어 현재 버전으로 게시
+
+    Args:
+        write_weights: 경로를 받아 numpy_lstm .npz 가중치를 쓰는 함수 (예: lambda p: export_npz(model, scaler, p))
+        train_draw_range: 학습에 사용한 (첫 회차, 마지막 회차)
+        metadata: 매니페스트에 함께 기록할 학습 요약
+        write_checkpoint: 경로를 받아 미세 조정용 체크포인트를 쓰는 함수 (예: model.save)
+    Returns:
+        게시된 번들의 매니페스트
+    """
+    version = version or datetime.now().strftime('%Y%m%d_%H%M%S')
+    final_dir = bundle_dir(version, artifact_dir)
+    if os.path.exists(final_dir):
+        raise ArtifactError(f"이미 존재하는 모델 버전입니다: {version}")
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    temp_dir = os.path.join(artifact_dir, f'.tmp-{version}-{os.getpid()}')
+    os.makedirs(temp_dir)
+    try:
+        files = {}
+        weights_path = os.path.join(temp_dir, WEIGHTS_FILE)
+        write_weights(weights_path)
+        model, _ = load_npz(weights_path)
+        files['weights'] = {'path': WEIGHTS_FILE, 'sha256': _sha256(weights_path)}
+
+        if write_checkpoint is not None:
+            checkpoint_path = os.path.join(temp_dir, CHECKPOINT_FILE)
+            write_checkpoint(checkpoint_path)
+            files['checkpoint'] = {'path': CHECKPOINT_FILE, 'sha256': _sha256(checkpoint_path)}
+
+        manifest = {
+            'format': MANIFEST_FORMAT_VERSION,
+            'version': version,
+            'created_at': datetime.now().isoformat(),
+            'input_shape': list(model.input_shape[1:]),
+            'output_shape': list(model.output_shape[1:]),
+            'train_draw_range': list(map(int, train_draw_range)) if train_draw_range else None,
+            'files': files,
+            'metadata': metadata or {}
+        }
+        _write_json_atomic(os.path.join(temp_dir, MANIFEST_FILE), manifest)
+
+        # 완성된 번들을 한 번에 노출한 뒤 포인터 교체
+        os.replace(temp_dir, final_dir)
+    finally:
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    set_current_version(version, artifact_dir)
+    print(f"[MODEL_ARTIFACTS] 모델 {version} 게시 완료")
+    return manifest
+
+
+def set_current_version(version: str, artifact_dir: str = ARTIFACT_DIR):
+    """포인터를 기존 번들로 교체 (롤백에도 사용)"""
+    read_manifest(version, artifact_dir)
+    _write_json_atomic(os.path.join(artifact_dir, POINTER_FILE), {'version': version})
+
+
+def import_legacy_files(model_path: str, scaler_path: Optional[str] = None,
+                        train_draw_range: Optional[Tuple[int, int]] = None,
+                        artifact_dir: str = ARTIFACT_DIR) -> Dict:
+    """
+    이전 방식의 lotto_lstm_model_*.keras/.h5 + 스케일러 .pkl (또는 내보낸 .npz)을 번들로 변환하여 게시
+    Keras 파일 변환에는 TensorFlow가 필요합니다.
+    """
+    if model_path.endswith('.npz'):
+        return publish_bundle(lambda path: shutil.copyfile(model_path, path), train_draw_range,
+                              {'imported_from': model_path}, artifact_dir=artifact_dir)
+
+    import pickle
+    from tensorflow.keras.models import load_model
+    from numpy_lstm import export_npz
+
+    model = load_model(model_path)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    return publish_bundle(lambda path: export_npz(model, scaler, path), train_draw_range,
+                          {'imported_from': model_path}, write_checkpoint=model.save, artifact_dir=artifact_dir)
+
+
+def find_legacy_files(directories=LEGACY_MODEL_DIRS) -> Tuple[Optional[str], Optional[str]]:
+    """
+    이전 방식 파일 중 최신 (모델 경로, 스케일러 경로) - 없으면 (None, None)
+    같은 타임스탬프에 .npz가 있으면 Keras 파일보다 우선하며(스케일러 포함),
+    Keras 파일은 같은 타임스탬프의 스케일러가 없으면 가장 최신 스케일러를 사용합니다.
+    """
+    models, scalers = {}, {}
+    for directory in dict.fromkeys(os.path.abspath(d) for d in directories):
+        try:
+            filenames = os.listdir(directory)
+        except OSError:
+            continue
+        for filename in filenames:
+            model_match = LEGACY_MODEL_PATTERN.match(filename)
+            scaler_match = LEGACY_SCALER_PATTERN.match(filename)
+            if model_match:
+                stamp = model_match.group(1)
+                if model_match.group(2) == 'npz' or stamp not in models:
+                    models[stamp] = os.path.join(directory, filename)
+            elif scaler_match:
+                scalers[scaler_match.group(1)] = os.path.join(directory, filename)
+
+    for stamp in sorted(models, reverse=True):
+        model_path = models[stamp]
+        if model_path.endswith('.npz'):
+            return model_path, None
+        scaler_path = scalers.get(stamp) or (scalers[max(scalers)] if scalers else None)
+        if scaler_path:
+            return model_path, scaler_path
+    return None, None
+
+
+def _import_legacy_process(model_path: str, scaler_path: Optional[str], artifact_dir: str):
+    """Keras 파일 변환 프로세스 진입점 (spawn으로 실행되어 부모 프로세스에 TensorFlow가 적재되지 않음)"""
+    import_legacy_files(model_path, scaler_path, artifact_dir=artifact_dir)
+
+
+def import_latest_legacy_files(artifact_dir: str = ARTIFACT_DIR,
+                               directories=LEGACY_MODEL_DIRS) -> Optional[str]:
+    """
+    포인터가 없을 때 최신 이전 방식 파일을 번들로 게시 (게시한 버전, 변환할 파일이 없거나 실패하면 None)
+    .npz는 그대로 복사하고, Keras 파일은 별도 프로세스에서 TensorFlow로 변환합니다.
+    """
+    if read_current_version(artifact_dir) is not None:
+        return None
+    model_path, scaler_path = find_legacy_files(directories)
+    if model_path is None:
+        return None
+
+    print(f"[MODEL_ARTIFACTS] 이전 방식 모델 파일을 번들로 변환: {model_path}")
+    try:
+        if model_path.endswith('.npz'):
+            import_legacy_files(model_path, artifact_dir=artifact_dir)
+        else:
+            process = multiprocessing.get_context('spawn').Process(
+                target=_import_legacy_process, args=(model_path, scaler_path, artifact_dir), name='lstm-legacy-import'
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                raise ArtifactError(f"변환 프로세스 실패 (exit code {process.exitcode})")
+    except Exception as e:
+        print(f"[MODEL_ARTIFACTS] 이전 방식 모델 변환 실패: {e}")
+        return None
+    return read_current_version(artifact_dir)
+
+
+if __name__ == "__main__":
+    # 사용법:
+    #   python model_artifacts.py                          현재 버전 매니페스트 출력
+    #   python model_artifacts.py import 모델.keras 스케일러.pkl   이전 파일을 번들로 변환
+    #   python model_artifacts.py rollback 버전              포인터를 이전 버전으로 교체
+    import sys
+
+    if len(sys.argv) >= 3 and sys.argv[1] == 'import':
+        manifest = import_legacy_files(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    elif len(sys.argv) == 3 and sys.argv[1] == 'rollback':
+        set_current_version(sys.argv[2])
+        manifest = read_manifest(sys.argv[2])
+    else:
+        current = read_current_version()
+        manifest = read_manifest(current) if current else None
+    print(json.dumps(manifest, ensure_ascii=False, indent=2) if manifest else "게시된 모델이 없습니다.")
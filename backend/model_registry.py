@@ -0,0 +1,231 @@
+"""
+LSTM 모델 레지스트리
+model_artifacts 번들(매니페스트 + 가중치 .npz)을 버전별로 적재하며, 기본 버전은 포인터 파일(CURRENT)이 가리키는 버전입니다.
+서버 시작 시 백그라운드 스레드에서 기본 버전을 미리 적재하고, 모델은 TensorFlow 없이 numpy_lstm 백엔드로 실행합니다.
+적재는 잠금으로 한 번만 수행되며, 요청 처리 경로는 적재가 끝난 모델만 사용하고 직접 적재하지 않습니다.
+재학습/롤백으로 포인터가 바뀌면 주기적인 포인터 확인에서 백그라운드로 적재한 뒤 기본 버전을 교체합니다.
+기본 버전 조회는 (이름, 모델) 한 쌍을 담은 참조 하나만 읽으므로 교체 중에도 이전/새 버전 중 하나를 받습니다.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from model_artifacts import (
+    ARTIFACT_DIR, LEGACY_MODEL_DIRS, artifact_path, import_latest_legacy_files, load_bundle, read_current_version
+)
+
+# 포인터 파일 변경 여부를 확인하는 주기 (초)
+REFRESH_INTERVAL_SECONDS = 30
+
+# 레지스트리 상태
+STATE_IDLE = 'idle'
+STATE_LOADING = 'loading'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+
+class ModelNotReadyError(RuntimeError):
+    """모델이 아직 적재되지 않았거나 적재에 실패한 경우"""
+
+
+class ModelVersion:
+    """적재된 모델 한 버전 (모델, 스케일러, 매니페스트)"""
+
+    __slots__ = ('name', 'manifest', 'model_path', 'scaler_path', 'model', 'scaler', 'loaded_at')
+
+    def __init__(self, name: str, manifest: Dict, model_path: str, model, scaler):
+        self.name = name
+        self.manifest = manifest
+        self.model_path = model_path
+        # 스케일러 값은 가중치 파일에 배열로 함께 저장됨
+        self.scaler_path = model_path
+        self.model = model
+        self.scaler = scaler
+        self.loaded_at = datetime.now()
+
+    def to_dict(self) -> Dict:
+        return {
+            'model_file': self.model_path,
+            'created_at': self.manifest.get('created_at'),
+            'train_draw_range': self.manifest.get('train_draw_range'),
+            'input_shape': self.manifest.get('input_shape'),
+            'loaded_at': self.loaded_at.isoformat()
+        }
+
+
+class ModelRegistry:
+    """이름(버전)별 LSTM 모델 레지스트리 (스레드 안전)"""
+
+    def __init__(self, artifact_dir: str = ARTIFACT_DIR, legacy_dirs=LEGACY_MODEL_DIRS):
+        self.artifact_dir = artifact_dir
+        # 포인터가 없을 때 이전 방식 lotto_lstm_model_* 파일을 찾을 디렉터리
+        self.legacy_dirs = legacy_dirs
+        self._versions: Dict[str, ModelVersion] = {}
+        self._default: Optional[str] = None
+        # 기본 버전 객체 (이름과 함께 한 번에 교체되며, get()은 이 참조만 읽음)
+        self._current: Optional[ModelVersion] = None
+        # 이름을 지정해 적재한 버전 (기본 버전 교체 시에도 내리지 않음)
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._refresh_thread = None
+        self._checked_at = time.monotonic()
+        self.state = STATE_IDLE
+        self.error = None
+
+    def current_version(self) -> Optional[str]:
+        """포인터 파일이 가리키는 버전 (파일 하나만 읽음)"""
+        return read_current_version(self.artifact_dir)
+
+    def versions(self) -> List[str]:
+        """적재된 버전 이름 목록 (오래된 순)"""
+        return sorted(self._versions)
+
+    def _load_locked(self, name: str) -> ModelVersion:
+        """버전 적재 (잠금 안에서 호출, 이미 적재된 버전은 그대로 반환)"""
+        version = self._versions.get(name)
+        if version is not None:
+            return version
+
+        started = time.perf_counter()
+        manifest, model, scaler = load_bundle(name, self.artifact_dir)
+        version = ModelVersion(name, manifest, artifact_path(manifest, 'weights', self.artifact_dir), model, scaler)
+        self._versions[name] = version
+        print(f"[MODEL_REGISTRY] 모델 {name} 적재 완료 ({time.perf_counter() - started:.2f}초)")
+        return version
+
+    def load(self, name: Optional[str] = None) -> ModelVersion:
+        """
+        버전 적재 (기본: 포인터의 현재 버전, 이미 적재된 버전은 그대로 반환)
+        파일 적재는 잠금 안에서 한 번만 수행되므로 동시에 호출해도 중복 적재하지 않습니다.
+        이름을 지정해 적재한 버전은 고정되어 기본 버전이 바뀌어도 내리지 않습니다.
+        """
+        version = self._versions.get(name) if name else self._current
+        if version is not None:
+            if name is not None:
+                self._pinned.add(name)
+            return version
+
+        with self._lock:
+            if name is not None:
+                version = self._load_locked(name)
+                self._pinned.add(name)
+                return version
+
+            if self._current is not None:
+                return self._current
+            name = self.current_version()
+            if name is None:
+                raise ModelNotReadyError(f"게시된 LSTM 모델이 없습니다: {self.artifact_dir}")
+            version = self._load_locked(name)
+            self._default, self._current = name, version
+            return version
+
+    def preload(self, names: Optional[List[str]] = None):
+        """
+        기본 버전(과 지정한 버전)을 적재하고 준비 상태를 갱신
+        게시된 번들이 없으면 이전 방식 모델 파일을 먼저 번들로 변환합니다.
+        """
+        self.state = STATE_LOADING
+        try:
+            if self._current is None and self.legacy_dirs:
+                import_latest_legacy_files(self.artifact_dir, self.legacy_dirs)
+            self.load()
+            for name in names or []:
+                self.load(name)
+            self.state = STATE_READY
+            self.error = None
+        except Exception as e:
+            print(f"[MODEL_REGISTRY] 모델 사전 적재 실패: {e}")
+            self.state = STATE_FAILED
+            self.error = str(e)
+        finally:
+            self._ready.set()
+
+    def preload_async(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """백그라운드 스레드에서 사전 적재 (서버 시작 이벤트에서 호출)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._ready.clear()
+            self._thread = threading.Thread(
+                target=self.preload, args=(names,), name='model-preload', daemon=True
+            )
+            self._thread.start()
+        return self._thread
+
+    def refresh(self) -> bool:
+        """
+        포인터가 다른 버전(새 게시 또는 롤백)을 가리키면 적재한 뒤 기본 버전으로 교체 (교체 여부)
+        처리 중인 요청은 이미 받은 이전 버전 객체를 그대로 사용하므로 교체 중에도 안전합니다.
+        """
+        self._checked_at = time.monotonic()
+        try:
+            latest = self.current_version()
+        except Exception as e:
+            print(f"[MODEL_REGISTRY] 모델 포인터 확인 실패: {e}")
+            return False
+        if latest is None or latest == self._default:
+            return False
+
+        with self._lock:
+            try:
+                version = self._load_locked(latest)
+            except Exception as e:
+                print(f"[MODEL_REGISTRY] 새 모델 {latest} 적재 실패: {e}")
+                return False
+
+            previous = self._default
+            self._default, self._current = latest, version
+            # 이전 기본 버전은 고정되지 않은 경우에만 내림 (get()은 _current만 읽으므로 조회 공백 없음)
+            if previous is not None and previous != latest and previous not in self._pinned:
+                self._versions.pop(previous, None)
+            self.state = STATE_READY
+            self.error = None
+        print(f"[MODEL_REGISTRY] 기본 모델 교체: {previous} → {latest}")
+        return True
+
+    def _refresh_if_due(self):
+        """확인 주기가 지났으면 백그라운드 스레드에서 refresh (요청 처리 경로는 기다리지 않음)"""
+        if self.state == STATE_LOADING or time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS:
+            return
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._checked_at = time.monotonic()
+        self._refresh_thread = threading.Thread(target=self.refresh, name='model-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """사전 적재가 끝날 때까지 대기 (성공 여부)"""
+        self._ready.wait(timeout)
+        return self.state == STATE_READY
+
+    def get(self, name: Optional[str] = None) -> ModelVersion:
+        """적재된 버전 조회 (적재되지 않았으면 적재하지 않고 ModelNotReadyError)"""
+        self._refresh_if_due()
+        version = self._versions.get(name) if name else self._current
+        if version is None:
+            if self.state == STATE_LOADING:
+                raise ModelNotReadyError("LSTM 모델을 적재하는 중입니다. 잠시 후 다시 시도해 주세요.")
+            raise ModelNotReadyError(self.error or f"LSTM 모델이 적재되지 않았습니다: {name or '기본 버전'}")
+        return version
+
+    @property
+    def default_version(self) -> Optional[str]:
+        return self._default
+
+    def status(self) -> Dict:
+        """준비 상태 (/health/prediction 보고용)"""
+        return {
+            'state': self.state,
+            'ready': self.state == STATE_READY,
+            'artifact_dir': self.artifact_dir,
+            'default_version': self._default,
+            'loaded_versions': {name: version.to_dict() for name, version in self._versions.items()},
+            'error': self.error
+        }
+
+
+# 전역 모델 레지스트리
+model_registry = ModelRegistry()
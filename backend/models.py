@@ -42,6 +42,33 @@ class LottoDraw(Base):
     n6 = Column(Integer)
     bonus = Column(Integer)
 
+class NumberStatistics(Base):
+    __tablename__ = "number_statistics"
+
+    id = Column(Integer, primary_key=True, index=True)  # 단일 행 (id=1)
+    total_draws = Column(Integer, default=0)
+    first_draw_no = Column(Integer)
+    last_draw_no = Column(Integer)
+    frequency = Column(JSON)  # 번호별 출현 횟수 (45개, 1번부터)
+    decay_half_life = Column(Integer)  # 감쇠 점수 반감기 (회차 수)
+    decayed_frequency = Column(JSON)  # 번호별 지수 감쇠 출현 점수 (45개, 최근 회차일수록 큰 가중치)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+class NumberPairCount(Base):
+    __tablename__ = "number_pair_counts"
+
+    # 번호 쌍 동시 출현 횟수 (number_a < number_b, 990쌍 모두 미리 생성하여 회차 저장 시 15행만 갱신)
+    number_a = Column(Integer, primary_key=True)
+    number_b = Column(Integer, primary_key=True)
+    count = Column(Integer, default=0)
+
+class NumberTripletCount(Base):
+    __tablename__ = "number_triplet_counts"
+
+    # 번호 세 개 동시 출현 횟수 (희소, 코드는 crud.triplet_codes 형식, 회차 저장 시 20행만 갱신/추가)
+    code = Column(Integer, primary_key=True)
+    count = Column(Integer, default=0)
+
 class Prediction(Base):
     __tablename__ = "predictions"
 
@@ -0,0 +1,212 @@
+"""
+NumPy LSTM 추론 백엔드
+학습된 Keras LSTM 모델(LSTM + Dense)의 가중치와 MinMaxScaler 값을 .npz 파일 하나로 내보내고,
+TensorFlow/scikit-learn 없이 NumPy만으로 같은 순전파를 수행합니다.
+API 워커는 이 백엔드로 예측하므로 TensorFlow를 import하지 않습니다.
+
+    Keras LSTM 게이트 순서: 입력(i), 망각(f), 후보(c), 출력(o)
+    c_t = f * c_{t-1} + i * act(z_c),  h_t = o * act(c_t)
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# 지원하는 활성화 함수
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 0.5 * (1 + np.tanh(0.5 * x))  # exp 오버플로 없는 시그모이드
+}
+
+EXPORT_FORMAT_VERSION = 1
+
+
+def _activation(name: str):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"지원하지 않는 활성화 함수입니다: {name}")
+    return ACTIVATIONS[name]
+
+
+class NumpyMinMaxScaler:
+    """sklearn MinMaxScaler의 transform/inverse_transform (min_, scale_ 배열만 사용)"""
+
+    def __init__(self, min_: np.ndarray, scale_: np.ndarray):
+        self.min_ = np.asarray(min_, dtype=np.float64)
+        self.scale_ = np.asarray(scale_, dtype=np.float64)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.min_) / self.scale_
+
+
+class NumpyLSTMModel:
+    """
+    LSTM/Dense 층을 순서대로 적용하는 순전파 모델 (Keras model.predict와 같은 인터페이스)
+    layers: [{'type': 'lstm'|'dense', 'activation', 가중치 배열, ...}]
+    """
+
+    def __init__(self, layers: List[Dict]):
+        self.layers = layers
+        first, last = layers[0], layers[-1]
+        self.input_shape = (None, first.get('timesteps'), first['kernel'].shape[0])
+        self.output_shape = (None, last['kernel'].shape[1])
+
+    @staticmethod
+    def _lstm(x: np.ndarray, layer: Dict) -> np.ndarray:
+        kernel, recurrent_kernel, bias = layer['kernel'], layer['recurrent_kernel'], layer['bias']
+        activation = _activation(layer['activation'])
+        recurrent_activation = _activation(layer['recurrent_activation'])
+        units = recurrent_kernel.shape[0]
+
+        batch, timesteps, _ = x.shape
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        # 입력 투영은 모든 시점을 한 번에 계산
+        projected = x @ kernel + bias
+        outputs = []
+        for t in range(timesteps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            outputs.append(h)
+        return np.stack(outputs, axis=1) if layer.get('return_sequences') else h
+
+    @staticmethod
+    def _dense(x: np.ndarray, layer: Dict) -> np.ndarray:
+        return _activation(layer['activation'])(x @ layer['kernel'] + layer['bias'])
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """(B, timesteps, features) 입력의 예측 (float32)"""
+        x = np.asarray(x, dtype=np.float32)
+        for layer in self.layers:
+            x = self._lstm(x, layer) if layer['type'] == 'lstm' else self._dense(x, layer)
+        return x
+
+
+def export_npz(model, scaler, path: str) -> str:
+    """
+    Keras Sequential(LSTM/Dense) 모델과 MinMaxScaler를 .npz로 내보내기
+    층 구성은 JSON 문자열로, 가중치/스케일러 값은 배열로 저장합니다. (allow_pickle 없이 읽을 수 있음)
+    """
+    arrays, config = {}, []
+    for index, layer in enumerate(model.layers):
+        layer_config = layer.get_config()
+        kind = type(layer).__name__.lower()
+        weights = layer.get_weights()
+
+        if kind == 'lstm':
+            kernel, recurrent_kernel, bias = weights
+            arrays[f'layer{index}_recurrent_kernel'] = recurrent_kernel.astype(np.float32)
+            entry = {
+                'type': 'lstm',
+                'activation': layer_config['activation'],
+                'recurrent_activation': layer_config['recurrent_activation'],
+                'return_sequences': bool(layer_config.get('return_sequences', False))
+            }
+        elif kind == 'dense':
+            kernel, bias = weights
+            entry = {'type': 'dense', 'activation': layer_config['activation']}
+        else:
+            raise ValueError(f"내보낼 수 없는 층입니다: {type(layer).__name__}")
+
+        for name in ('activation', 'recurrent_activation'):
+            if name in entry:
+                _activation(entry[name])
+        arrays[f'layer{index}_kernel'] = kernel.astype(np.float32)
+        arrays[f'layer{index}_bias'] = bias.astype(np.float32)
+        config.append(entry)
+
+    if config and config[0]['type'] == 'lstm':
+        config[0]['timesteps'] = model.input_shape[1]
+
+    np.savez(
+        path,
+        config=np.array(json.dumps({'format': EXPORT_FORMAT_VERSION, 'layers': config})),
+        scaler_min=np.asarray(scaler.min_, dtype=np.float64),
+        scaler_scale=np.asarray(scaler.scale_, dtype=np.float64),
+        **arrays
+    )
+    return path
+
+
+def load_npz(path: str) -> Tuple[NumpyLSTMModel, NumpyMinMaxScaler]:
+    """export_npz로 내보낸 파일에서 모델과 스케일러 복원"""
+    with np.load(path, allow_pickle=False) as data:
+        config = json.loads(str(data['config']))
+        if config.get('format') != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 모델 파일 형식입니다: {config.get('format')}")
+
+        layers = []
+        for index, entry in enumerate(config['layers']):
+            layer = dict(entry)
+            layer['kernel'] = data[f'layer{index}_kernel']
+            layer['bias'] = data[f'layer{index}_bias']
+            if entry['type'] == 'lstm':
+                layer['recurrent_kernel'] = data[f'layer{index}_recurrent_kernel']
+            layers.append(layer)
+
+        scaler = NumpyMinMaxScaler(data['scaler_min'], data['scaler_scale'])
+    return NumpyLSTMModel(layers), scaler
+
+
+def export_keras_files(model_path: str, scaler_path: str, output_path: str = None) -> str:
+    """저장된 Keras 모델/스케일러 파일을 같은 이름의 .npz로 변환 (TensorFlow 필요)"""
+    import pickle
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    output_path = output_path or model_path.rsplit('.', 1)[0] + '.npz'
+    return export_npz(model, scaler, output_path)
+
+
+if __name__ == "__main__":
+    # 사용법: python numpy_lstm.py [모델.keras 스케일러.pkl]
+    #   인자가 있으면 .npz로 변환하고, 없으면 Keras 출력과 NumPy 순전파를 비교합니다.
+    #   (서비스와 같은 LSTM(50, relu) + Dense(6) 구조)
+    import os
+    import sys
+    import tempfile
+
+    if len(sys.argv) == 3:
+        print(f"내보내기 완료: {export_keras_files(sys.argv[1], sys.argv[2])}")
+        raise SystemExit(0)
+
+    try:
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Input
+    except ImportError:
+        print("TensorFlow가 설치되어 있지 않아 Keras 비교를 건너뜁니다.")
+        raise SystemExit(0)
+
+    class _Scaler:
+        min_ = np.zeros(6)
+        scale_ = np.ones(6) / 45
+
+    rng = np.random.default_rng(0)
+    keras_model = Sequential([Input((10, 6)), LSTM(50, activation='relu'), Dense(6)])
+    keras_model.set_weights([rng.normal(0, 0.3, w.shape).astype(np.float32) for w in keras_model.get_weights()])
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = export_npz(keras_model, _Scaler(), os.path.join(directory, 'parity.npz'))
+        numpy_model, numpy_scaler = load_npz(path)
+
+    x = rng.random((256, 10, 6)).astype(np.float32)
+    expected = keras_model.predict(x, verbose=0)
+    actual = numpy_model.predict(x)
+    max_error = float(np.abs(expected - actual).max())
+    print(f"Keras 대비 최대 오차: {max_error:.2e}")
+    assert max_error < 1e-4, "NumPy 순전파가 Keras 출력과 다릅니다."
+
+    rounded_equal = np.array_equal(np.clip(np.round(expected * 45), 1, 45), np.clip(np.round(actual * 45), 1, 45))
+    print(f"반올림한 번호 일치: {rounded_equal}")
@@ -5,25 +5,113 @@
 로또 번호 예측 관련 로직을 제공합니다.
 """
 
+import json
+import threading
 import numpy as np
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 from database import SessionLocal
-from models import LottoDraw
-from saju import analyze_saju
+import crud
+import models
+from draw_store import draw_store
+from saju import OHEANG, NUMBER_OHEANG_INDEX, NUMBER_OHEANG_RANGES, analyze_saju_result, SajuResult
 from saju_knowledge_enhancer import SajuKnowledgeEnhancer
 
+# 동시 출현 특징의 점수 반영 비율 (후보 번호 중 최댓값 대비 0~1 정규화 값에 곱함)
+PAIR_FEATURE_WEIGHT = 0.1
+TRIPLET_FEATURE_WEIGHT = 0.05
+
+# 빈도 기준: 전체 누적 출현 횟수 / 지수 감쇠 점수 (최근 회차 중시)
+FREQUENCY_MODES = ('raw', 'decayed')
+
+# /analysis/historical에 보고하는 상위 번호 쌍/삼중 수
+TOP_COOCCURRENCE_COUNT = 10
+
+# 사주 원국의 글자 수 (4기둥 x 천간/지지) - 오행 개수의 합
+SAJU_CHARACTER_COUNT = 8
+
+
+def oheang_vectors(total: int = SAJU_CHARACTER_COUNT) -> List[Tuple[int, ...]]:
+    """합이 total인 모든 오행 개수 벡터 (OHEANG 순서, 8이면 495개)"""
+    vectors = []
+    for wood in range(total + 1):
+        for fire in range(total - wood + 1):
+            for earth in range(total - wood - fire + 1):
+                for metal in range(total - wood - fire - earth + 1):
+                    vectors.append((wood, fire, earth, metal, total - wood - fire - earth - metal))
+    return vectors
+
+
+def oheang_key(saju_oheang: Dict[str, float]) -> Optional[Tuple[int, ...]]:
+    """예측 캐시 키 (정수 개수이고 합이 8인 경우만, 지식 조정으로 소수가 되면 None)"""
+    counts = [saju_oheang.get(element, 0) for element in OHEANG]
+    if len(saju_oheang) != len(OHEANG) or any(float(count) != int(count) or count < 0 for count in counts):
+        return None
+    key = tuple(int(count) for count in counts)
+    return key if sum(key) == SAJU_CHARACTER_COUNT else None
+
+
+def copy_prediction(prediction: Dict) -> Dict:
+    """공유 예측 결과의 사본 (호출자가 수정해도 스냅샷 캐시에 영향 없음)"""
+    return {
+        'predicted_numbers': list(prediction['predicted_numbers']),
+        'number_scores': [dict(score) for score in prediction['number_scores']],
+        'element_weights': dict(prediction['element_weights']),
+        'confidence': prediction['confidence']
+    }
+
+
+class HistoricalSnapshot:
+    """
+    최신 회차 기준 히스토리컬 분석 스냅샷 (불변)
+    새 회차가 저장되어 최신 회차 번호가 바뀔 때까지 재사용하며, 응답 JSON은 한 번만 직렬화합니다.
+    last_draw_no와 모든 내용은 같은 DB 세션의 NumberStatistics 행/회차 테이블에서 읽습니다.
+    """
+    
+    __slots__ = ('last_draw_no', 'number_index', 'stats', 'pattern_analysis', 'predictions', '_json_bytes')
+    
+    def __init__(self, last_draw_no: int, number_index: Dict, stats: Dict, pattern_analysis: Dict,
+                 predictions: Dict[Tuple[int, ...], Dict] = None):
+        self.last_draw_no = last_draw_no
+        self.number_index = number_index
+        self.stats = stats
+        self.pattern_analysis = pattern_analysis
+        # (빈도 기준, 오행 개수 벡터)별 predict_with_saju_weighting 결과 (공유 객체이므로 수정 금지)
+        self.predictions = predictions or {}
+        self._json_bytes = None
+    
+    def response_dict(self) -> Dict:
+        """/analysis/historical 응답 (HistoricalAnalysisResponse 형식)"""
+        return {
+            'total_draws': self.stats['total_draws'],
+            'draw_range': self.stats['draw_range'],
+            'top_numbers': self.pattern_analysis['top_numbers'],
+            'element_distribution': self.pattern_analysis['element_distribution'],
+            'last_5_draws': self.stats['latest_draws'],
+            'top_pairs': self.pattern_analysis['top_pairs'],
+            'top_triplets': self.pattern_analysis['top_triplets'],
+            'decay_half_life': self.number_index['decay_half_life'],
+            'hot_numbers': self.pattern_analysis['hot_numbers'][:TOP_COOCCURRENCE_COUNT],
+            'cold_numbers': self.pattern_analysis['cold_numbers']
+        }
+    
+    def json_bytes(self) -> bytes:
+        """미리 직렬화된 응답 JSON (FastAPI JSONResponse와 같은 형식)"""
+        if self._json_bytes is None:
+            self._json_bytes = json.dumps(
+                self.response_dict(), ensure_ascii=False, allow_nan=False,
+                indent=None, separators=(",", ":")
+            ).encode("utf-8")
+        return self._json_bytes
+
 
 class PredictionService:
     """로또 예측 서비스 클래스"""
     
     def __init__(self):
         self.oheang_ranges = {
-            '목': {'range': (1, 9), 'weight': 1.0},
-            '화': {'range': (10, 19), 'weight': 1.0},
-            '토': {'range': (20, 29), 'weight': 1.0},
-            '금': {'range': (30, 39), 'weight': 1.0},
-            '수': {'range': (40, 45), 'weight': 1.0}
+            element: {'range': number_range, 'weight': 1.0}
+            for element, number_range in NUMBER_OHEANG_RANGES.items()
         }
         # YouTube 학습 지식 향상 시스템 초기화
         try:
@@ -33,61 +121,285 @@ class PredictionService:
             print(f"[WARNING] 지식 향상 시스템 초기화 실패: {e}")
             self.knowledge_enhancer = None
             self.use_knowledge_enhancement = False
+        
+        # 히스토리컬 분석 스냅샷 (최신 회차 번호로 무효화, 새 회차 저장 시 백그라운드에서 재계산)
+        self._historical_snapshot = None
+        self._historical_lock = threading.Lock()
+        self._historical_thread = None
     
-    def load_historical_data(self) -> Tuple[List[LottoDraw], Dict]:
-        """데이터베이스에서 로또 데이터 로드 및 기본 분석"""
+    def load_historical_data(self) -> Tuple[Dict, Dict]:
+        """
+        번호 빈도 색인과 기본 통계 로드
+        전체 회차를 읽지 않고 crud가 회차 저장 시 갱신하는 누적 색인을 사용합니다.
+        """
         db = SessionLocal()
         try:
-            lotto_draws = db.query(LottoDraw).order_by(LottoDraw.draw_no.asc()).all()
+            statistics = crud.get_number_statistics(db)
             
-            if not lotto_draws:
+            if not statistics.total_draws:
                 raise ValueError("데이터베이스에 로또 데이터가 없습니다.")
             
-            # 기본 통계 생성
+            triplet_keys, triplet_counts = crud.get_number_triplets(db)
+            number_index = {
+                'frequency': np.asarray(statistics.frequency, dtype=np.int64),
+                'cooccurrence': crud.get_number_cooccurrence(db),
+                'triplet_keys': triplet_keys,
+                'triplet_counts': triplet_counts,
+                'decayed_frequency': np.asarray(statistics.decayed_frequency, dtype=np.float64),
+                'decay_half_life': statistics.decay_half_life,
+                'total_draws': statistics.total_draws
+            }
+            
+            # 기본 통계 생성 (최근 회차도 같은 세션에서 조회하여 색인과 회차가 어긋나지 않게 함)
+            latest_draws = db.query(models.LottoDraw).filter(
+                models.LottoDraw.draw_no <= statistics.last_draw_no
+            ).order_by(models.LottoDraw.draw_no.desc()).limit(5).all()
             stats = {
-                'total_draws': len(lotto_draws),
-                'draw_range': f"{lotto_draws[0].draw_no}회 ~ {lotto_draws[-1].draw_no}회",
-                'latest_draws': lotto_draws[-5:] if len(lotto_draws) >= 5 else lotto_draws
+                'total_draws': statistics.total_draws,
+                'last_draw_no': statistics.last_draw_no,
+                'draw_range': f"{statistics.first_draw_no}회 ~ {statistics.last_draw_no}회",
+                'latest_draws': [
+                    {
+                        'draw_no': draw.draw_no,
+                        'numbers': [draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6],
+                        'bonus': draw.bonus,
+                        'draw_date': draw.draw_date.date().isoformat() if draw.draw_date else None
+                    }
+                    for draw in reversed(latest_draws)
+                ]
             }
             
-            return lotto_draws, stats
+            return number_index, stats
             
         finally:
             db.close()
     
-    def analyze_number_patterns(self, lotto_draws: List[LottoDraw]) -> Dict:
-        """번호 패턴 분석"""
-        if not lotto_draws:
-            return {}
+    def invalidate_historical_snapshot(self):
+        """
+        색인 내용이 회차 번호와 무관하게 바뀐 뒤(감쇠 반감기 변경, 색인 재계산) 호출
+        이전 스냅샷을 버리므로 다음 조회는 새 스냅샷이 계산될 때까지 기다립니다.
+        """
+        self._historical_snapshot = None
+    
+    def _build_historical_snapshot(self) -> HistoricalSnapshot:
+        """색인 조회, 패턴 분석, 오행 벡터별 예측(990건)까지 스냅샷 전체 계산 (잠금 안에서 호출)"""
+        number_index, stats = self.load_historical_data()
+        pattern_analysis = self.analyze_number_patterns(number_index)
+        predictions = self.precompute_predictions(number_index, pattern_analysis)
+        snapshot = HistoricalSnapshot(stats['last_draw_no'], number_index, stats, pattern_analysis, predictions)
+        self._historical_snapshot = snapshot
+        print(f"[PREDICTION] 히스토리컬 스냅샷 계산 완료 (회차 {snapshot.last_draw_no})")
+        return snapshot
+    
+    def _refresh_historical_snapshot(self):
+        """백그라운드 스레드 진입점 (실패해도 이전 스냅샷 유지)"""
+        try:
+            with self._historical_lock:
+                self._build_historical_snapshot()
+        except Exception as e:
+            print(f"[PREDICTION] 히스토리컬 스냅샷 재계산 실패: {e}")
+    
+    def refresh_historical_snapshot_async(self) -> threading.Thread:
+        """
+        새 회차 저장 후 호출 - 백그라운드 스레드에서 스냅샷을 다시 계산
+        계산하는 동안 요청은 이전 스냅샷을 그대로 사용합니다. (이미 계산 중이면 그 스레드를 반환)
+        """
+        thread = self._historical_thread
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=self._refresh_historical_snapshot,
+                                      name='historical-snapshot', daemon=True)
+            self._historical_thread = thread
+            thread.start()
+        return thread
+    
+    def get_historical_snapshot(self) -> HistoricalSnapshot:
+        """
+        히스토리컬 분석 스냅샷 조회
+        스냅샷이 없을 때만 요청 경로에서 계산하고, 회차 저장소에 더 새 회차가 보이면
+        이전 스냅샷을 반환하면서 백그라운드 재계산을 시작합니다. (크롤러는 저장 직후 직접 시작)
+        """
+        snapshot = self._historical_snapshot
+        if snapshot is not None:
+            if (draw_store.get().last_draw_no or 0) > snapshot.last_draw_no:
+                self.refresh_historical_snapshot_async()
+            return snapshot
         
-        # 모든 번호 수집
-        all_numbers = []
-        for draw in lotto_draws:
-            all_numbers.extend([draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6])
+        with self._historical_lock:
+            snapshot = self._historical_snapshot
+            if snapshot is None:
+                snapshot = self._build_historical_snapshot()
+            return snapshot
+    
+    def analyze_number_patterns(self, number_index: Dict) -> Dict:
+        """번호 패턴 분석 (누적 빈도 색인 기반)"""
+        if not number_index:
+            return {}
         
-        # 번호별 출현 빈도
-        number_freq = {}
-        for num in range(1, 46):
-            number_freq[num] = all_numbers.count(num)
+        frequency = number_index['frequency']
+        total_numbers = int(frequency.sum())
         
-        # 가장 자주 나온 번호 top 15
-        top_numbers = sorted(number_freq.items(), key=lambda x: x[1], reverse=True)[:15]
+        # 가장 자주 나온 번호 top 15 (빈도가 같으면 작은 번호 우선)
+        top_indices = np.argsort(-frequency, kind='stable')[:15]
         
         # 오행별 분석
         element_analysis = {}
         for element, info in self.oheang_ranges.items():
             start, end = info['range']
-            count = sum(1 for num in all_numbers if start <= num <= end)
+            count = int(frequency[start - 1:end].sum())
             element_analysis[element] = {
                 'range': f"{start}-{end}",
                 'count': count,
-                'percentage': (count / len(all_numbers)) * 100 if all_numbers else 0
+                'percentage': (count / total_numbers) * 100 if total_numbers else 0
             }
         
+        # 감쇠 점수 기준 hot/cold 번호 (점수가 같으면 작은 번호 우선)
+        decayed = number_index['decayed_frequency']
+        hot_order = np.argsort(-decayed, kind='stable')
+        hot_indices = hot_order[:15]
+        cold_indices = hot_order[::-1][:TOP_COOCCURRENCE_COUNT]
+        
+        # 가장 자주 함께 나온 번호 쌍/삼중
+        pair_rows, pair_cols = np.triu_indices(45, 1)
+        pair_counts = number_index['cooccurrence'][pair_rows, pair_cols]
+        top_pairs = np.argsort(-pair_counts, kind='stable')[:TOP_COOCCURRENCE_COUNT]
+        
+        triplet_counts = number_index['triplet_counts']
+        top_triplets = np.argsort(-triplet_counts, kind='stable')[:TOP_COOCCURRENCE_COUNT]
+        triplet_numbers = crud.decode_triplet_codes(number_index['triplet_keys'][top_triplets])
+        
         return {
-            'top_numbers': [{'number': num, 'frequency': freq} for num, freq in top_numbers],
+            'top_numbers': [{'number': int(index) + 1, 'frequency': int(frequency[index])}
+                            for index in top_indices],
             'element_distribution': element_analysis,
-            'total_numbers_analyzed': len(all_numbers)
+            'total_numbers_analyzed': total_numbers,
+            'top_pairs': [
+                {'numbers': [int(pair_rows[i]) + 1, int(pair_cols[i]) + 1], 'count': int(pair_counts[i])}
+                for i in top_pairs
+            ],
+            'top_triplets': [
+                {'numbers': numbers.tolist(), 'count': int(count)}
+                for numbers, count in zip(triplet_numbers, triplet_counts[top_triplets])
+            ],
+            'cooccurrence_features': self.cooccurrence_features(number_index, top_indices + 1),
+            # 최근 회차 중시 감쇠 점수 기준 상위(hot, 예측 후보 15개)/하위(cold) 번호
+            'hot_numbers': [
+                {'number': int(index) + 1, 'score': round(float(decayed[index]), 4), 'frequency': int(frequency[index])}
+                for index in hot_indices
+            ],
+            'cold_numbers': [
+                {'number': int(index) + 1, 'score': round(float(decayed[index]), 4), 'frequency': int(frequency[index])}
+                for index in cold_indices
+            ],
+            'hot_cooccurrence_features': self.cooccurrence_features(number_index, hot_indices + 1)
+        }
+    
+    def cooccurrence_features(self, number_index: Dict, numbers: np.ndarray) -> Dict[int, Dict[str, float]]:
+        """
+        후보 번호끼리의 동시 출현 특징 (번호별, 후보 중 최댓값 대비 0~1)
+        pair_affinity: 다른 후보와 함께 나온 횟수의 합
+        triplet_affinity: 다른 후보 두 개와 함께 나온 횟수의 합
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        indices = numbers - 1
+        
+        pair = number_index['cooccurrence'][np.ix_(indices, indices)].sum(axis=1).astype(np.float64)
+        
+        candidate = np.zeros(45, dtype=bool)
+        candidate[indices] = True
+        triples = crud.decode_triplet_codes(number_index['triplet_keys']) - 1
+        inside = candidate[triples].all(axis=1)
+        triplet = np.bincount(
+            triples[inside].ravel(), weights=np.repeat(number_index['triplet_counts'][inside], 3), minlength=45
+        )[indices]
+        
+        pair /= max(pair.max(), 1.0) if len(pair) else 1.0
+        triplet /= max(triplet.max(), 1.0) if len(triplet) else 1.0
+        return {
+            int(number): {'pair_affinity': float(p), 'triplet_affinity': float(t)}
+            for number, p, t in zip(numbers, pair, triplet)
+        }
+    
+    def _candidates(self, pattern_analysis: Dict, frequency_mode: str) -> tuple:
+        """빈도 기준별 예측 후보 (번호, 출현 빈도) 목록과 후보 동시 출현 특징"""
+        if frequency_mode == 'decayed':
+            return ([(item['number'], item['frequency']) for item in pattern_analysis['hot_numbers']],
+                    pattern_analysis['hot_cooccurrence_features'])
+        return ([(item['number'], item['frequency']) for item in pattern_analysis['top_numbers']],
+                pattern_analysis['cooccurrence_features'])
+    
+    def precompute_predictions(self, number_index: Dict, pattern_analysis: Dict) -> Dict[Tuple, Dict]:
+        """
+        빈도 기준별로 모든 오행 개수 벡터(495개)의 사주 가중 예측을 미리 계산
+        예측은 오행 분포와 빈도 색인에만 의존하므로 새 회차가 들어올 때 한 번만 계산합니다.
+        """
+        predictions = {}
+        for frequency_mode in FREQUENCY_MODES:
+            top_numbers, features = self._candidates(pattern_analysis, frequency_mode)
+            decayed_scores = number_index['decayed_frequency'] if frequency_mode == 'decayed' else None
+            for vector in oheang_vectors():
+                predictions[frequency_mode, vector] = self.predict_with_saju_weighting(
+                    top_numbers, dict(zip(OHEANG, vector)), features, decayed_scores
+                )
+        return predictions
+    
+    def predict_for_oheang(self, historical: HistoricalSnapshot, saju_oheang: Dict[str, float],
+                           frequency_mode: str = 'raw') -> Dict:
+        """사주 가중 예측 (미리 계산된 결과 조회, 캐시 범위 밖의 오행 분포는 직접 계산)"""
+        if frequency_mode not in FREQUENCY_MODES:
+            raise ValueError(f"frequency_mode는 {', '.join(FREQUENCY_MODES)} 중 하나여야 합니다.")
+        
+        key = oheang_key(saju_oheang)
+        if key is not None and (frequency_mode, key) in historical.predictions:
+            return copy_prediction(historical.predictions[frequency_mode, key])
+        
+        top_numbers, features = self._candidates(historical.pattern_analysis, frequency_mode)
+        decayed_scores = historical.number_index['decayed_frequency'] if frequency_mode == 'decayed' else None
+        return self.predict_with_saju_weighting(top_numbers, saju_oheang, features, decayed_scores)
+    
+    def apply_element_adjustments(self, prediction: Dict, adjusted_oheang: Dict[str, float]) -> Dict:
+        """
+        원국 오행으로 조회한 예측에 지식 조정 후 오행 분포의 가중치를 적용한 새 결과
+        상위 번호 점수를 (조정 가중치 / 원국 가중치) 비율로 다시 매기고 그 안에서 번호를 다시 고릅니다.
+        """
+        base_weights = prediction['element_weights']
+        element_weights = self.calculate_saju_weights(adjusted_oheang)
+        
+        number_scores = []
+        for score_info in prediction['number_scores']:
+            element = score_info['element']
+            weight = element_weights.get(element, 1.0)
+            score_info = dict(score_info)
+            score_info['score'] = score_info['score'] * weight / base_weights.get(element, 1.0)
+            score_info['weight'] = weight
+            number_scores.append(score_info)
+        
+        # 점수 순 정렬 (같은 점수는 기존 순서 유지)
+        number_scores.sort(key=lambda score_info: -score_info['score'])
+        max_score = number_scores[0]['score'] if number_scores else 0.0
+        for score_info in number_scores:
+            compatibility = min(100, (score_info['score'] / max_score * 100)) if max_score > 0 else 50
+            score_info['compatibility'] = round(compatibility, 1)
+            score_info['saju_explanation'] = self._generate_saju_explanation(
+                score_info['number'], score_info['element'], adjusted_oheang, score_info['weight']
+            )
+        
+        # 상위 7개 번호 재선택 (모자라면 기존 예측 번호로 채움)
+        predicted_numbers = []
+        for num in [score_info['number'] for score_info in number_scores] + prediction['predicted_numbers']:
+            if num not in predicted_numbers and 1 <= num <= 45:
+                predicted_numbers.append(num)
+                if len(predicted_numbers) == 7:
+                    break
+        predicted_numbers.sort()
+        
+        top_scores = [score_info['score'] for score_info in number_scores[:7]]
+        confidence = sum(top_scores) / len(top_scores) / max_score if max_score > 0 else 0.5
+        
+        return {
+            'predicted_numbers': predicted_numbers,
+            'number_scores': number_scores,
+            'element_weights': element_weights,
+            'confidence': min(confidence, 1.0)
         }
     
     def calculate_saju_weights(self, saju_oheang: Dict[str, int]) -> Dict[str, float]:
@@ -107,48 +419,56 @@ class PredictionService:
     
     def predict_with_saju_weighting(self, 
                                   top_numbers: List[Tuple[int, int]], 
-                                  saju_oheang: Dict[str, int]) -> Dict:
-        """사주 기반 가중치 예측"""
+                                  saju_oheang: Dict[str, int],
+                                  cooccurrence_features: Optional[Dict[int, Dict[str, float]]] = None,
+                                  decayed_scores: Optional[np.ndarray] = None,
+                                  score_count: int = 15) -> Dict:
+        """
+        사주 기반 가중치 예측
+        점수 = 출현 빈도 x 오행 가중치[번호의 오행]를 후보 전체에 대해 한 번에 계산합니다.
+        cooccurrence_features가 주어지면 후보 번호끼리의 쌍/삼중 동시 출현 특징을 점수에 반영합니다.
+        decayed_scores(번호 1~45의 감쇠 점수)가 주어지면 누적 빈도 대신 감쇠 점수를 기본 점수로 사용합니다.
+        사주 풀이는 반환하는 상위 score_count개 번호에 대해서만 생성합니다.
+        """
         
-        # 사주 가중치 계산
+        # 사주 가중치 계산 (OHEANG 순서 벡터, 마지막 칸은 범위 밖 번호용 1.0)
         element_weights = self.calculate_saju_weights(saju_oheang)
+        weight_vector = np.array([element_weights.get(element, 1.0) for element in OHEANG] + [1.0])
         
-        # 번호별 점수 계산
-        number_scores = []
-        max_score = 0
+        candidates = np.array(top_numbers, dtype=np.float64).reshape(-1, 2)
+        numbers = candidates[:, 0].astype(np.int64)
+        frequencies = [freq for _, freq in top_numbers]
+        lookup = numbers - 1
+        valid = (lookup >= 0) & (lookup < 45)
+        lookup[~valid] = 0
+        element_index = NUMBER_OHEANG_INDEX[lookup].astype(np.int64)
+        element_index[~valid] = len(OHEANG)
         
-        for num, freq in top_numbers:
-            base_score = freq  # 기본 점수는 출현 빈도
-            element = self._get_number_element(num)
-            weight = element_weights.get(element, 1.0)
-            weighted_score = base_score * weight
-            max_score = max(max_score, weighted_score)
-            
-            number_scores.append({
-                'number': num,
-                'score': weighted_score,
-                'element': element,
-                'frequency': freq,
-                'weight': weight
-            })
+        # 기본 점수는 출현 빈도 (또는 감쇠 점수)
+        if decayed_scores is not None:
+            base_scores = np.asarray(decayed_scores, dtype=np.float64)[lookup] * valid
+        else:
+            base_scores = candidates[:, 1]
+        weights = weight_vector[element_index]
+        scores = base_scores * weights
         
-        # 적합도 계산 및 사주 풀이 추가
-        for score_info in number_scores:
-            compatibility = min(100, (score_info['score'] / max_score * 100)) if max_score > 0 else 50
-            score_info['compatibility'] = round(compatibility, 1)
-            score_info['saju_explanation'] = self._generate_saju_explanation(
-                score_info['number'], score_info['element'], saju_oheang, score_info['weight']
-            )
+        if cooccurrence_features:
+            for i, num in enumerate(numbers.tolist()):
+                features = cooccurrence_features.get(num)
+                if features:
+                    scores[i] *= (1.0 + PAIR_FEATURE_WEIGHT * features['pair_affinity']
+                                  + TRIPLET_FEATURE_WEIGHT * features['triplet_affinity'])
+        
+        max_score = float(scores.max()) if len(scores) else 0.0
         
-        # 점수 순으로 정렬
-        number_scores.sort(key=lambda x: x['score'], reverse=True)
+        # 점수 순 정렬 (같은 점수는 후보 순서 유지)
+        order = np.argsort(-scores, kind='stable')
         
         # 상위 7개 번호 선택 (중복 제거)
         predicted_numbers = []
         used_numbers = set()
         
-        for score_info in number_scores:
-            num = score_info['number']
+        for num in numbers[order].tolist():
             if num not in used_numbers and 1 <= num <= 45:
                 predicted_numbers.append(num)
                 used_numbers.add(num)
@@ -156,85 +476,78 @@ class PredictionService:
                     break
         
         # 7개가 안되면 추가 번호 선택
-        while len(predicted_numbers) < 7:
-            for num in range(1, 46):
-                if num not in used_numbers:
-                    predicted_numbers.append(num)
-                    used_numbers.add(num)
-                    if len(predicted_numbers) == 7:
-                        break
+        for num in range(1, 46):
+            if len(predicted_numbers) == 7:
+                break
+            if num not in used_numbers:
+                predicted_numbers.append(num)
+                used_numbers.add(num)
         
         predicted_numbers.sort()
         
+        # 반환할 상위 번호만 점수 정보와 사주 풀이 생성
+        element_names = OHEANG + ['기타']
+        returned = order[:score_count]
+        number_scores = []
+        for i, num, score, element, weight in zip(
+                returned.tolist(), numbers[returned].tolist(), scores[returned].tolist(),
+                element_index[returned].tolist(), weights[returned].tolist()):
+            element = element_names[element]
+            compatibility = min(100, (score / max_score * 100)) if max_score > 0 else 50
+            
+            score_info = {
+                'number': num,
+                'score': score,
+                'element': element,
+                'frequency': frequencies[i],
+                'weight': weight
+            }
+            if cooccurrence_features and num in cooccurrence_features:
+                score_info.update(cooccurrence_features[num])
+            score_info['compatibility'] = round(compatibility, 1)
+            score_info['saju_explanation'] = self._generate_saju_explanation(
+                num, element, saju_oheang, weight
+            )
+            number_scores.append(score_info)
+        
         # 신뢰도 계산 (상위 7개 번호의 평균 점수 기준)
-        top_7_scores = [score['score'] for score in number_scores[:7]]
-        confidence = np.mean(top_7_scores) / max_score if max_score > 0 else 0.5
+        confidence = float(scores[order[:7]].sum()) / len(order[:7]) / max_score if max_score > 0 else 0.5
         
         return {
             'predicted_numbers': predicted_numbers,
-            'number_scores': number_scores[:15],  # 상위 15개만 반환
+            'number_scores': number_scores,
             'element_weights': element_weights,
             'confidence': min(confidence, 1.0)
         }
     
     def _get_number_element(self, number: int) -> str:
         """번호에 해당하는 오행 요소 반환"""
-        for element, info in self.oheang_ranges.items():
-            start, end = info['range']
-            if start <= number <= end:
-                return element
+        if 1 <= number <= 45:
+            return OHEANG[NUMBER_OHEANG_INDEX[number - 1]]
         return '기타'
     
     def get_saju_analysis(self, birth_year: int, birth_month: int, 
-                         birth_day: int, birth_hour: int) -> Dict:
-        """사주 분석 수행"""
-        try:
-            saju_result = analyze_saju(birth_year, birth_month, birth_day, birth_hour)
-            
-            # oheang 데이터 추출 및 검증
-            if isinstance(saju_result, dict) and 'oheang' in saju_result:
-                oheang_data = saju_result['oheang']
-                if isinstance(oheang_data, dict):
-                    # 모든 오행 요소가 있는지 확인하고 없으면 0으로 초기화
-                    complete_oheang = {}
-                    for element in ['목', '화', '토', '금', '수']:
-                        complete_oheang[element] = oheang_data.get(element, 0)
-                    
-                    return {
-                        'oheang': complete_oheang,
-                        'raw_result': saju_result
-                    }
-            
-            # 기본값 반환
-            return {
-                'oheang': {'목': 1, '화': 1, '토': 1, '금': 1, '수': 1},
-                'raw_result': saju_result,
-                'warning': '사주 분석 결과를 파싱할 수 없어 기본값을 사용합니다.'
-            }
-            
-        except Exception as e:
-            # 에러 발생시 기본값 반환
-            return {
-                'oheang': {'목': 1, '화': 1, '토': 1, '금': 1, '수': 1},
-                'raw_result': {},
-                'error': f'사주 분석 중 오류 발생: {str(e)}'
-            }
+                         birth_day: int, birth_hour: int) -> SajuResult:
+        """사주 분석 수행 (캐시된 기둥을 참조하는 불변 SajuResult 반환)"""
+        return analyze_saju_result(birth_year, birth_month, birth_day, birth_hour)
     
     def generate_prediction(self, birth_year: int, birth_month: int, 
                           birth_day: int, birth_hour: int, 
-                          name: Optional[str] = None) -> Dict:
-        """종합 예측 생성 (YouTube 학습 지식 통합)"""
+                          name: Optional[str] = None, frequency_mode: str = 'raw') -> Dict:
+        """
+        종합 예측 생성 (YouTube 학습 지식 통합)
+        frequency_mode: 'raw'(전체 누적 빈도) 또는 'decayed'(최근 회차 중시 감쇠 점수)
+        """
         try:
-            # 1. 히스토리컬 데이터 로드
-            lotto_draws, stats = self.load_historical_data()
-            
-            # 2. 패턴 분석
-            pattern_analysis = self.analyze_number_patterns(lotto_draws)
+            # 1. 히스토리컬 데이터 로드 및 패턴 분석 (최신 회차 기준 스냅샷 재사용)
+            historical = self.get_historical_snapshot()
+            stats = historical.stats
+            pattern_analysis = historical.pattern_analysis
             
-            # 3. 기본 사주 분석
+            # 2. 기본 사주 분석
             saju_analysis = self.get_saju_analysis(birth_year, birth_month, birth_day, birth_hour)
             
-            # 4. YouTube 학습 지식 적용 (가능한 경우)
+            # 3. YouTube 학습 지식 적용 (가능한 경우)
             knowledge_insights = None
             enhanced_saju_analysis = saju_analysis
             
@@ -242,7 +555,7 @@ class PredictionService:
                 try:
                     # 학습된 사주 지식 추출
                     knowledge_insights = self.knowledge_enhancer.get_learned_saju_insights(
-                        birth_year, birth_month, birth_day
+                        birth_year, birth_month, birth_day, birth_hour
                     )
                     
                     # 사주 분석에 지식 적용
@@ -255,15 +568,16 @@ class PredictionService:
                 except Exception as e:
                     print(f"[WARNING] 지식 향상 적용 실패: {e}")
             
-            # 5. 예측 수행 (향상된 사주 분석 사용)
-            top_numbers = [(item['number'], item['frequency']) 
-                          for item in pattern_analysis['top_numbers']]
-            
-            prediction_result = self.predict_with_saju_weighting(
-                top_numbers, enhanced_saju_analysis['oheang']
+            # 4. 예측 수행 (원국 오행 개수로 사전 계산된 예측을 조회한 뒤 지식 조정값 반영)
+            prediction_result = self.predict_for_oheang(
+                historical, saju_analysis.oheang_dict(), frequency_mode
             )
+            if enhanced_saju_analysis.adjustments:
+                prediction_result = self.apply_element_adjustments(
+                    prediction_result, enhanced_saju_analysis.weighted_oheang()
+                )
             
-            # 6. 지식 향상 정보를 결과에 추가
+            # 5. 지식 향상 정보를 결과에 추가
             result = {
                 'predicted_numbers': prediction_result['predicted_numbers'],
                 'saju_analysis': enhanced_saju_analysis,
@@ -4,6 +4,8 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
 from sklearn.preprocessing import MinMaxScaler
 
+from saju import NUMBER_OHEANG_INDEX
+
 # 로또 번호 데이터 (예시)
 # 실제로는 DB에서 가져오거나 크롤링한 데이터를 사용합니다.
 # 여기서는 간단한 예시를 위해 가상의 데이터를 사용합니다.
@@ -52,39 +54,25 @@ def build_and_train_model(data, seq_length=5, epochs=50, batch_size=1):
 
     return model, scaler
 
+# 오행별 기본 가중치 (OHEANG 순서: 목, 화, 토, 금, 수)
+OHEANG_WEIGHT_VECTOR = np.array([1.2, 1.2, 1.1, 1.2, 1.1])
+
 def apply_saju_weights(predicted_numbers, saju_oheang_distribution):
     """
     사주 오행 분포에 따라 예측된 로또 번호에 가중치를 적용합니다.
     """
-    # 오행별 번호 범위 및 기본 가중치
-    OHEANG_WEIGHTS = {
-        '목': {'range': (1, 9), 'weight': 1.2},
-        '화': {'range': (10, 19), 'weight': 1.2},
-        '토': {'range': (20, 29), 'weight': 1.1},
-        '금': {'range': (30, 39), 'weight': 1.2},
-        '수': {'range': (40, 45), 'weight': 1.1}
-    }
-
-    weighted_numbers = []
-    for num in predicted_numbers:
-        current_weight = 1.0
-        for oheang, info in OHEANG_WEIGHTS.items():
-            start, end = info['range']
-            if start <= num <= end:
-                # 사주 오행 분포에 따라 가중치 조정
-                # 예를 들어, 사주에 '목' 기운이 강하면 '목'에 해당하는 번호에 더 큰 가중치를 부여
-                # 여기서는 간단히 해당 오행의 기본 가중치를 곱합니다.
-                # 실제로는 사주 오행 분포의 비율을 반영하여 더 복잡한 가중치 계산이 필요합니다.
-                current_weight *= info['weight']
-                break
-        weighted_numbers.append((num, current_weight))
-
-    # 가중치에 따라 번호 재정렬 (높은 가중치 우선)
-    weighted_numbers.sort(key=lambda x: x[1], reverse=True)
+    # 번호별 오행 기본 가중치 (1~45 범위 밖 번호는 1.0)
+    # 실제로는 사주 오행 분포의 비율을 반영하여 더 복잡한 가중치 계산이 필요합니다.
+    numbers = np.asarray(predicted_numbers, dtype=np.int64)
+    valid = (numbers >= 1) & (numbers <= 45)
+    weights = np.where(valid, OHEANG_WEIGHT_VECTOR[NUMBER_OHEANG_INDEX[np.where(valid, numbers, 1) - 1]], 1.0)
+
+    # 가중치에 따라 번호 재정렬 (높은 가중치 우선, 같은 가중치는 원래 순서)
+    order = np.argsort(-weights, kind='stable')
 
     # 가중치 적용 후 상위 6개 번호 선택 (중복 제거)
     final_numbers = []
-    for num, _ in weighted_numbers:
+    for num in numbers[order].tolist():
         if num not in final_numbers:
             final_numbers.append(num)
         if len(final_numbers) == 6:
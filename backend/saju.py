@@ -1,10 +1,15 @@
 """
 한국 전통 사주학 분석 모듈
-korean-lunar-calendar 라이브러리를 사용하여 정확한 음력 계산 구현
+korean-lunar-calendar 라이브러리로 미리 생성한 만세력 테이블(manseryeok.py)을 사용하여 음력 계산
 """
 
-from korean_lunar_calendar import KoreanLunarCalendar
 import datetime
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import manseryeok
+import solar_terms
 
 # 천간(天干) - 10개
 GAN = ['갑', '을', '병', '정', '무', '기', '경', '신', '임', '계']
@@ -12,6 +17,11 @@ GAN = ['갑', '을', '병', '정', '무', '기', '경', '신', '임', '계']
 # 지지(地支) - 12개  
 JI = ['자', '축', '인', '묘', '진', '사', '오', '미', '신', '유', '술', '해']
 
+# 천간/지지 한자 및 음양
+GAN_HANJA = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
+JI_HANJA = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
+YINYANG = ['양', '음']  # 짝수 인덱스 양, 홀수 인덱스 음
+
 # 천간의 오행 분류
 GAN_OHEANG = {
     '갑': '목', '을': '목',  # 갑을목
@@ -30,6 +40,32 @@ JI_OHEANG = {
     '신': '금', '유': '금'   # 신유금
 }
 
+# 사주 분석 캐시 최대 항목 수
+SAJU_CACHE_SIZE = 20000
+
+# 오행 순서 (배치 분석의 오행 행렬 열 순서)
+OHEANG = ['목', '화', '토', '금', '수']
+
+# 천간/지지 인덱스 -> 오행 인덱스 조회 배열 (배치 분석용)
+GAN_OHEANG_INDEX = np.array([OHEANG.index(GAN_OHEANG[gan]) for gan in GAN], dtype=np.int8)
+JI_OHEANG_INDEX = np.array([OHEANG.index(JI_OHEANG[ji]) for ji in JI], dtype=np.int8)
+
+# 로또 번호의 오행 구간 (번호 범위, 양 끝 포함)
+NUMBER_OHEANG_RANGES = {
+    '목': (1, 9),
+    '화': (10, 19),
+    '토': (20, 29),
+    '금': (30, 39),
+    '수': (40, 45)
+}
+
+# 로또 번호 -> 오행 인덱스 조회 배열 (번호 n -> NUMBER_OHEANG_INDEX[n - 1], 읽기 전용)
+NUMBER_OHEANG_INDEX = np.repeat(
+    np.arange(len(OHEANG), dtype=np.int8),
+    [NUMBER_OHEANG_RANGES[element][1] - NUMBER_OHEANG_RANGES[element][0] + 1 for element in OHEANG]
+)
+NUMBER_OHEANG_INDEX.flags.writeable = False
+
 def get_ganzhi(year: int) -> tuple:
     """
     년도에 해당하는 간지(干支) 계산
@@ -43,113 +79,511 @@ def get_ganzhi(year: int) -> tuple:
     
     return (GAN[gan_index], JI[ji_index])
 
-def analyze_saju(year: int, month: int, day: int, hour: int) -> dict:
+def hour_slot(hour: int) -> int:
     """
-    사주 분석 메인 함수
-    생년월일시를 입력받아 사주팔자 분석 결과 반환
+    시간을 시진(時辰) 슬롯으로 정규화 (0~12)
+    자시는 0시(슬롯 0)와 23시(슬롯 12)를 구분하여 같은 날짜의 서로 다른 시각이 섞이지 않도록 함
     """
-    try:
-        # KoreanLunarCalendar 객체 생성
-        calendar = KoreanLunarCalendar()
-        
-        # 양력을 음력으로 변환
-        calendar.setSolarDate(year, month, day)
-        lunar_year = calendar.lunarYear
-        lunar_month = calendar.lunarMonth
-        lunar_day = calendar.lunarDay
-        
-        # 사주팔자 계산
-        # 년주 (年柱)
-        year_gan, year_ji = get_ganzhi(lunar_year)
-        
-        # 월주 (月柱) - 간단한 계산법 적용
-        # 실제로는 절입(節入) 계산이 필요하지만 여기서는 단순화
-        month_gan_index = ((lunar_year - 1984) * 12 + lunar_month - 1) % 10
-        month_ji_index = (lunar_month - 1) % 12
-        month_gan = GAN[month_gan_index]
-        month_ji = JI[month_ji_index]
-        
-        # 일주 (日柱) - 간단한 계산법
-        # 실제로는 정확한 일진 계산이 필요
-        base_date = datetime.date(1984, 2, 2)  # 갑자일
-        target_date = datetime.date(year, month, day)
-        day_diff = (target_date - base_date).days
-        
-        day_gan_index = day_diff % 10
-        day_ji_index = day_diff % 12
-        day_gan = GAN[day_gan_index]
-        day_ji = JI[day_ji_index]
-        
-        # 시주 (時柱) - 시간별 지지 계산
-        hour_ji_index = ((hour + 1) // 2) % 12
-        hour_ji = JI[hour_ji_index]
-        
-        # 시간의 천간은 일간에 따라 결정 (갑을기경표)
-        hour_gan_base = {
-            '갑': 0, '기': 0,  # 갑기일
-            '을': 2, '경': 2,  # 을경일  
-            '병': 4, '신': 4,  # 병신일
-            '정': 6, '임': 6,  # 정임일
-            '무': 8, '계': 8   # 무계일
+    return (hour + 1) // 2
+
+class Pillar:
+    """간지 한 기둥 (천간/지지의 한자, 음양, 오행 포함)"""
+    
+    __slots__ = ('gan_index', 'ji_index', 'gan', 'ji', 'gan_hanja', 'ji_hanja',
+                 'gan_yinyang', 'ji_yinyang', 'gan_element', 'ji_element')
+    
+    def __init__(self, gan_index: int, ji_index: int):
+        self.gan_index = gan_index
+        self.ji_index = ji_index
+        self.gan = GAN[gan_index]
+        self.ji = JI[ji_index]
+        self.gan_hanja = GAN_HANJA[gan_index]
+        self.ji_hanja = JI_HANJA[ji_index]
+        self.gan_yinyang = YINYANG[gan_index % 2]
+        self.ji_yinyang = YINYANG[ji_index % 2]
+        self.gan_element = GAN_OHEANG[self.gan]
+        self.ji_element = JI_OHEANG[self.ji]
+    
+    def as_tuple(self) -> tuple:
+        """(천간, 지지) 튜플"""
+        return (self.gan, self.ji)
+    
+    def to_dict(self) -> dict:
+        """상세 정보 딕셔너리 (SajuMasterAI 응답 형식)"""
+        return {
+            "gan": self.gan,
+            "gan_hanja": self.gan_hanja,
+            "ji": self.ji,
+            "ji_hanja": self.ji_hanja,
+            "gan_yinyang": self.gan_yinyang,
+            "ji_yinyang": self.ji_yinyang,
+            "gan_element": self.gan_element,
+            "ji_element": self.ji_element
         }
-        
-        hour_gan_start = hour_gan_base.get(day_gan, 0)
-        hour_gan_index = (hour_gan_start + hour_ji_index) % 10
-        hour_gan = GAN[hour_gan_index]
-        
-        # 사주팔자 구성
-        saju = {
-            'year': (year_gan, year_ji),
-            'month': (month_gan, month_ji), 
-            'day': (day_gan, day_ji),
-            'hour': (hour_gan, hour_ji)
+
+# 천간 x 지지 기둥 조견표 - 모든 기둥 객체를 미리 생성해 두고 참조만 함
+PILLAR_TABLE = [[Pillar(gan_index, ji_index) for ji_index in range(12)] for gan_index in range(10)]
+
+class Pillars:
+    """사주팔자 (년/월/일/시 네 기둥과 오행 분포, 음력 날짜)"""
+    
+    __slots__ = ('year', 'month', 'day', 'hour', 'oheang', 'lunar_year', 'lunar_month', 'lunar_day')
+    
+    def __init__(self, year: Pillar, month: Pillar, day: Pillar, hour: Pillar,
+                 oheang: np.ndarray, lunar_year: int, lunar_month: int, lunar_day: int):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.hour = hour
+        self.oheang = oheang  # OHEANG 순서의 오행 개수 (읽기 전용 int8 배열)
+        self.lunar_year = lunar_year
+        self.lunar_month = lunar_month
+        self.lunar_day = lunar_day
+    
+    def saju_dict(self) -> dict:
+        """analyze_saju 형식의 사주팔자 딕셔너리 (천간, 지지 튜플)"""
+        return {
+            'year': self.year.as_tuple(),
+            'month': self.month.as_tuple(),
+            'day': self.day.as_tuple(),
+            'hour': self.hour.as_tuple()
+        }
+    
+    def oheang_dict(self) -> dict:
+        """오행 분포 딕셔너리"""
+        return dict(zip(OHEANG, self.oheang.tolist()))
+    
+    def lunar_dict(self) -> dict:
+        """음력 날짜 딕셔너리"""
+        return {'year': self.lunar_year, 'month': self.lunar_month, 'day': self.lunar_day}
+    
+    def to_dict(self) -> dict:
+        """기둥별 상세 정보 딕셔너리 (한자, 음양, 오행 포함)"""
+        return {
+            'year': self.year.to_dict(),
+            'month': self.month.to_dict(),
+            'day': self.day.to_dict(),
+            'hour': self.hour.to_dict()
         }
+
+def _year_pillar_indices(year: int) -> tuple:
+    """간지 연도의 (천간 인덱스, 지지 인덱스) - 갑자년(1984) 기준"""
+    return ((year - 1984) % 10, (year - 1984) % 12)
+
+def _compute_pillars(year: int, month: int, day: int, hour: int, minute: int = 0) -> Pillars:
+    """
+    사주팔자 계산 (정규 기둥 엔진, 한 번의 계산으로 모든 정보 생성)
+    년주는 입춘, 월주는 절입(節入) 시각 기준으로 실제 출생 시/분에서 판단합니다.
+    """
+    # 만세력 테이블에서 음력 날짜와 일주 조회 (O(1))
+    day_info = manseryeok.lookup(year, month, day)
+    
+    # 년주 (年柱) - 입춘 기준 (음력 설 기준인 만세력 년간/년지는 사용하지 않음)
+    year_gan, year_ji = _year_pillar_indices(solar_terms.saju_year(year, month, day, hour, minute))
+    
+    # 월주 (月柱) - 절입 시각 기준, 일자별 절기 표 조회
+    month_gan, month_ji = solar_terms.month_pillar(year, month, day, hour, minute)
+    
+    # 시주 (時柱) - 시진별 지지, 천간은 일간에 따라 결정 (갑을기경표: 갑기일=갑, 을경일=병 ...)
+    hour_ji = hour_slot(hour) % 12
+    hour_gan = ((day_info.day_gan % 5) * 2 + hour_ji) % 10
+    
+    gan_indices = (year_gan, month_gan, day_info.day_gan, hour_gan)
+    ji_indices = (year_ji, month_ji, day_info.day_ji, hour_ji)
+    
+    # 오행 분포 계산 (캐시에서 공유되므로 읽기 전용으로 고정)
+    oheang = np.zeros(5, dtype=np.int8)
+    for gan_index in gan_indices:
+        oheang[GAN_OHEANG_INDEX[gan_index]] += 1
+    for ji_index in ji_indices:
+        oheang[JI_OHEANG_INDEX[ji_index]] += 1
+    oheang.flags.writeable = False
+    
+    return Pillars(
+        PILLAR_TABLE[year_gan][year_ji],
+        PILLAR_TABLE[month_gan][month_ji],
+        PILLAR_TABLE[day_info.day_gan][day_info.day_ji],
+        PILLAR_TABLE[hour_gan][hour_ji],
+        oheang,
+        day_info.lunar_year, day_info.lunar_month, day_info.lunar_day
+    )
+
+class SajuCache:
+    """
+    (년, 월, 일, 시, 분) 기준 사주팔자(Pillars) LRU 캐시
+    (같은 시진이라도 절입/입춘 시각 전후로 년주/월주가 달라질 수 있으므로 실제 시각을 키로 사용)
+    analysis_date를 제외한 불변 결과만 보관하며, 프로세스 내 모든 서비스가 공유합니다.
+    """
+    
+    def __init__(self, maxsize: int = SAJU_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, year: int, month: int, day: int, hour: int, minute: int = 0) -> Pillars:
+        """캐시 조회, 없으면 계산 후 저장"""
+        key = (year, month, day, hour, minute)
         
-        # 오행 분포 계산
-        oheang_count = {'목': 0, '화': 0, '토': 0, '금': 0, '수': 0}
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
         
-        # 각 간지의 오행을 계산
-        all_gan = [year_gan, month_gan, day_gan, hour_gan]
-        all_ji = [year_ji, month_ji, day_ji, hour_ji]
+        # 계산은 잠금 밖에서 수행 (동시 요청이 같은 키를 계산해도 결과는 동일)
+        entry = _compute_pillars(*key)
         
-        for gan in all_gan:
-            if gan in GAN_OHEANG:
-                oheang_count[GAN_OHEANG[gan]] += 1
-                
-        for ji in all_ji:
-            if ji in JI_OHEANG:
-                oheang_count[JI_OHEANG[ji]] += 1
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
         
-        # 분석 결과 반환
+        return entry
+    
+    def clear(self):
+        """캐시 비우기 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """캐시 적중/미스/축출 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
+
+# 전역 사주 분석 캐시 (PredictionService, LSTM 예측, SajuMasterAI 공유)
+saju_cache = SajuCache()
+
+def calculate_pillars(year: int, month: int, day: int, hour: int = 0, minute: int = 0) -> Pillars:
+    """
+    사주팔자 계산 (모든 서비스가 사용하는 정규 기둥 엔진)
+    범위를 벗어난 날짜는 ValueError를 발생시킵니다.
+    """
+    return saju_cache.get(year, month, day, hour, minute)
+
+# 오류 시 기본 사주 (갑자 네 기둥, 목1 화1 토2 금2 수2)
+_DEFAULT_OHEANG = np.array([1, 1, 2, 2, 2], dtype=np.int8)
+_DEFAULT_OHEANG.flags.writeable = False
+
+class SajuResult:
+    """
+    사주 분석 결과 (불변)
+    캐시된 Pillars를 복사 없이 참조하며, 딕셔너리 직렬화는 응답을 만들 때 한 번만 수행합니다.
+    지식 기반 오행 가중치 조정(adjustments)도 원본을 수정하지 않고 새 결과로 표현합니다.
+    """
+    
+    __slots__ = ('pillars', 'oheang', 'analysis_date', 'error',
+                 'adjustments', 'knowledge_enhancement', '_dict')
+    
+    def __init__(self, pillars: Pillars, analysis_date: str, error: str = None,
+                 adjustments: dict = None, knowledge_enhancement: dict = None):
+        set_slot = object.__setattr__
+        set_slot(self, 'pillars', pillars)
+        set_slot(self, 'oheang', pillars.oheang)  # OHEANG 순서 int8 배열 (읽기 전용)
+        set_slot(self, 'analysis_date', analysis_date)
+        set_slot(self, 'error', error)
+        set_slot(self, 'adjustments', adjustments)
+        set_slot(self, 'knowledge_enhancement', knowledge_enhancement)
+        set_slot(self, '_dict', None)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("SajuResult는 변경할 수 없습니다")
+    
+    def enhanced(self, adjustments: dict, knowledge_enhancement: dict) -> 'SajuResult':
+        """오행 가중치 조정을 적용한 새 결과 (기둥과 오행 배열은 공유)"""
+        return SajuResult(self.pillars, self.analysis_date, self.error,
+                          adjustments, knowledge_enhancement)
+    
+    def oheang_dict(self) -> dict:
+        """오행 분포 딕셔너리 (조정 전)"""
+        return self.pillars.oheang_dict()
+    
+    def weighted_oheang(self) -> dict:
+        """조정값을 반영한 오행 분포 딕셔너리 (음수는 0으로 제한)"""
+        oheang = self.pillars.oheang_dict()
+        if self.adjustments:
+            for element, adjustment in self.adjustments.items():
+                if element in oheang:
+                    oheang[element] = max(0, oheang[element] + adjustment)
+        return oheang
+    
+    def to_dict(self) -> dict:
+        """analyze_saju 형식 딕셔너리 (최초 호출 시 한 번만 생성)"""
+        if self._dict is None:
+            result = {
+                'saju': self.pillars.saju_dict(),
+                'oheang': self.pillars.oheang_dict(),
+                'lunar_info': self.pillars.lunar_dict(),
+                'analysis_date': self.analysis_date
+            }
+            if self.error:
+                result['error'] = self.error
+            object.__setattr__(self, '_dict', result)
+        return self._dict
+    
+    def to_analysis_dict(self) -> dict:
+        """예측 응답의 saju_analysis 형식 딕셔너리 (조정된 오행, 원본 결과, 지식 강화 정보)"""
         result = {
-            'saju': saju,
-            'oheang': oheang_count,
-            'lunar_info': {
-                'year': lunar_year,
-                'month': lunar_month,
-                'day': lunar_day
-            },
-            'analysis_date': datetime.datetime.now().isoformat()
+            'oheang': self.weighted_oheang(),
+            'raw_result': self.to_dict()
         }
-        
+        if self.knowledge_enhancement is not None:
+            result['knowledge_enhancement'] = self.knowledge_enhancement
+        if self.error:
+            result['error'] = self.error
         return result
-        
+
+def analyze_saju_result(year: int, month: int, day: int, hour: int) -> SajuResult:
+    """
+    사주 분석 (SajuResult 반환)
+    캐시된 기둥을 그대로 참조하므로 요청마다 딕셔너리를 만들지 않습니다.
+    """
+    analysis_date = datetime.datetime.now().isoformat()
+    try:
+        return SajuResult(calculate_pillars(year, month, day, hour), analysis_date)
     except Exception as e:
         # 오류 발생 시 기본값 반환
         print(f"Error in saju analysis: {e}")
+        gapja = PILLAR_TABLE[0][0]
+        pillars = Pillars(gapja, gapja, gapja, gapja, _DEFAULT_OHEANG, year, month, day)
+        return SajuResult(pillars, analysis_date, error=str(e))
+
+def analyze_saju(year: int, month: int, day: int, hour: int) -> dict:
+    """
+    사주 분석 메인 함수
+    생년월일시를 입력받아 사주팔자 분석 결과 반환
+    """
+    return analyze_saju_result(year, month, day, hour).to_dict()
+
+def _to_table_index(years: np.ndarray, months: np.ndarray, days: np.ndarray) -> tuple:
+    """양력 년/월/일 배열을 만세력 테이블 인덱스 배열로 변환 (유효 여부 함께 반환)"""
+    table = manseryeok.get_table()
+
+    month_start = (years - 1970).astype('datetime64[Y]') + (months - 1).astype('timedelta64[M]')
+    dates = month_start.astype('datetime64[D]') + (days - 1).astype('timedelta64[D]')
+
+    # 존재하지 않는 날짜(예: 2월 30일)는 다음 달로 넘어가므로 월 비교로 걸러냄
+    valid = (months >= 1) & (months <= 12) & (days >= 1)
+    valid &= dates.astype('datetime64[M]') == month_start
+
+    start = np.datetime64(manseryeok.START_DATE.isoformat(), 'D')
+    index = (dates - start).astype(np.int64)
+    valid &= (index >= 0) & (index < table.count)
+
+    return np.where(valid, index, 0), valid
+
+def analyze_saju_batch(years, months, days, hours) -> dict:
+    """
+    사주 배치 분석 (NumPy 벡터 연산)
+    생년월일시 배열을 입력받아 천간/지지 인덱스와 오행 분포 행렬을 반환
+    
+    Returns:
+        gan: (N, 4) 천간 인덱스 [년, 월, 일, 시], 유효하지 않은 행은 -1
+        ji: (N, 4) 지지 인덱스 [년, 월, 일, 시], 유효하지 않은 행은 -1
+        oheang: (N, 5) 오행 개수 (OHEANG 순서), 유효하지 않은 행은 0
+        valid: (N,) 날짜 유효 여부
+    """
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    hours = np.asarray(hours, dtype=np.int64)
+
+    index, valid = _to_table_index(years, months, days)
+    records = manseryeok.get_table().records[index]
+
+    # 년주/월주 - 출생 시각의 입춘/절입 기준 (np.searchsorted로 절기 배열 일괄 조회)
+    slots = (hours + 1) // 2
+    minutes = (index + manseryeok.START_DATE.toordinal() - solar_terms.EPOCH.toordinal()) * 1440 + hours * 60
+    month_gan, month_ji, _ = solar_terms.month_pillar_batch(minutes)
+    saju_years = solar_terms.saju_year_batch(years, minutes) - 1984
+
+    # 시주 - 시진별 지지, 시간 천간은 일간으로 결정 (갑기일=갑, 을경일=병 ...)
+    hour_ji = slots % 12
+    hour_gan = ((records['day_gan'] % 5) * 2 + hour_ji) % 10
+
+    gan = np.stack([saju_years % 10, month_gan,
+                    records['day_gan'], hour_gan], axis=1).astype(np.int8)
+    ji = np.stack([saju_years % 12, month_ji,
+                   records['day_ji'], hour_ji], axis=1).astype(np.int8)
+
+    # 행별 오행 개수 - 행 번호 * 5 오프셋을 더해 한 번의 bincount로 집계
+    elements = np.concatenate([GAN_OHEANG_INDEX[gan], JI_OHEANG_INDEX[ji]], axis=1).astype(np.int64)
+    n = len(elements)
+    offsets = (np.arange(n, dtype=np.int64) * 5)[:, None]
+    oheang = np.bincount((elements + offsets).ravel(), minlength=n * 5).reshape(n, 5).astype(np.int8)
+
+    gan[~valid] = -1
+    ji[~valid] = -1
+    oheang[~valid] = 0
+
+    return {
+        'gan': gan,
+        'ji': ji,
+        'oheang': oheang,
+        'valid': valid
+    }
+
+# 대운(大運) 최대 기간 수 (10년 단위, 120년)
+DAEWOON_MAX_PERIODS = 12
+
+class DaewoonPeriod:
+    """대운 한 기간 (10년)"""
+    
+    __slots__ = ('order', 'start_age', 'pillar')
+    
+    def __init__(self, order: int, start_age: int, pillar: Pillar):
+        self.order = order
+        self.start_age = start_age
+        self.pillar = pillar
+    
+    def to_dict(self) -> dict:
+        """기간 정보 딕셔너리"""
         return {
-            'saju': {
-                'year': ('갑', '자'),
-                'month': ('갑', '자'),
-                'day': ('갑', '자'),
-                'hour': ('갑', '자')
-            },
-            'oheang': {'목': 1, '화': 1, '토': 2, '금': 2, '수': 2},
-            'lunar_info': {'year': year, 'month': month, 'day': day},
-            'analysis_date': datetime.datetime.now().isoformat(),
-            'error': str(e)
+            'order': self.order,
+            'start_age': self.start_age,
+            'end_age': self.start_age + 9,
+            'pillar': self.pillar.to_dict()
         }
 
+class DaewoonTimeline:
+    """
+    대운 흐름 (양남음녀 순행, 음남양녀 역행)
+    기간은 순회하는 만큼만 계산하고 한 번 계산한 기간은 보관하여 재사용합니다.
+    """
+    
+    def __init__(self, forward: bool, start_years: int, start_months: int, month_pillar: Pillar):
+        self.forward = forward
+        self.start_years = start_years    # 대운수 (첫 대운 시작 나이)
+        self.start_months = start_months  # 대운수의 개월 단위 나머지
+        self._month_sexagenary = (6 * month_pillar.gan_index - 5 * month_pillar.ji_index) % 60
+        self._periods = []
+        self._lock = threading.Lock()
+    
+    def _compute(self, index: int) -> DaewoonPeriod:
+        """index번째(0부터) 기간 계산 - 월주에서 육십갑자를 한 칸씩 순행/역행"""
+        step = index + 1 if self.forward else -(index + 1)
+        sexagenary = (self._month_sexagenary + step) % 60
+        return DaewoonPeriod(index + 1, self.start_years + index * 10,
+                             PILLAR_TABLE[sexagenary % 10][sexagenary % 12])
+    
+    def period(self, index: int) -> DaewoonPeriod:
+        """index번째(0부터) 기간 (필요한 기간까지만 계산)"""
+        if not 0 <= index < DAEWOON_MAX_PERIODS:
+            raise IndexError(f"대운 기간은 0~{DAEWOON_MAX_PERIODS - 1} 범위입니다.")
+        periods = self._periods
+        if index >= len(periods):
+            with self._lock:
+                while len(periods) <= index:
+                    periods.append(self._compute(len(periods)))
+        return periods[index]
+    
+    def __iter__(self):
+        for index in range(DAEWOON_MAX_PERIODS):
+            yield self.period(index)
+    
+    def take(self, count: int) -> list:
+        """앞에서부터 count개 기간"""
+        return [self.period(index) for index in range(min(count, DAEWOON_MAX_PERIODS))]
+    
+    def current(self, age: int) -> DaewoonPeriod:
+        """해당 나이(만 나이)가 속한 기간 (첫 대운 이전이면 None)"""
+        if age < self.start_years:
+            return None
+        return self.period(min((age - self.start_years) // 10, DAEWOON_MAX_PERIODS - 1))
+    
+    def to_dict(self, count: int = 8) -> dict:
+        """대운 흐름 딕셔너리 (앞에서부터 count개 기간)"""
+        return {
+            'direction': '순행' if self.forward else '역행',
+            'start_age': self.start_years,
+            'start_months': self.start_months,
+            'periods': [period.to_dict() for period in self.take(count)]
+        }
+
+def is_male(gender: str) -> bool:
+    """성별 문자열 해석 (SajuProfile.gender: 'male'/'female', 한글 '남'/'여'도 허용)"""
+    gender = (gender or '').strip().lower()
+    if gender in ('male', 'm', '남', '남자', '남성'):
+        return True
+    if gender in ('female', 'f', '여', '여자', '여성'):
+        return False
+    raise ValueError(f"알 수 없는 성별입니다: {gender}")
+
+class DaewoonCache:
+    """(년, 월, 일, 시, 분, 성별) 기준 대운 흐름 LRU 캐시"""
+    
+    def __init__(self, maxsize: int = SAJU_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, year: int, month: int, day: int, hour: int, male: bool, minute: int = 0) -> DaewoonTimeline:
+        """캐시 조회, 없으면 대운수와 방향만 계산하여 저장 (기간은 순회 시 계산)"""
+        key = (year, month, day, hour, minute, male)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        
+        entry = _compute_daewoon(*key)
+        
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        
+        return entry
+
+def _compute_daewoon(year: int, month: int, day: int, hour: int, minute: int, male: bool) -> DaewoonTimeline:
+    """
+    대운 방향과 대운수 계산
+    양년생 남자/음년생 여자는 다음 절(節)까지, 그 외는 직전 절까지의 기간을 3일 = 1년으로 환산합니다.
+    """
+    pillars = saju_cache.get(year, month, day, hour, minute)
+    forward = (pillars.year.gan_index % 2 == 0) == male
+    
+    minutes = solar_terms.to_minutes(year, month, day, hour, minute)
+    instants = solar_terms.get_instants()
+    term_index = solar_terms.term_index_at(minutes)
+    jeol_index = term_index - term_index % 2  # 짝수 인덱스가 절(節)
+    
+    if forward:
+        distance = instants[jeol_index + 2] - minutes
+    else:
+        distance = minutes - instants[jeol_index]
+    
+    # 3일 = 1년, 1일 = 4개월
+    total_months = round(distance / 1440 * 4)
+    
+    return DaewoonTimeline(forward, total_months // 12, total_months % 12, pillars.month)
+
+# 전역 대운 캐시
+daewoon_cache = DaewoonCache()
+
+def get_daewoon(year: int, month: int, day: int, hour: int, gender: str, minute: int = 0) -> DaewoonTimeline:
+    """
+    대운 흐름 조회 (사주별로 메모이즈)
+    범위를 벗어난 날짜나 알 수 없는 성별은 ValueError를 발생시킵니다.
+    """
+    return daewoon_cache.get(year, month, day, hour, is_male(gender), minute)
+
 def get_lucky_numbers(oheang: dict) -> list:
     """
     오행 분포에 따른 행운 번호 생성
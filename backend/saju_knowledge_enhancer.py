@@ -10,6 +10,7 @@ import re
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from simple_youtube_learner import SimpleYouTubeLearner
+from saju import calculate_pillars, SajuResult
 
 class SajuKnowledgeEnhancer:
     """YouTube에서 학습한 사주 지식으로 예측 시스템을 향상시키는 클래스"""
@@ -29,7 +30,8 @@ class SajuKnowledgeEnhancer:
         
         print(f"[INIT] 사주 지식 향상 시스템 초기화 완료 (DB: {knowledge_db_path})")
     
-    def get_learned_saju_insights(self, birth_year: int, birth_month: int, birth_day: int) -> Dict:
+    def get_learned_saju_insights(self, birth_year: int, birth_month: int, birth_day: int,
+                                  birth_hour: int = 0) -> Dict:
         """
         생년월일을 기반으로 학습된 사주 지식에서 관련 정보 추출
         """
@@ -42,7 +44,7 @@ class SajuKnowledgeEnhancer:
         
         try:
             # 1. 천간/지지 관련 지식 검색
-            birth_elements = self._get_birth_elements(birth_year, birth_month, birth_day)
+            birth_elements = self._get_birth_elements(birth_year, birth_month, birth_day, birth_hour)
             
             for element_type, element_value in birth_elements.items():
                 if element_value:
@@ -75,18 +77,16 @@ class SajuKnowledgeEnhancer:
         
         return insights
     
-    def _get_birth_elements(self, birth_year: int, birth_month: int, birth_day: int) -> Dict:
-        """생년월일로부터 기본 사주 요소 추출"""
+    def _get_birth_elements(self, birth_year: int, birth_month: int, birth_day: int,
+                            birth_hour: int = 0) -> Dict:
+        """생년월일로부터 기본 사주 요소 추출 (정규 기둥 엔진 사용)"""
         try:
-            # 간단한 사주 요소 매핑 (실제로는 더 복잡한 계산 필요)
-            year_gan = ['갑', '을', '병', '정', '무', '기', '경', '신', '임', '계'][birth_year % 10]
-            year_ji = ['자', '축', '인', '묘', '진', '사', '오', '미', '신', '유', '술', '해'][birth_year % 12]
-            month_ji = ['인', '묘', '진', '사', '오', '미', '신', '유', '술', '해', '자', '축'][birth_month - 1]
+            pillars = calculate_pillars(birth_year, birth_month, birth_day, birth_hour)
             
             return {
-                'year_gan': year_gan,
-                'year_ji': year_ji,
-                'month_ji': month_ji
+                'year_gan': pillars.year.gan,
+                'year_ji': pillars.year.ji,
+                'month_ji': pillars.month.ji
             }
         except:
             return {'year_gan': None, 'year_ji': None, 'month_ji': None}
@@ -185,40 +185,29 @@ class SajuKnowledgeEnhancer:
         
         return recommendations
     
-    def enhance_prediction_weights(self, saju_analysis: Dict, insights: Dict) -> Dict:
+    def enhance_prediction_weights(self, saju_result: SajuResult, insights: Dict) -> SajuResult:
         """
         사주 분석 결과에 학습된 지식을 적용하여 가중치 향상
+        원본 결과는 캐시된 기둥을 공유하므로 수정하지 않고 조정값을 담은 새 결과를 반환합니다.
         """
-        enhanced_weights = saju_analysis.copy()
-        
         try:
-            # 1. 오행 균형 조정 적용
+            # 1. 오행 균형 조정값 (SajuResult.weighted_oheang에서 적용)
             element_adjustments = insights.get('element_adjustments', {})
-            oheang = enhanced_weights.get('oheang', {})
-            
-            for element_kor, adjustment in element_adjustments.items():
-                if element_kor in oheang:
-                    # 기존 오행값에 조정값 적용
-                    current_value = oheang[element_kor]
-                    adjusted_value = max(0, current_value + adjustment)
-                    enhanced_weights['oheang'][element_kor] = adjusted_value
             
-            # 2. 신뢰도 수정자 적용
+            # 2. 신뢰도 수정자
             confidence_modifiers = insights.get('confidence_modifiers', {})
             base_adjustment = confidence_modifiers.get('base_confidence_adjustment', 0.0)
             
-            # 새로운 필드 추가
-            enhanced_weights['knowledge_enhancement'] = {
+            return saju_result.enhanced(element_adjustments, {
                 'applied_adjustments': element_adjustments,
                 'confidence_boost': base_adjustment,
                 'knowledge_sources_count': len(insights.get('relevant_knowledge', [])),
                 'recommendations': insights.get('additional_recommendations', [])
-            }
+            })
             
         except Exception as e:
             print(f"[ERROR] 가중치 향상 실패: {e}")
-        
-        return enhanced_weights
+            return saju_result
     
     def get_knowledge_summary(self) -> Dict:
         """현재 학습된 지식 요약"""
@@ -65,6 +65,14 @@ class PredictionRequest(BaseModel):
     birth_day: int
     birth_hour: int
     name: Optional[str] = None
+    frequency_mode: str = 'raw'  # 'raw' (누적 빈도) 또는 'decayed' (감쇠 점수)
+
+class BacktestRequest(BaseModel):
+    profiles: List[PredictionRequest]
+    warmup_draws: int = 100
+    workers: Optional[int] = None
+    include_lstm: bool = True
+    seed: Optional[int] = None
 
 class NumberScore(BaseModel):
     number: int
@@ -89,6 +97,11 @@ class HistoricalAnalysisResponse(BaseModel):
     top_numbers: List[Dict[str, int]]
     element_distribution: Dict[str, Dict]
     last_5_draws: List[Dict]
+    top_pairs: List[Dict] = []
+    top_triplets: List[Dict] = []
+    decay_half_life: Optional[int] = None
+    hot_numbers: List[Dict] = []
+    cold_numbers: List[Dict] = []
 
 class LSTMPredictionResponse(BaseModel):
     predicted_numbers: List[int]
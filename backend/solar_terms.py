@@ -0,0 +1,282 @@
+"""
+절기(節氣) 경계 모듈
+1900~2100년 24절기 입기 시각을 미리 계산한 정렬 배열(천문력 캐시)을 사용하여
+월주(月柱)를 결정합니다. 요청마다 천문 계산을 하지 않습니다.
+단건 조회는 절기 배열에서 만든 일자별 표(그날 00:00의 월주, 그날 절입 시각)를 인덱싱하여
+bisect 없이 O(1)로 처리합니다.
+"""
+
+import datetime
+import math
+import os
+import threading
+import timeit
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+# 정밀 천문력 (선택적 - 캐시 생성 시에만 사용, 없으면 Meeus 근사식 사용, requirements-dev.txt)
+try:
+    import ephem
+    EPHEM_AVAILABLE = True
+except ImportError:
+    EPHEM_AVAILABLE = False
+
+# 캐시 파일 경로 (모듈과 같은 디렉토리에 배포)
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solar_terms.bin')
+
+# 계산 범위 - 범위 양 끝의 월주를 위해 전년도(1899년)와 다음 해(2101년) 절기까지 포함
+START_YEAR = 1900
+END_YEAR = 2100
+FIRST_YEAR = START_YEAR - 1
+LAST_YEAR = END_YEAR + 1
+
+# 24절기 (소한부터 시작, 짝수 인덱스가 월주를 바꾸는 절(節), 홀수 인덱스가 중기(中氣))
+TERM_NAMES = [
+    '소한', '대한', '입춘', '우수', '경칩', '춘분',
+    '청명', '곡우', '입하', '소만', '망종', '하지',
+    '소서', '대서', '입추', '처서', '백로', '추분',
+    '한로', '상강', '입동', '소설', '대설', '동지'
+]
+
+# 시각 단위: 1900-01-01 00:00 (한국 표준시) 기준 경과 분
+EPOCH = datetime.date(1900, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+_EPOCH_JD = 2415020.5 - 9 / 24  # 1900-01-01 00:00 KST = 1899-12-31 15:00 UT
+
+# 월 시작일 표: (년 - FIRST_YEAR) * 12 + (월 - 1) -> 기준일 이후 경과 일수, 그 달의 일수
+# (요청마다 datetime.date 객체를 만들지 않고 정수 덧셈으로 경과 분 계산)
+_MONTH_START_DAYS = tuple(
+    datetime.date(year, month, 1).toordinal() - _EPOCH_ORDINAL
+    for year in range(FIRST_YEAR, LAST_YEAR + 2) for month in range(1, 13)
+)
+_MONTH_LENGTHS = tuple(b - a for a, b in zip(_MONTH_START_DAYS, _MONTH_START_DAYS[1:]))
+
+# 월주 기준점: 1984년 입춘부터 병인월(육십갑자 인덱스 2)
+_BASE_JEOL = (1984 - FIRST_YEAR) * 12 + 1
+_BASE_SEXAGENARY = 2
+
+# 절(節) 순번 % 60 -> (천간 인덱스, 지지 인덱스)
+_MONTH_PILLARS = tuple(
+    ((_BASE_SEXAGENARY + jeol - _BASE_JEOL) % 10, (_BASE_SEXAGENARY + jeol - _BASE_JEOL) % 12)
+    for jeol in range(60)
+)
+# 일자별 표 조회용 (절입 당일 절입 이후는 인덱스 + 1, 60은 0과 같음)
+_MONTH_PILLARS_WRAP = _MONTH_PILLARS + _MONTH_PILLARS[:1]
+
+
+def _sun_longitude(jd: float) -> float:
+    """태양 시황경 (Meeus 저정밀 공식, 오차 약 0.01도 = 15분 이내)"""
+    t = (jd - 2451545.0) / 36525
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+         + (0.019993 - 0.000101 * t) * math.sin(2 * m)
+         + 0.000289 * math.sin(3 * m))
+    omega = math.radians(125.04 - 1934.136 * t)
+    return (l0 + c - 0.00569 - 0.00478 * math.sin(omega)) % 360
+
+
+def _ephem_sun_longitude(jd: float) -> float:
+    """태양 시황경 (ephem 정밀 천문력, 오차 1초 이내)"""
+    date = ephem.Date(jd - 2415020.0)  # ephem 날짜는 1899-12-31 12:00 UT 기준 경과 일수
+    sun = ephem.Sun()
+    sun.compute(date, epoch=date)
+    equatorial = ephem.Equatorial(sun.ra, sun.dec, epoch=date)
+    return math.degrees(ephem.Ecliptic(equatorial, epoch=date).lon)
+
+
+def _term_jd(year: int, term: int, sun_longitude=_sun_longitude) -> float:
+    """year년 term번째 절기(소한=0)의 입기 시각 (율리우스일, UT)"""
+    target = (285 + 15 * term) % 360
+    # 초기값: 해당 년도 1월 6일 + 절기 간격
+    jd = 2415020.5 + (datetime.date(year, 1, 6).toordinal() - _EPOCH_ORDINAL) + term * 15.2184
+
+    for _ in range(10):
+        diff = (target - sun_longitude(jd) + 180) % 360 - 180
+        jd += diff / 0.98564736
+        if abs(diff) < 1e-7:
+            break
+    return jd
+
+
+def build_cache(path: str = CACHE_PATH) -> array:
+    """전체 범위의 24절기 입기 시각을 계산하여 파일로 저장"""
+    sun_longitude = _ephem_sun_longitude if EPHEM_AVAILABLE else _sun_longitude
+
+    instants = array('q')
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        for term in range(24):
+            jd = _term_jd(year, term, sun_longitude)
+            instants.append(round((jd - _EPOCH_JD) * 1440))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        instants.tofile(f)
+    os.replace(tmp_path, path)
+
+    return instants
+
+
+_instants = None
+_instants_lock = threading.Lock()
+
+# 일자별 표 (get_instants에서 생성): 경과 일수 - _day_first -> 그날 00:00의 절 순번 % 60, 그날 절입 분 (없으면 1440)
+_day_first = 0
+_day_pillars = None
+_day_switch = None
+
+
+def _build_day_tables(instants: tuple):
+    """절기 배열에서 일자별 월주 표 생성 (절 사이 간격이 15일 이상이므로 하루에 절입은 최대 한 번)"""
+    global _day_first, _day_pillars, _day_switch
+
+    values = np.asarray(instants, dtype=np.int64)
+    first_day = -(-values[0] // 1440)  # 첫 절기 이후 처음 시작하는 날
+    last_day = values[-1] // 1440      # 마지막 절기가 있는 날 (제외)
+    days = np.arange(first_day, last_day, dtype=np.int64)
+
+    terms = np.searchsorted(values, days * 1440, side='right') - 1
+    pillars = (terms // 2 % 60).tolist()
+
+    switch = [1440] * len(days)
+    for instant in values[0::2].tolist():
+        day, minute = divmod(instant, 1440)
+        if minute and first_day <= day < last_day:
+            switch[day - first_day] = minute
+
+    _day_first, _day_switch, _day_pillars = int(first_day), switch, pillars
+
+
+def get_instants() -> tuple:
+    """
+    정렬된 절기 입기 시각 배열 (최초 호출 시 캐시 파일 로드, 없으면 생성)
+    bisect 시 원소 박싱 비용이 없도록 int 튜플로 보관합니다.
+    """
+    global _instants
+    if _instants is None:
+        with _instants_lock:
+            if _instants is None:
+                if os.path.exists(CACHE_PATH):
+                    instants = array('q')
+                    with open(CACHE_PATH, 'rb') as f:
+                        instants.frombytes(f.read())
+                else:
+                    print(f"[SOLAR_TERMS] 절기 캐시가 없어 새로 생성합니다: {CACHE_PATH}")
+                    instants = build_cache(CACHE_PATH)
+                _build_day_tables(tuple(instants))
+                _instants = tuple(instants)
+    return _instants
+
+
+def to_minutes(year: int, month: int, day: int, hour: int = 0, minute: int = 0) -> int:
+    """한국 표준시 일시를 절기 배열과 같은 단위(기준시 이후 경과 분)로 변환"""
+    if 1 <= month <= 12:
+        index = (year - FIRST_YEAR) * 12 + month - 1
+        if 0 <= index < len(_MONTH_LENGTHS) and 1 <= day <= _MONTH_LENGTHS[index]:
+            return (_MONTH_START_DAYS[index] + day - 1) * 1440 + hour * 60 + minute
+    # 표 범위 밖이거나 존재하지 않는 날짜는 datetime으로 계산/검증 (잘못된 날짜는 ValueError)
+    return (datetime.date(year, month, day).toordinal() - _EPOCH_ORDINAL) * 1440 + hour * 60 + minute
+
+
+def term_index_at(minutes: int) -> int:
+    """해당 시각에 이미 입기한 가장 최근 절기의 배열 인덱스"""
+    instants = _instants or get_instants()
+    index = bisect_right(instants, minutes) - 1
+    if index < 0 or index >= len(instants) - 1:
+        raise ValueError(f"절기 테이블 범위({START_YEAR}~{END_YEAR}년)를 벗어난 날짜입니다.")
+    return index
+
+
+def month_pillar_at(minutes: int) -> tuple:
+    """시각(경과 분)의 월주를 (천간 인덱스, 지지 인덱스)로 반환"""
+    if _day_pillars is None:
+        get_instants()
+    day, minute = divmod(minutes, 1440)
+    day -= _day_first
+    if 0 <= day < len(_day_pillars):
+        return _MONTH_PILLARS_WRAP[_day_pillars[day] + (minute >= _day_switch[day])]
+    # 표 양 끝(범위 밖 포함)은 절기 배열 bisect (범위 밖이면 ValueError)
+    return _MONTH_PILLARS[term_index_at(minutes) // 2 % 60]
+
+
+def month_pillar(year: int, month: int, day: int, hour: int = 0, minute: int = 0) -> tuple:
+    """양력 일시의 월주를 (천간 인덱스, 지지 인덱스)로 반환 (절입 시각 기준)"""
+    # 호출 단계를 줄이기 위해 to_minutes/month_pillar_at의 일반 경로를 풀어 씀
+    if 1 <= month <= 12 and _day_pillars is not None:
+        index = (year - FIRST_YEAR) * 12 + month - 1
+        if 0 <= index < len(_MONTH_LENGTHS) and 1 <= day <= _MONTH_LENGTHS[index]:
+            day_index = _MONTH_START_DAYS[index] + day - 1 - _day_first
+            if 0 <= day_index < len(_day_pillars):
+                return _MONTH_PILLARS_WRAP[_day_pillars[day_index] + (hour * 60 + minute >= _day_switch[day_index])]
+    return month_pillar_at(to_minutes(year, month, day, hour, minute))
+
+
+def saju_year(year: int, month: int, day: int, hour: int = 0, minute: int = 0) -> int:
+    """입춘(立春) 입기 시각 기준 간지 연도 (입춘 전은 전년도, 입춘은 항상 2월 3~5일)"""
+    if month != 2:
+        return year if month > 2 else year - 1
+    ipchun = (_instants or get_instants())[(year - FIRST_YEAR) * 24 + 2]
+    return year if to_minutes(year, month, day, hour, minute) >= ipchun else year - 1
+
+
+def saju_year_batch(years, minutes) -> np.ndarray:
+    """saju_year의 배치 버전 (years: 양력 연도 배열, minutes: 같은 시각의 경과 분 배열)"""
+    years = np.asarray(years, dtype=np.int64)
+    instants = np.asarray(get_instants(), dtype=np.int64)
+    index = np.clip((years - FIRST_YEAR) * 24 + 2, 0, len(instants) - 1)
+    return years - (np.asarray(minutes, dtype=np.int64) < instants[index])
+
+
+def month_pillar_batch(minutes) -> tuple:
+    """
+    시각(경과 분) 배열의 월주 배치 조회 (np.searchsorted)
+    Returns: (천간 인덱스 배열, 지지 인덱스 배열, 범위 내 여부 배열)
+    """
+    instants = np.asarray(get_instants(), dtype=np.int64)
+    index = np.searchsorted(instants, np.asarray(minutes, dtype=np.int64), side='right') - 1
+    valid = (index >= 0) & (index < len(instants) - 1)
+
+    sexagenary = (_BASE_SEXAGENARY + index // 2 - _BASE_JEOL) % 60
+    return sexagenary % 10, sexagenary % 12, valid
+
+
+def get_term(year: int, term: int) -> datetime.datetime:
+    """year년 term번째 절기(소한=0)의 입기 시각 (한국 표준시)"""
+    if not START_YEAR <= year <= END_YEAR:
+        raise ValueError(f"절기 테이블 범위({START_YEAR}~{END_YEAR}년)를 벗어난 연도입니다.")
+    minutes = get_instants()[(year - FIRST_YEAR) * 24 + term]
+    return datetime.datetime(1900, 1, 1) + datetime.timedelta(minutes=minutes)
+
+
+def benchmark(iterations: int = 200000) -> dict:
+    """월주 조회 마이크로 벤치마크 (호출당 나노초)"""
+    get_instants()
+    minutes = to_minutes(1990, 5, 15, 10)
+
+    namespace = {'month_pillar_at': month_pillar_at, 'month_pillar': month_pillar, 'minutes': minutes}
+
+    lookup_ns = timeit.timeit('month_pillar_at(minutes)', globals=namespace,
+                              number=iterations) / iterations * 1e9
+    full_ns = timeit.timeit('month_pillar(1990, 5, 15, 10)', globals=namespace,
+                            number=iterations) / iterations * 1e9
+
+    return {
+        'iterations': iterations,
+        'month_pillar_at_ns': round(lookup_ns, 1),
+        'month_pillar_ns': round(full_ns, 1)
+    }
+
+
+if __name__ == "__main__":
+    # 캐시 재생성 및 벤치마크
+    instants = build_cache()
+    print(f"절기 캐시 생성 완료: {len(instants)}개 ({CACHE_PATH})")
+
+    for term in range(24):
+        print(f"  2024년 {TERM_NAMES[term]}: {get_term(2024, term)}")
+
+    result = benchmark()
+    print(f"월주 조회 (분 단위 입력): {result['month_pillar_at_ns']}ns/회")
+    print(f"월주 조회 (년월일시 입력): {result['month_pillar_ns']}ns/회")
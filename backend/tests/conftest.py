@@ -0,0 +1,147 @@
+"""
+공통 테스트 설정
+backend 모듈은 평면 구조로 import하므로 backend 디렉터리를 경로에 추가하고,
+DB가 필요한 테스트는 메모리 SQLite 세션을 draw_store/prediction_service에 연결합니다.
+LSTM 번들이 필요한 테스트는 Keras 없이 가짜 모델을 .npz로 내보내 게시합니다.
+"""
+
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import models  # noqa: E402
+
+
+def make_draws(count: int, seed: int = 0, start_draw_no: int = 1) -> list:
+    """합성 회차 (crud.create_lotto_draw 입력 형식)"""
+    rng = np.random.default_rng(seed)
+    draws = []
+    for index in range(count):
+        numbers = (rng.choice(45, 7, replace=False) + 1).tolist()
+        draw_date = datetime.date(2002, 12, 7) + datetime.timedelta(weeks=start_draw_no + index - 1)
+        draws.append({
+            'draw_no': start_draw_no + index,
+            'draw_date': f"{draw_date.year}년 {draw_date.month}월 {draw_date.day}일",
+            'win_numbers': sorted(numbers[:6]),
+            'bonus_number': numbers[6]
+        })
+    return draws
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """메모리 SQLite 세션 팩토리 (회차 저장소/예측 서비스가 같은 DB를 보도록 연결)"""
+    import draw_store
+    import prediction_service
+
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    monkeypatch.setattr(draw_store, 'SessionLocal', factory)
+    monkeypatch.setattr(prediction_service, 'SessionLocal', factory)
+    monkeypatch.setattr(draw_store.draw_store, '_snapshot', None)
+    draw_store.draw_store.invalidate()
+    prediction_service.prediction_service.invalidate_historical_snapshot()
+
+    yield factory
+
+    prediction_service.prediction_service.invalidate_historical_snapshot()
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class _KerasLayer:
+    def __init__(self, config, weights):
+        self._config, self._weights = config, weights
+
+    def get_config(self):
+        return self._config
+
+    def get_weights(self):
+        return self._weights
+
+
+# export_npz는 층 클래스 이름으로 종류를 판별
+class LSTM(_KerasLayer):
+    pass
+
+
+class Dense(_KerasLayer):
+    pass
+
+
+class FakeKerasModel:
+    """export_npz가 사용하는 Keras 모델 인터페이스(input_shape, layers)만 흉내 낸 객체"""
+
+    def __init__(self, lstm: tuple, dense: tuple, input_shape: tuple = (None, 10, 6)):
+        self.input_shape = input_shape
+        self.layers = [LSTM(*lstm), Dense(*dense)]
+
+    @classmethod
+    def random(cls, seed: int) -> 'FakeKerasModel':
+        """LSTM(32 유닛 = 8 x 4 게이트, relu) + Dense(6) 무작위 가중치 모델"""
+        rng = np.random.default_rng(seed)
+        return cls(
+            ({'activation': 'relu', 'recurrent_activation': 'sigmoid'},
+             [rng.normal(0, 0.3, shape).astype(np.float32) for shape in ((6, 32), (8, 32), (32,))]),
+            ({'activation': 'linear'},
+             [rng.normal(0, 0.3, shape).astype(np.float32) for shape in ((8, 6), (6,))])
+        )
+
+
+@pytest.fixture
+def fake_keras_model():
+    """가짜 Keras 모델 클래스 (FakeKerasModel.random(seed) 또는 층 가중치를 직접 지정)"""
+    return FakeKerasModel
+
+
+@pytest.fixture
+def lstm_scaler():
+    """로또 번호 1~45를 0~1로 변환하는 스케일러"""
+    from numpy_lstm import NumpyMinMaxScaler
+    return NumpyMinMaxScaler(np.full(6, -1 / 44), np.full(6, 1 / 44))
+
+
+@pytest.fixture
+def publish_test_bundle(lstm_scaler):
+    """무작위 가짜 모델을 번들로 게시하는 함수 (메타데이터에 seed 기록)"""
+    import model_artifacts
+    from numpy_lstm import export_npz
+
+    def publish(artifact_dir: str, version: str, seed: int = 0, train_draw_range=(1, 100), **kwargs):
+        model = FakeKerasModel.random(seed)
+        return model_artifacts.publish_bundle(
+            lambda path: export_npz(model, lstm_scaler, path), train_draw_range, {'seed': seed},
+            artifact_dir=artifact_dir, version=version, **kwargs
+        )
+    return publish
+
+
+@pytest.fixture
+def lstm_registry(tmp_path, publish_test_bundle):
+    """tmp_path에 v1 번들을 게시하고 미리 적재한 ModelRegistry를 만드는 함수"""
+    from model_registry import ModelRegistry
+
+    def create(train_draw_range=(1, 100)):
+        publish_test_bundle(str(tmp_path), 'v1', train_draw_range=train_draw_range)
+        registry = ModelRegistry(str(tmp_path))
+        registry.preload()
+        return registry
+    return create
@@ -0,0 +1,60 @@
+import numpy as np
+
+from backtest import run_backtest
+from lstm_prediction_service import lstm_service
+
+PROFILES = [(1990, 5, 15, 10), (1975, 11, 3, 22)]
+
+
+def _synthetic_numbers(count: int = 150, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.array([rng.choice(45, 7, replace=False) + 1 for _ in range(count)], dtype=np.uint8)
+
+
+def test_backtest_is_reproducible_across_workers_without_global_rng():
+    numbers = _synthetic_numbers()
+    np.random.seed(123)
+    state = np.random.get_state()[1].copy()
+
+    single = run_backtest(PROFILES, warmup_draws=100, workers=1, include_lstm=False, seed=7, numbers=numbers)
+    # 워커는 spawn으로 시작하며 프로필별 Generator만 사용하므로 워커 수와 무관하게 같은 결과
+    spawned = run_backtest(PROFILES, warmup_draws=100, workers=2, include_lstm=False, seed=7, numbers=numbers)
+
+    assert single['summary'] == spawned['summary']
+    assert [r['strategies'] for r in single['results']] == [r['strategies'] for r in spawned['results']]
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+
+def test_saju_weight_helpers_use_given_generator():
+    base = np.array([3, 3, 12, 25, 33, 41])
+    weights = {'목': 0.1, '화': 0.9, '토': 0.1, '금': 0.1, '수': 0.1}
+    np.random.seed(0)
+    state = np.random.get_state()[1].copy()
+
+    first = lstm_service.ensure_unique_numbers(
+        lstm_service.apply_saju_weights(base, weights, np.random.default_rng(5)), np.random.default_rng(6)
+    )
+    second = lstm_service.ensure_unique_numbers(
+        lstm_service.apply_saju_weights(base, weights, np.random.default_rng(5)), np.random.default_rng(6)
+    )
+    assert first == second and len(set(first)) == 6
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+
+def test_lstm_strategy_scores_only_draws_after_training_cutoff(monkeypatch, lstm_registry):
+    monkeypatch.setattr(lstm_service, 'registry', lstm_registry((1, 120)))
+    result = run_backtest(PROFILES, warmup_draws=100, workers=1, seed=7, numbers=_synthetic_numbers())
+
+    assert result['lstm_included'] and not result['lookahead_bias']
+    assert result['lstm_train_last_draw_no'] == 120
+    assert result['lstm_steps'] == 30
+    assert result['summary']['lstm']['tickets'] == 30 * len(PROFILES)
+    assert result['summary']['random']['tickets'] == 50 * len(PROFILES)
+
+
+def test_lstm_strategy_without_training_range_reports_lookahead_bias(monkeypatch, lstm_registry):
+    monkeypatch.setattr(lstm_service, 'registry', lstm_registry(None))
+    result = run_backtest(PROFILES, warmup_draws=100, workers=1, seed=7, numbers=_synthetic_numbers())
+
+    assert result['lstm_included'] and result['lookahead_bias']
+    assert result['lstm_steps'] == 50
@@ -0,0 +1,49 @@
+import numpy as np
+
+import crud
+import models
+import schemas
+from compatibility import CompatibilityIndex
+
+
+def _create_profile(db, user_id: int, birth: tuple) -> models.SajuProfile:
+    db.add(models.User(id=user_id, email=f'user{user_id}@example.com', name=f'user{user_id}'))
+    db.commit()
+    year, month, day, hour = birth
+    return crud.create_saju_profile(db, user_id, schemas.SajuProfileCreate(
+        name=f'user{user_id}', gender='male', birth_year=year, birth_month=month, birth_day=day, birth_hour=hour
+    ))
+
+
+def test_add_profile_appends_without_reload(db):
+    for user_id, birth in enumerate([(1990, 5, 15, 10), (1985, 3, 2, 7), (2000, 12, 31, 23)], start=1):
+        _create_profile(db, user_id, birth)
+
+    index = CompatibilityIndex()
+    index.ensure_loaded(db)
+    profile = _create_profile(db, 4, (1978, 8, 8, 8))
+    assert index.add_profile(profile)
+    assert not index.add_profile(profile)
+
+    reloaded = CompatibilityIndex()
+    reloaded.load(db)
+    assert index.profile_ids.tolist() == reloaded.profile_ids.tolist()
+    assert index.names == reloaded.names
+    for name in ('user_ids', 'oheang', 'day_gan', 'day_ji', 'year_ji'):
+        np.testing.assert_array_equal(getattr(index, name), getattr(reloaded, name))
+    assert index.top_matches(1, k=10) == reloaded.top_matches(1, k=10)
+
+
+def test_top_matches_excludes_self_when_k_exceeds_candidates(db):
+    # 같은 사용자의 프로필이 두 개여도 본인 행(-inf)은 결과에 포함되지 않음
+    _create_profile(db, 1, (1990, 5, 15, 10))
+    crud.create_saju_profile(db, 1, schemas.SajuProfileCreate(
+        name='user1', gender='male', birth_year=1990, birth_month=5, birth_day=15, birth_hour=10
+    ))
+    _create_profile(db, 2, (1985, 3, 2, 7))
+
+    index = CompatibilityIndex()
+    index.ensure_loaded(db)
+    matches = index.top_matches(1, k=10)
+    assert [match['user_id'] for match in matches] == [2]
+    assert all(np.isfinite(match['score']) for match in matches)
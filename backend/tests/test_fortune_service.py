@@ -0,0 +1,25 @@
+import datetime
+
+import pytest
+
+import saju
+import solar_terms
+from fortune_service import fortune_service
+
+
+@pytest.mark.parametrize('year', [2025, 2026, 2030])
+def test_daily_fortune_year_pillar_changes_at_ipchun(year):
+    saju_result = saju.analyze_saju_result(1990, 5, 15, 10)
+    ipchun = solar_terms.get_term(year, 2).date()
+
+    def yearly_pillar(date):
+        return fortune_service.daily_fortune(saju_result, date)['yearly']['pillar']
+
+    previous_year = saju.PILLAR_TABLE[(year - 1985) % 10][(year - 1985) % 12].to_dict()
+    current_year = saju.PILLAR_TABLE[(year - 1984) % 10][(year - 1984) % 12].to_dict()
+
+    # 양력 1월 ~ 입춘 전날은 전년도 세운
+    assert yearly_pillar(datetime.date(year, 1, 15)) == previous_year
+    assert yearly_pillar(ipchun - datetime.timedelta(days=1)) == previous_year
+    assert yearly_pillar(ipchun) == current_year
+    assert yearly_pillar(ipchun + datetime.timedelta(days=1)) == current_year
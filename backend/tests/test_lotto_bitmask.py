@@ -0,0 +1,48 @@
+import numpy as np
+
+import lotto_bitmask
+from lotto_bitmask import RANKS
+
+
+def _set_rank(ticket: set, numbers: set, bonus: int) -> str:
+    """집합 연산으로 계산한 당첨 등수 (기준 구현)"""
+    matches = len(ticket & numbers)
+    if matches == 6:
+        return '1등'
+    if matches == 5:
+        return '2등' if bonus in ticket else '3등'
+    return {4: '4등', 3: '5등'}.get(matches, '등외')
+
+
+def test_rank_bulk_matches_set_based_ranking():
+    rng = np.random.default_rng(0)
+    draws = np.array([rng.choice(45, 7, replace=False) + 1 for _ in range(500)], dtype=np.uint8)
+
+    # 무작위 티켓만으로는 상위 등수가 거의 나오지 않으므로 당첨 번호를 일부 바꾼 티켓을 섞음
+    # (보너스 번호를 포함한 5개 일치 티켓도 섞어 2등을 확인)
+    tickets = []
+    for draw in draws:
+        keep = int(rng.integers(0, 8))
+        if keep == 7:
+            tickets.append(np.concatenate([draw[:5], draw[6:]]))
+            continue
+        pool = np.setdiff1d(np.arange(1, 46), draw[:keep])
+        tickets.append(np.concatenate([draw[:keep], rng.choice(pool, 6 - keep, replace=False)]))
+    tickets = np.array(tickets)
+
+    matches, has_bonus = lotto_bitmask.match_bulk(lotto_bitmask.ticket_masks(tickets), lotto_bitmask.draw_masks(draws))
+    ranks = lotto_bitmask.rank_bulk(matches, has_bonus)
+
+    expected = [_set_rank(set(ticket.tolist()), set(draw[:6].tolist()), int(draw[6]))
+                for ticket, draw in zip(tickets, draws)]
+    assert [RANKS[rank] for rank in ranks.tolist()] == expected
+    assert set(expected) == set(RANKS)
+
+
+def test_scalar_and_bulk_agree():
+    ticket = lotto_bitmask.ticket_mask([1, 2, 3, 4, 5, 7])
+    draw = lotto_bitmask.draw_mask([1, 2, 3, 4, 5, 6], bonus=7)
+    assert lotto_bitmask.prize_rank(ticket, draw) == '2등'
+
+    matches, has_bonus = lotto_bitmask.match_bulk(np.array([ticket], dtype=np.uint64), np.array([draw], dtype=np.uint64))
+    assert RANKS[lotto_bitmask.rank_bulk(matches, has_bonus)[0]] == '2등'
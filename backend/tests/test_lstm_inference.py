@@ -0,0 +1,55 @@
+import threading
+
+import numpy as np
+
+from lstm_inference import InferenceBatcher
+
+
+def _concurrent(call, windows):
+    barrier = threading.Barrier(len(windows))
+    results = [None] * len(windows)
+
+    def worker(index):
+        barrier.wait()
+        results[index] = call(windows[index])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(len(windows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_callers_share_one_forward_pass():
+    calls = []
+
+    def predict_batch(windows, version):
+        calls.append(len(windows))
+        return windows[:, -1, :].astype(int)
+
+    batcher = InferenceBatcher(predict_batch, window_seconds=0.5)
+    windows = np.random.default_rng(0).integers(1, 46, (16, 10, 6))
+    results = _concurrent(batcher.predict, windows)
+
+    assert calls == [16]
+    assert batcher.stats() == {'batches': 1, 'requests': 16, 'mean_batch_size': 16.0}
+    for result, window in zip(results, windows):
+        assert (result == window[-1]).all()
+
+
+def test_service_window_predictions_go_through_batcher(lstm_registry):
+    from lstm_prediction_service import LSTMPredictionService
+
+    service = LSTMPredictionService(lstm_registry())
+    service.batcher.window_seconds = 0.5
+
+    windows = np.random.default_rng(1).integers(1, 46, (8, 10, 6)).astype(np.float32)
+    expected = service.predict_base_numbers(windows)
+
+    results = _concurrent(service.predict_window, windows)
+    np.testing.assert_array_equal(np.stack(results), expected)
+    assert service.batcher.stats()['batches'] == 1
+
+    np.testing.assert_array_equal(service.predict_windows(windows), expected)
+    assert service.batcher.stats()['batches'] == 2
@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+from lunar_converter import lunar_to_solar, lunar_to_solar_batch
+
+# 음력 키(년 * 10000 + (월 * 2 + 윤달) * 100 + 일)가 다른 날짜와 겹칠 수 있는 범위 밖 입력
+OUT_OF_RANGE = [
+    (2000, 54, 1, False),
+    (2000, 0, 230, False),
+    (2000, 3, 101, False),
+    (2000, 13, 1, False),
+    (2000, 1, 0, False),
+    (2000, 1, 31, False),
+    (2000, 1, 1, 2),
+    (2000, 1, 1, -1),
+]
+
+
+@pytest.mark.parametrize('lunar', OUT_OF_RANGE)
+def test_scalar_rejects_out_of_range_input(lunar):
+    with pytest.raises(ValueError):
+        lunar_to_solar(*lunar)
+
+
+def test_batch_rejects_out_of_range_input():
+    batch = lunar_to_solar_batch(*zip(*OUT_OF_RANGE))
+    assert not batch['valid'].any()
+
+
+def test_scalar_and_batch_agree_on_valid_dates():
+    lunar = [(2000, 1, 1, False), (2020, 4, 1, True), (1990, 4, 21, False)]
+    batch = lunar_to_solar_batch(*zip(*lunar))
+    assert batch['valid'].all()
+    expected = [datetime.date(2000, 2, 5), datetime.date(2020, 5, 23), datetime.date(1990, 5, 15)]
+    assert [lunar_to_solar(*date) for date in lunar] == expected
+    assert list(zip(batch['year'].tolist(), batch['month'].tolist(), batch['day'].tolist())) == \
+        [(date.year, date.month, date.day) for date in expected]
@@ -0,0 +1,54 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import manseryeok
+from saju import GAN, JI
+
+korean_lunar_calendar = pytest.importorskip('korean_lunar_calendar')
+
+
+def _library_day_pillar(date: datetime.date) -> str:
+    calendar = korean_lunar_calendar.KoreanLunarCalendar()
+    calendar.setSolarDate(date.year, date.month, date.day)
+    return calendar.getGapJaString().split()[2][:2]
+
+
+def test_base_day_is_gapja():
+    info = manseryeok.lookup(*manseryeok.BASE_DAY.timetuple()[:3])
+    assert (info.day_gan, info.day_ji) == (0, 0)
+    assert _library_day_pillar(manseryeok.BASE_DAY) == '갑자'
+
+
+@pytest.mark.parametrize('date, expected', [
+    ((2000, 1, 1), '무오'),
+    ((1990, 5, 15), '경진'),
+    ((2024, 2, 10), '갑진'),
+    ((1984, 2, 2), '병인'),
+])
+def test_known_day_pillars(date, expected):
+    info = manseryeok.lookup(*date)
+    assert GAN[info.day_gan] + JI[info.day_ji] == expected
+
+
+def test_day_pillars_match_korean_lunar_calendar():
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(manseryeok.START_DATE.toordinal(), manseryeok.END_DATE.toordinal() + 1, 500)
+    for ordinal in ordinals.tolist():
+        date = datetime.date.fromordinal(ordinal)
+        info = manseryeok.lookup(date.year, date.month, date.day)
+        assert GAN[info.day_gan] + JI[info.day_ji] == _library_day_pillar(date), date
+
+
+def test_outdated_table_is_rejected(tmp_path):
+    path = tmp_path / 'manseryeok.bin'
+    with open(manseryeok.TABLE_PATH, 'rb') as source:
+        data = bytearray(source.read(manseryeok._HEADER.size + manseryeok._RECORD.size))
+    assert manseryeok._is_current_format(manseryeok.TABLE_PATH)
+
+    data[4:6] = (manseryeok._VERSION - 1).to_bytes(2, 'little')
+    path.write_bytes(bytes(data))
+    assert not manseryeok._is_current_format(str(path))
+    with pytest.raises(ValueError):
+        manseryeok.ManseryeokTable(str(path))
@@ -0,0 +1,144 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import model_artifacts
+from numpy_lstm import export_npz
+
+
+def test_publish_writes_manifest_and_swaps_pointer(tmp_path, publish_test_bundle, lstm_scaler):
+    artifact_dir = str(tmp_path)
+    assert model_artifacts.read_current_version(artifact_dir) is None
+
+    manifest = publish_test_bundle(artifact_dir, 'v1')
+    assert model_artifacts.read_current_version(artifact_dir) == 'v1'
+    assert manifest['input_shape'] == [10, 6] and manifest['output_shape'] == [6]
+    assert manifest['train_draw_range'] == [1, 100]
+
+    loaded, model, scaler = model_artifacts.load_bundle(artifact_dir=artifact_dir)
+    assert loaded == manifest
+    np.testing.assert_array_equal(scaler.scale_, lstm_scaler.scale_)
+    assert model.predict(np.zeros((2, 10, 6))).shape == (2, 6)
+
+    publish_test_bundle(artifact_dir, 'v2', seed=1)
+    assert model_artifacts.read_current_version(artifact_dir) == 'v2'
+
+    # 롤백은 포인터만 교체
+    model_artifacts.set_current_version('v1', artifact_dir)
+    assert model_artifacts.read_current_version(artifact_dir) == 'v1'
+    assert sorted(os.listdir(artifact_dir)) == ['CURRENT', 'v1', 'v2']
+
+
+def test_failed_publish_keeps_previous_version(tmp_path, publish_test_bundle):
+    artifact_dir = str(tmp_path)
+    publish_test_bundle(artifact_dir, 'v1')
+
+    def broken_checkpoint(path):
+        with open(path, 'w') as f:
+            f.write('partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        publish_test_bundle(artifact_dir, 'v2', write_checkpoint=broken_checkpoint)
+
+    # 실패한 번들은 노출되지 않고 임시 디렉터리도 남지 않음
+    assert model_artifacts.read_current_version(artifact_dir) == 'v1'
+    assert sorted(os.listdir(artifact_dir)) == ['CURRENT', 'v1']
+
+
+def test_pointer_file_is_replaced_not_rewritten(tmp_path, publish_test_bundle):
+    artifact_dir = str(tmp_path)
+    publish_test_bundle(artifact_dir, 'v1')
+    pointer = os.path.join(artifact_dir, model_artifacts.POINTER_FILE)
+    inode = os.stat(pointer).st_ino
+
+    publish_test_bundle(artifact_dir, 'v2')
+    assert os.stat(pointer).st_ino != inode
+    with open(pointer) as f:
+        assert json.load(f) == {'version': 'v2'}
+
+
+def test_load_rejects_tampered_weights(tmp_path, publish_test_bundle):
+    artifact_dir = str(tmp_path)
+    publish_test_bundle(artifact_dir, 'v1')
+    with open(os.path.join(artifact_dir, 'v1', model_artifacts.WEIGHTS_FILE), 'ab') as f:
+        f.write(b'\0')
+
+    with pytest.raises(model_artifacts.ArtifactError):
+        model_artifacts.load_bundle('v1', artifact_dir)
+
+
+def test_duplicate_version_is_rejected(tmp_path, publish_test_bundle):
+    artifact_dir = str(tmp_path)
+    publish_test_bundle(artifact_dir, 'v1')
+    with pytest.raises(model_artifacts.ArtifactError):
+        publish_test_bundle(artifact_dir, 'v1')
+
+
+def test_registry_refresh_swaps_without_gap_and_keeps_pinned_versions(tmp_path, publish_test_bundle):
+    import threading
+
+    from model_registry import ModelRegistry
+
+    artifact_dir = str(tmp_path)
+    publish_test_bundle(artifact_dir, 'v1')
+    registry = ModelRegistry(artifact_dir)
+    registry.preload()
+    assert registry.get().name == 'v1'
+
+    errors, stop = [], threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                registry.get()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for index in range(2, 6):
+            publish_test_bundle(artifact_dir, f'v{index}', seed=index)
+            if index == 3:
+                registry.load('v2')  # 이름을 지정해 적재한 버전은 고정
+            assert registry.refresh()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert registry.get().name == 'v5'
+    # 교체된 기본 버전 중 고정된 v2만 남음
+    assert registry.versions() == ['v2', 'v5']
+    assert registry.get('v2').name == 'v2'
+
+
+def test_registry_imports_newest_legacy_file_when_pointer_is_missing(tmp_path, fake_keras_model, lstm_scaler):
+    from model_registry import STATE_READY, ModelRegistry
+
+    legacy_dir, artifact_dir = tmp_path / 'legacy', tmp_path / 'artifacts'
+    legacy_dir.mkdir()
+    export_npz(fake_keras_model.random(1), lstm_scaler, str(legacy_dir / 'lotto_lstm_model_20240101_000000.npz'))
+    export_npz(fake_keras_model.random(2), lstm_scaler, str(legacy_dir / 'lotto_lstm_model_20250101_000000.npz'))
+    # 같은 타임스탬프의 Keras 파일보다 .npz 우선, 스케일러 없는 Keras 파일은 무시
+    (legacy_dir / 'lotto_lstm_model_20250101_000000.keras').write_bytes(b'')
+    (legacy_dir / 'lotto_lstm_model_20260101_000000.keras').write_bytes(b'')
+
+    assert model_artifacts.find_legacy_files([str(legacy_dir)]) == (
+        str(legacy_dir / 'lotto_lstm_model_20250101_000000.npz'), None
+    )
+
+    registry = ModelRegistry(str(artifact_dir), legacy_dirs=[str(legacy_dir)])
+    registry.preload()
+    assert registry.state == STATE_READY
+    manifest = registry.get().manifest
+    assert manifest['metadata']['imported_from'].endswith('lotto_lstm_model_20250101_000000.npz')
+    assert model_artifacts.read_current_version(str(artifact_dir)) == registry.default_version
+
+    # 포인터가 생긴 뒤에는 다시 변환하지 않음
+    assert model_artifacts.import_latest_legacy_files(str(artifact_dir), [str(legacy_dir)]) is None
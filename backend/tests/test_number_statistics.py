@@ -0,0 +1,84 @@
+import numpy as np
+
+import crud
+import models
+from tests.conftest import make_draws
+
+
+def _snapshot(db, statistics: models.NumberStatistics) -> dict:
+    db.flush()
+    return {
+        'total_draws': statistics.total_draws,
+        'first_draw_no': statistics.first_draw_no,
+        'last_draw_no': statistics.last_draw_no,
+        'frequency': list(statistics.frequency),
+        'cooccurrence': crud.get_number_cooccurrence(db).tolist(),
+        'triplets': dict(zip(*(array.tolist() for array in crud.get_number_triplets(db)))),
+        'decayed_frequency': np.array(statistics.decayed_frequency)
+    }
+
+
+def _assert_same(incremental: dict, rebuilt: dict):
+    for key in ('total_draws', 'first_draw_no', 'last_draw_no', 'frequency', 'cooccurrence', 'triplets'):
+        assert incremental[key] == rebuilt[key], key
+    np.testing.assert_allclose(incremental['decayed_frequency'], rebuilt['decayed_frequency'], rtol=1e-9)
+
+
+def test_incremental_statistics_match_rebuild(db):
+    for draw in make_draws(300, seed=1):
+        crud.create_lotto_draw(db, draw)
+
+    incremental = _snapshot(db, crud.get_number_statistics(db))
+    rebuilt = _snapshot(db, crud.rebuild_number_statistics(db))
+    _assert_same(incremental, rebuilt)
+
+    assert incremental['total_draws'] == 300
+    assert sum(incremental['frequency']) == 300 * 6
+    assert sum(incremental['triplets'].values()) == 300 * 20
+
+
+def test_out_of_order_insert_rebuilds(db):
+    draws = make_draws(50, seed=2)
+    for draw in draws[:20] + draws[30:]:
+        crud.create_lotto_draw(db, draw)
+    for draw in draws[20:30]:
+        crud.create_lotto_draw(db, draw)
+
+    incremental = _snapshot(db, crud.get_number_statistics(db))
+    _assert_same(incremental, _snapshot(db, crud.rebuild_number_statistics(db)))
+    assert (incremental['first_draw_no'], incremental['last_draw_no']) == (1, 50)
+
+
+def test_triplet_codes_round_trip():
+    numbers = np.array([[45, 1, 30, 7, 12, 3]])
+    codes = crud.triplet_codes(numbers)
+    assert len(codes) == 20
+    decoded = crud.decode_triplet_codes(codes)
+    assert (np.diff(decoded, axis=1) > 0).all()
+    assert set(decoded.ravel().tolist()) == {1, 3, 7, 12, 30, 45}
+
+
+def test_insert_updates_only_changed_pairs_and_triplets(db):
+    from sqlalchemy import event
+
+    draws = make_draws(30, seed=3)
+    for draw in draws[:-1]:
+        crud.create_lotto_draw(db, draw)
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters, executemany))
+
+    engine = db.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        crud.create_lotto_draw(db, draws[-1])
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    pair_writes = [s for s in statements if 'number_pair_counts' in s[0] and not s[0].startswith('SELECT')]
+    triplet_writes = [s for s in statements if 'number_triplet_counts' in s[0] and not s[0].startswith('SELECT')]
+    assert [s[0].split()[0] for s in pair_writes] == ['UPDATE']
+    assert len(pair_writes[0][1]) == 1 + 15 * 2  # count + 1, 15쌍 (a, b)
+    assert sum(len(s[1]) if s[2] else 1 for s in triplet_writes if s[0].startswith('INSERT')) <= 20
@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import pytest
+
+from numpy_lstm import NumpyMinMaxScaler, export_npz, load_npz
+
+
+def _tiny_model(fake_keras_model):
+    """LSTM(1 유닛, tanh) + Dense(1) - 게이트 계산을 손으로 검산할 수 있는 크기"""
+    # 게이트 순서 i, f, c, o (Keras와 동일)
+    kernel = np.array([[0.5, -0.3, 0.8, 0.2]], dtype=np.float32)
+    recurrent_kernel = np.array([[0.1, 0.4, -0.6, 0.3]], dtype=np.float32)
+    bias = np.array([0.0, 1.0, 0.1, -0.2], dtype=np.float32)
+    return fake_keras_model(
+        ({'activation': 'tanh', 'recurrent_activation': 'sigmoid'}, [kernel, recurrent_kernel, bias]),
+        ({'activation': 'linear'}, [np.array([[2.0]], dtype=np.float32), np.array([0.5], dtype=np.float32)]),
+        input_shape=(None, 2, 1)
+    )
+
+
+def _hand_forward(sequence):
+    def sigmoid(x):
+        return 1 / (1 + math.exp(-x))
+
+    h = c = 0.0
+    for x in sequence:
+        i = sigmoid(0.5 * x + 0.1 * h + 0.0)
+        f = sigmoid(-0.3 * x + 0.4 * h + 1.0)
+        g = math.tanh(0.8 * x - 0.6 * h + 0.1)
+        o = sigmoid(0.2 * x + 0.3 * h - 0.2)
+        c = f * c + i * g
+        h = o * math.tanh(c)
+    return 2.0 * h + 0.5
+
+
+def test_forward_pass_matches_hand_computed_gates(tmp_path, fake_keras_model):
+    scaler = NumpyMinMaxScaler(np.zeros(1), np.ones(1))
+    path = export_npz(_tiny_model(fake_keras_model), scaler, str(tmp_path / 'tiny.npz'))
+    model, _ = load_npz(path)
+    assert model.input_shape == (None, 2, 1) and model.output_shape == (None, 1)
+
+    inputs = np.array([[[0.3], [-1.2]], [[1.0], [0.5]], [[0.0], [0.0]]], dtype=np.float32)
+    expected = [_hand_forward(sequence[:, 0].tolist()) for sequence in inputs]
+    np.testing.assert_allclose(model.predict(inputs)[:, 0], expected, rtol=1e-5, atol=1e-6)
+
+
+def test_scaler_round_trip():
+    scaler = NumpyMinMaxScaler(np.full(6, -1 / 44), np.full(6, 1 / 44))
+    values = np.array([[1, 5, 12, 23, 34, 45]], dtype=np.float64)
+    np.testing.assert_allclose(scaler.transform(values), (values - 1) / 44)
+    np.testing.assert_allclose(scaler.inverse_transform(scaler.transform(values)), values)
+
+
+def test_matches_keras_predict(tmp_path):
+    pytest.importorskip('tensorflow')
+    from tensorflow.keras.layers import LSTM as KerasLSTM, Dense as KerasDense, Input
+    from tensorflow.keras.models import Sequential
+
+    rng = np.random.default_rng(0)
+    keras_model = Sequential([Input((10, 6)), KerasLSTM(16, activation='relu'), KerasDense(6)])
+    keras_model.set_weights([rng.normal(0, 0.3, w.shape).astype(np.float32) for w in keras_model.get_weights()])
+
+    path = export_npz(keras_model, NumpyMinMaxScaler(np.zeros(6), np.ones(6) / 45), str(tmp_path / 'keras.npz'))
+    model, _ = load_npz(path)
+
+    inputs = rng.random((32, 10, 6)).astype(np.float32)
+    assert np.allclose(model.predict(inputs), keras_model.predict(inputs, verbose=0), atol=1e-4)
@@ -0,0 +1,107 @@
+import crud
+from draw_store import draw_store
+from prediction_service import prediction_service
+from tests.conftest import make_draws
+
+OHEANG = {'목': 2, '화': 1, '토': 2, '금': 1, '수': 2}
+
+
+def test_cached_predictions_are_returned_as_copies(db):
+    for draw in make_draws(60, seed=4):
+        crud.create_lotto_draw(db, draw)
+
+    historical = prediction_service.get_historical_snapshot()
+    first = prediction_service.predict_for_oheang(historical, OHEANG)
+    first['predicted_numbers'].clear()
+    first['number_scores'][0]['score'] = -1
+
+    second = prediction_service.predict_for_oheang(historical, OHEANG)
+    assert len(second['predicted_numbers']) == 7
+    assert second['number_scores'][0]['score'] > 0
+
+
+def test_snapshot_is_keyed_on_statistics_row_and_refreshed_in_background(db):
+    draws = make_draws(60, seed=5)
+    for draw in draws[:50]:
+        crud.create_lotto_draw(db, draw)
+
+    snapshot = prediction_service.get_historical_snapshot()
+    assert snapshot.last_draw_no == crud.get_number_statistics(db).last_draw_no == 50
+    assert snapshot.stats['latest_draws'][-1]['draw_no'] == 50
+
+    for draw in draws[50:]:
+        crud.create_lotto_draw(db, draw)
+    # 재계산 전에는 이전 스냅샷을 그대로 반환 (요청 경로에서 계산하지 않음)
+    prediction_service._historical_lock.acquire()
+    try:
+        assert prediction_service.get_historical_snapshot() is snapshot
+        thread = prediction_service._historical_thread
+        assert thread is not None and thread.is_alive()
+    finally:
+        prediction_service._historical_lock.release()
+    thread.join()
+
+    refreshed = prediction_service.get_historical_snapshot()
+    assert refreshed.last_draw_no == draw_store.get().last_draw_no == 60
+    assert refreshed.stats['total_draws'] == 60
+    assert [draw['draw_no'] for draw in refreshed.stats['latest_draws']] == list(range(56, 61))
+
+
+class _StubEnhancer:
+    """학습 DB 없이 고정 조정값을 돌려주는 지식 향상기"""
+
+    def get_learned_saju_insights(self, *birth):
+        return {'element_adjustments': {'목': 0.3, '금': -0.2}, 'relevant_knowledge': [{}],
+                'confidence_modifiers': {}, 'additional_recommendations': []}
+
+    def enhance_prediction_weights(self, saju_result, insights):
+        return saju_result.enhanced(insights['element_adjustments'], {})
+
+
+def test_enhanced_prediction_uses_precomputed_cache(db, monkeypatch):
+    for draw in make_draws(60, seed=6):
+        crud.create_lotto_draw(db, draw)
+    historical = prediction_service.get_historical_snapshot()
+
+    monkeypatch.setattr(prediction_service, 'knowledge_enhancer', _StubEnhancer())
+    monkeypatch.setattr(prediction_service, 'use_knowledge_enhancement', True)
+
+    def live_computation(*args, **kwargs):
+        raise AssertionError('사전 계산 캐시를 거치지 않았습니다')
+    monkeypatch.setattr(prediction_service, 'predict_with_saju_weighting', live_computation)
+
+    result = prediction_service.generate_prediction(1990, 5, 15, 9)
+    assert result['method'] == 'saju_weighted_frequency_with_youtube_knowledge'
+
+    saju_analysis = result['saju_analysis']
+    weighted = saju_analysis.weighted_oheang()
+    assert weighted != saju_analysis.oheang_dict()
+    expected = prediction_service.apply_element_adjustments(
+        prediction_service.predict_for_oheang(historical, saju_analysis.oheang_dict()), weighted
+    )
+    assert result['predicted_numbers'] == expected['predicted_numbers']
+    assert result['number_scores'] == expected['number_scores']
+
+    weights = prediction_service.calculate_saju_weights(weighted)
+    for score_info in result['number_scores']:
+        assert score_info['weight'] == weights.get(score_info['element'], 1.0)
+    scores = [score_info['score'] for score_info in result['number_scores']]
+    assert scores == sorted(scores, reverse=True)
+    assert set(result['predicted_numbers']) == {score_info['number'] for score_info in result['number_scores'][:7]}
+
+
+def test_invalidate_after_decay_change_serves_new_half_life(db):
+    for draw in make_draws(30, seed=7):
+        crud.create_lotto_draw(db, draw)
+    snapshot = prediction_service.get_historical_snapshot()
+
+    # 감쇠 반감기 엔드포인트와 같은 순서: 재계산 -> 무효화 -> 백그라운드 재계산
+    crud.set_decay_half_life(db, 7)
+    prediction_service.invalidate_historical_snapshot()
+    prediction_service.refresh_historical_snapshot_async()
+
+    refreshed = prediction_service.get_historical_snapshot()
+    assert refreshed is not snapshot
+    assert refreshed.last_draw_no == snapshot.last_draw_no
+    assert refreshed.number_index['decay_half_life'] == 7
+    prediction_service._historical_thread.join()
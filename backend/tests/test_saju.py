@@ -0,0 +1,136 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import saju
+import solar_terms
+
+
+def _random_births(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    ordinals = rng.integers(datetime.date(1901, 1, 1).toordinal(), datetime.date(2050, 12, 31).toordinal(), count)
+    dates = [datetime.date.fromordinal(int(ordinal)) for ordinal in ordinals]
+    hours = rng.integers(0, 24, count)
+    return dates, hours
+
+
+def test_analyze_saju_batch_matches_scalar():
+    dates, hours = _random_births(2000)
+    batch = saju.analyze_saju_batch(
+        [d.year for d in dates], [d.month for d in dates], [d.day for d in dates], hours
+    )
+    assert batch['valid'].all()
+
+    for row, (date, hour) in enumerate(zip(dates, hours.tolist())):
+        pillars = saju.calculate_pillars(date.year, date.month, date.day, hour)
+        expected = (pillars.year, pillars.month, pillars.day, pillars.hour)
+        assert batch['gan'][row].tolist() == [pillar.gan_index for pillar in expected]
+        assert batch['ji'][row].tolist() == [pillar.ji_index for pillar in expected]
+        assert batch['oheang'][row].tolist() == pillars.oheang.tolist()
+
+
+def test_analyze_saju_batch_marks_invalid_dates():
+    batch = saju.analyze_saju_batch([1990, 1990, 1850], [2, 5, 1], [30, 15, 1], [0, 10, 0])
+    assert batch['valid'].tolist() == [False, True, False]
+    assert (batch['gan'][~batch['valid']] == -1).all()
+    assert (batch['oheang'][~batch['valid']] == 0).all()
+
+
+def _next_jeol(moment: datetime.datetime) -> datetime.datetime:
+    for year in (moment.year, moment.year + 1):
+        for term in range(0, 24, 2):
+            instant = solar_terms.get_term(year, term)
+            if instant > moment:
+                return instant
+
+
+def _previous_jeol(moment: datetime.datetime) -> datetime.datetime:
+    for year in (moment.year, moment.year - 1):
+        for term in range(22, -1, -2):
+            instant = solar_terms.get_term(year, term)
+            if instant <= moment:
+                return instant
+
+
+@pytest.mark.parametrize('birth, gender, forward', [
+    ((1990, 5, 15, 9), 'male', True),      # 경오년(양) 남자: 순행
+    ((1990, 5, 15, 9), 'female', False),   # 경오년(양) 여자: 역행
+    ((1991, 8, 20, 15), 'male', False),    # 신미년(음) 남자: 역행
+    ((1991, 8, 20, 15), 'female', True),   # 신미년(음) 여자: 순행
+])
+def test_daewoon_direction_and_start_age(birth, gender, forward):
+    timeline = saju.get_daewoon(*birth, gender)
+    assert timeline.forward is forward
+
+    # 순행은 다음 절까지, 역행은 직전 절까지의 기간 (3일 = 1년, 1일 = 4개월)
+    moment = datetime.datetime(*birth)
+    boundary = _next_jeol(moment) if forward else _previous_jeol(moment)
+    total_months = round(abs((boundary - moment).total_seconds()) / 86400 * 4)
+    assert (timeline.start_years, timeline.start_months) == divmod(total_months, 12)
+
+    # 첫 대운은 월주에서 육십갑자 한 칸 이동
+    month = saju.calculate_pillars(*birth).month
+    first = timeline.period(0).pillar
+    step = 1 if forward else -1
+    assert first.gan_index == (month.gan_index + step) % 10
+    assert first.ji_index == (month.ji_index + step) % 12
+    assert timeline.period(1).start_age == timeline.start_years + 10
+
+
+def test_month_pillar_uses_actual_birth_minute():
+    # 절입 시각이 시진 시작과 다른 분에 있어도 출생 시/분 기준으로 월주가 바뀜
+    jeol = solar_terms.get_term(1995, 10)    # 망종
+    before = jeol - datetime.timedelta(minutes=1)
+    after = jeol + datetime.timedelta(minutes=1)
+    month_before = saju.calculate_pillars(before.year, before.month, before.day, before.hour, before.minute).month
+    month_after = saju.calculate_pillars(after.year, after.month, after.day, after.hour, after.minute).month
+    assert month_after.ji_index == (month_before.ji_index + 1) % 12
+
+
+@pytest.mark.parametrize('year', [1990, 2004, 2023])
+def test_year_pillar_changes_at_ipchun(year):
+    ipchun = solar_terms.get_term(year, 2)
+    before = ipchun - datetime.timedelta(minutes=1)
+    after = ipchun + datetime.timedelta(minutes=1)
+    year_before = saju.calculate_pillars(before.year, before.month, before.day, before.hour, before.minute).year
+    year_after = saju.calculate_pillars(after.year, after.month, after.day, after.hour, after.minute).year
+    assert (year_after.gan_index, year_after.ji_index) == ((year - 1984) % 10, (year - 1984) % 12)
+    assert (year_before.gan_index, year_before.ji_index) == ((year - 1985) % 10, (year - 1985) % 12)
+
+    # 배치 계산도 같은 입춘 경계 (시 단위 입력이므로 입춘 시각의 앞뒤 시)
+    batch = saju.analyze_saju_batch([year, year], [2, 2], [ipchun.day, ipchun.day],
+                                    [max(ipchun.hour - 1, 0), min(ipchun.hour + 1, 23)])
+    if ipchun.hour > 0:
+        assert batch['ji'][0, 0] == (year - 1985) % 12
+    if ipchun.hour < 23:
+        assert batch['ji'][1, 0] == (year - 1984) % 12
+
+
+# 만세력으로 확인한 사주 (년주, 월주, 일주, 시주)
+KNOWN_CHARTS = [
+    ((2000, 1, 1, 0), ('기묘', '병자', '무오', '임자')),
+    ((1990, 5, 15, 9), ('경오', '신사', '경진', '신사')),
+    ((2024, 2, 10, 12), ('갑진', '병인', '갑진', '경오')),
+]
+
+
+def _ganji(gan_index: int, ji_index: int) -> str:
+    return saju.GAN[gan_index] + saju.JI[ji_index]
+
+
+@pytest.mark.parametrize('birth, expected', KNOWN_CHARTS)
+def test_known_charts_on_every_path(birth, expected):
+    pillars = saju.calculate_pillars(*birth)
+    assert tuple(_ganji(p.gan_index, p.ji_index)
+                 for p in (pillars.year, pillars.month, pillars.day, pillars.hour)) == expected
+
+    chart = saju.analyze_saju(*birth)['saju']
+    assert tuple(''.join(chart[key]) for key in ('year', 'month', 'day', 'hour')) == expected
+
+    pillar_dict = saju.analyze_saju_result(*birth).pillars.to_dict()
+    assert tuple(pillar_dict[key]['gan'] + pillar_dict[key]['ji']
+                 for key in ('year', 'month', 'day', 'hour')) == expected
+
+    batch = saju.analyze_saju_batch(*([value] for value in birth))
+    assert tuple(_ganji(gan, ji) for gan, ji in zip(batch['gan'][0].tolist(), batch['ji'][0].tolist())) == expected
@@ -0,0 +1,38 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import solar_terms
+
+
+def _bisect_month_pillar(minutes: int) -> tuple:
+    """절기 배열 bisect 기준 구현"""
+    return solar_terms._MONTH_PILLARS[solar_terms.term_index_at(minutes) // 2 % 60]
+
+
+def test_day_table_matches_bisect_around_every_jeol():
+    instants = solar_terms.get_instants()
+    minutes = []
+    for instant in instants[2:-2:2]:
+        minutes += [instant - 1, instant, instant + 1]
+    minutes += np.random.default_rng(0).integers(instants[0], instants[-1] - 1, 20000).tolist()
+
+    for value in minutes:
+        assert solar_terms.month_pillar_at(value) == _bisect_month_pillar(value)
+
+
+def test_month_pillar_switches_at_ipchun_minute():
+    ipchun = solar_terms.get_term(2024, 2)
+    before = ipchun - datetime.timedelta(minutes=1)
+    args = lambda moment: (moment.year, moment.month, moment.day, moment.hour, moment.minute)
+
+    # 2024년 입춘부터 병인월, 직전은 을축월
+    assert solar_terms.month_pillar(*args(before)) == (1, 1)
+    assert solar_terms.month_pillar(*args(ipchun)) == (2, 2)
+
+
+@pytest.mark.parametrize('date', [(1990, 2, 30), (1990, 13, 1), (1850, 1, 1)])
+def test_invalid_or_out_of_range_dates_raise(date):
+    with pytest.raises(ValueError):
+        solar_terms.month_pillar(*date)
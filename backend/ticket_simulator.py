@@ -0,0 +1,171 @@
+"""
+몬테카를로 로또 티켓 시뮬레이터
+예측 전략별 번호 가중치(45개)로 수백만 장의 6/45 티켓을 Gumbel top-k 방식으로 한꺼번에 뽑고,
+과거 당첨 번호와 64비트 비트마스크 AND + popcount로 비교하여 등수별 적중 분포를 집계합니다.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from draw_store import draw_store, DrawSnapshot
+from saju import OHEANG, NUMBER_OHEANG_INDEX
+from lotto_bitmask import (
+    RANKS, THEORETICAL_PROBABILITIES, ticket_masks, draw_masks, match_bulk, rank_bulk
+)
+
+# 한 번에 생성하는 티켓 수 (float32 45열 기준 약 45MB)
+SIMULATION_CHUNK_SIZE = 250000
+
+# 단일 티켓을 내는 전략을 분포로 바꿀 때 예측 번호에 주는 가중치 (나머지 번호는 1)
+TICKET_CONCENTRATION = 20.0
+
+_COLUMN_BITS = np.arange(45, dtype=np.uint32)
+_INDEX_MASK = np.uint32(0x3F)
+
+
+def sample_tickets(weights: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    가중치 비례 비복원 추출로 6개 번호 티켓 count장 생성 (Gumbel top-k)
+    Gumbel top-k와 동치인 지수 분포 경주 방식으로, 키 = Exp(1) / 가중치가 가장 작은 6개를 고릅니다.
+    양수 float32 키는 uint32로 보아도 순서가 같으므로, 가수부 하위 6비트에 번호 인덱스를 넣어
+    argpartition 대신 행 단위 정수 정렬로 상위 6개를 찾습니다 (키 상대 오차 2^-17 이내).
+    Returns: (count, 6) 번호 인덱스 배열 (0~44)
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    with np.errstate(divide='ignore'):
+        inverse_weights = np.where(weights > 0, 1 / weights, np.inf).astype(np.float32)
+
+    keys = rng.random((count, 45), dtype=np.float32)
+    np.subtract(1, keys, out=keys)
+    np.log(keys, out=keys)
+    np.negative(keys, out=keys)
+    np.maximum(keys, np.float32(1e-30), out=keys)  # -0.0 방지 (uint32 순서 보존)
+    keys *= inverse_weights
+
+    packed = keys.view(np.uint32)
+    packed &= ~_INDEX_MASK
+    packed |= _COLUMN_BITS
+    packed.sort(axis=1)
+    return (packed[:, :6] & _INDEX_MASK).astype(np.int64)
+
+
+def simulate(weights: np.ndarray, snapshot: DrawSnapshot = None, n_tickets: int = 1000000,
+             seed: Optional[int] = None, chunk_size: int = SIMULATION_CHUNK_SIZE) -> Dict:
+    """
+    한 전략의 티켓을 n_tickets장 생성하여 과거 회차에 순서대로 배정하고 등수별 적중 수 집계
+
+    Args:
+        weights: 번호 1~45의 추출 가중치 (0이면 뽑히지 않음, 양수 6개 이상 필요)
+        snapshot: 비교할 회차 스냅샷 (기본: 전체 회차)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (45,) or np.count_nonzero(weights > 0) < 6:
+        raise ValueError("가중치는 45개이며 양수가 6개 이상이어야 합니다.")
+
+    snapshot = snapshot or draw_store.get()
+    if snapshot.total_draws == 0:
+        raise ValueError("비교할 회차 데이터가 없습니다.")
+
+    snapshot_masks = draw_masks(snapshot.numbers)
+
+    rng = np.random.default_rng(seed)
+    match_counts = np.zeros(7, dtype=np.int64)
+    rank_counts = np.zeros(len(RANKS), dtype=np.int64)
+
+    started = time.perf_counter()
+    for start in range(0, n_tickets, chunk_size):
+        count = min(chunk_size, n_tickets - start)
+        tickets = ticket_masks(sample_tickets(weights, count, rng) + 1)
+
+        # 티켓 i는 회차 (start + i) % 회차 수와 비교
+        draw_index = np.arange(start, start + count) % snapshot.total_draws
+        matches, has_bonus = match_bulk(tickets, snapshot_masks[draw_index])
+
+        match_counts += np.bincount(matches, minlength=7)
+        rank_counts += np.bincount(rank_bulk(matches, has_bonus), minlength=len(RANKS))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'tickets': n_tickets,
+        'draws': snapshot.total_draws,
+        'match_distribution': {str(k): int(v) for k, v in enumerate(match_counts)},
+        'rank_distribution': {name: int(v) for name, v in zip(RANKS, rank_counts)},
+        'rank_rates': {name: float(v) / n_tickets for name, v in zip(RANKS[:-1], rank_counts)},
+        'expected_rates': THEORETICAL_PROBABILITIES,
+        'mean_matches': float((match_counts * np.arange(7)).sum() / n_tickets),
+        'elapsed_seconds': round(elapsed, 3)
+    }
+
+
+def ticket_weights(numbers: List[int], concentration: float = TICKET_CONCENTRATION) -> np.ndarray:
+    """단일 티켓을 내는 전략의 번호 분포 (예측 번호에 가중치 집중)"""
+    weights = np.ones(45)
+    weights[np.asarray(numbers, dtype=np.int64) - 1] = concentration
+    return weights
+
+
+def saju_strategy_weights(prediction_service, oheang: Dict[str, float]) -> np.ndarray:
+    """
+    PredictionService.predict_with_saju_weighting 전략의 번호 분포
+    빈도 상위 15개 번호에만 (출현 빈도 x 오행 가중치) 비례 가중치를 줍니다.
+    빈도는 전체 회차 기준이므로 과거 회차와 비교하면 사후 정보가 포함된 낙관적 결과가 됩니다.
+    """
+    historical = prediction_service.get_historical_snapshot()
+    element_weights = prediction_service.calculate_saju_weights(oheang)
+    weight_vector = np.array([element_weights.get(element, 1.0) for element in OHEANG])
+
+    top = np.array([item['number'] for item in historical.pattern_analysis['top_numbers']], dtype=np.int64) - 1
+    weights = np.zeros(45)
+    weights[top] = historical.number_index['frequency'][top] * weight_vector[NUMBER_OHEANG_INDEX[top]]
+    return weights
+
+
+def evaluate_strategies(birth_year: int, birth_month: int, birth_day: int, birth_hour: int,
+                        n_tickets: int = 1000000, seed: Optional[int] = None) -> Dict:
+    """사주 가중 빈도, LSTM, AI 인격체 번호 생성 전략과 무작위 기준선을 같은 조건으로 시뮬레이션"""
+    from prediction_service import prediction_service
+    from app.services.ai_persona import SajuMasterAI
+
+    saju_result = prediction_service.get_saju_analysis(birth_year, birth_month, birth_day, birth_hour)
+    oheang = saju_result.oheang_dict()
+
+    strategies = {
+        'uniform': np.ones(45),
+        'saju_weighted_frequency': saju_strategy_weights(prediction_service, oheang)
+    }
+
+    try:
+        from lstm_prediction_service import lstm_service
+        total = sum(oheang.values())
+        saju_weights = {element: count / total for element, count in oheang.items()}
+        lstm_prediction = lstm_service.predict_next_numbers(saju_weights)
+        strategies['lstm'] = ticket_weights(lstm_prediction['predicted_numbers'])
+    except Exception as e:
+        print(f"[SIMULATOR] LSTM 전략 제외: {e}")
+
+    persona_numbers = SajuMasterAI(None, None)._generate_numbers_internal({
+        'birth_year': birth_year, 'birth_month': birth_month,
+        'birth_day': birth_day, 'birth_hour': birth_hour
+    }, [])
+    strategies['ai_persona'] = ticket_weights(persona_numbers['main_numbers'])
+
+    snapshot = draw_store.get()
+    return {
+        name: simulate(weights, snapshot, n_tickets=n_tickets, seed=seed)
+        for name, weights in strategies.items()
+    }
+
+
+if __name__ == "__main__":
+    # 합성 회차 1000개에 대한 무작위 전략 시뮬레이션 (이론 확률과 비교)
+    rng = np.random.default_rng(0)
+    draws = np.array([rng.choice(45, 7, replace=False) + 1 for _ in range(1000)], dtype=np.uint8)
+    synthetic = DrawSnapshot(draws, np.arange(1, 1001, dtype=np.int32),
+                             np.full(1000, 'NaT', dtype='datetime64[D]'))
+
+    result = simulate(np.ones(45), synthetic, n_tickets=2000000, seed=1)
+    print(f"티켓 {result['tickets']}장 시뮬레이션: {result['elapsed_seconds']}초")
+    for rank in RANKS[:-1]:
+        print(f"  {rank}: {result['rank_rates'][rank]:.6f} (이론 {THEORETICAL_PROBABILITIES[rank]:.6f})")